@@ -0,0 +1,60 @@
+"""Micro-benchmark: SkillExtractor vs the old per-skill re.search loop.
+
+Run from the repo root: python benchmarks/skill_extraction.py [num_descriptions]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from skills import SkillExtractor, load_taxonomy
+
+TAXONOMY = load_taxonomy()
+# The flat term list and alias map the old loop scanned
+SKILLS_LIST = [term for skill in TAXONOMY['skills'] for term in [skill['name']] + skill['aliases']]
+SKILL_MAPPING = {alias: skill['name'] for skill in TAXONOMY['skills'] for alias in skill['aliases']}
+
+FILLER = (
+    "we are looking for a data analyst with strong communication skills and experience "
+    "working with stakeholders to deliver insights dashboards and reporting across the "
+    "business you will partner with engineering product and finance teams"
+).split()
+
+def make_descriptions(n, words_per_description=600, skills_per_description=8, seed=42):
+    rng = random.Random(seed)
+    descriptions = []
+    for _ in range(n):
+        words = [rng.choice(FILLER) for _ in range(words_per_description)]
+        for _ in range(skills_per_description):
+            words.insert(rng.randrange(len(words)), rng.choice(SKILLS_LIST))
+        descriptions.append(' '.join(words).title())
+    return descriptions
+
+def legacy_extract(description):
+    """The loop load_to_database used before SkillExtractor"""
+    desc_lower = description.lower()
+    found_skills = set()
+    for skill in SKILLS_LIST:
+        if re.search(rf'\b{re.escape(skill)}\b', desc_lower):
+            found_skills.add(SKILL_MAPPING.get(skill, skill))
+    return found_skills
+
+def bench(name, func, descriptions):
+    start = time.perf_counter()
+    matches = sum(len(func(description)) for description in descriptions)
+    elapsed = time.perf_counter() - start
+    rate = len(descriptions) / elapsed
+    print(f"{name:<16} {rate:>10,.0f} descriptions/sec   ({matches} skill matches)")
+    return rate
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    descriptions = make_descriptions(n)
+    extractor = SkillExtractor(TAXONOMY)
+
+    legacy_rate = bench("per-skill loop", legacy_extract, descriptions)
+    new_rate = bench("SkillExtractor", extractor.extract, descriptions)
+    print(f"\nSpeedup: {new_rate / legacy_rate:.1f}x")
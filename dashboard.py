@@ -1,9 +1,13 @@
+import os
+import sys
 import streamlit as st
-import pandas as pd
-from PIL import Image
 import plotly.express as px
 import plotly.graph_objects as go
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+# Cached loaders: reruns (slider moves, page switches) are served from memory
+from dashboard_data import load_result, load_filtered, load_cooccurrence
+
 st.set_page_config(
     page_title="Job Market Analytics",
     layout="wide",
@@ -177,11 +181,40 @@ st.markdown("Real-time insights from the Canadian tech job market")
 st.sidebar.markdown("## Navigation")
 page = st.sidebar.radio("Select Page", ["Overview", "Skills Analysis", "Company Analysis", "Skill Relationships"], label_visibility="collapsed")
 
+# Filters - any selection switches the Overview, Skills and Company pages to live, filtered queries
+st.sidebar.markdown("## Filters")
+filter_options = load_result('filter_options')
+
+province = st.sidebar.selectbox("Province", ["All"] + sorted(filter_options['province'].unique()))
+city_options = filter_options if province == "All" else filter_options[filter_options['province'] == province]
+city = st.sidebar.selectbox("City", ["All"] + sorted(city_options['city'].unique()))
+work_type = st.sidebar.selectbox("Work Type", ["All", "Remote", "On-site"])
+experience_level = st.sidebar.selectbox("Experience Level", ["All", "Entry Level", "Mid Level", "Senior Level"])
+posted_between = st.sidebar.date_input("Posted Between", value=(), help="Leave empty for all dates")
+
+filters = {
+    'province': None if province == "All" else province,
+    'city': None if city == "All" else city,
+    'is_remote': {"All": None, "Remote": True, "On-site": False}[work_type],
+    'experience_level': None if experience_level == "All" else experience_level,
+    'date_from': posted_between[0] if len(posted_between) > 0 else None,
+    'date_to': posted_between[1] if len(posted_between) > 1 else None,
+}
+
+def require_rows(df):
+    """Stops the page with a notice when the filters match nothing"""
+    if df.empty:
+        st.warning("No job postings match the selected filters.")
+        st.stop()
+
 if page == "Overview":
     # Load data
-    df_skills = pd.read_csv('results/query_1_top_skills.csv')
-    df_companies = pd.read_csv('results/query_6_top_companies.csv')
-    df_jobs = pd.read_csv('results/query_2_job_details.csv')
+    df_skills = load_filtered('top_skills', filters)
+    df_companies = load_filtered('top_companies', filters)
+    df_jobs = load_filtered('job_details', filters)
+    require_rows(df_jobs)
+    require_rows(df_skills)
+    require_rows(df_companies)
 
     # Key Metrics Section
     st.markdown("## Key Metrics")
@@ -350,7 +383,8 @@ elif page == "Skills Analysis":
     st.markdown("## Skills Demand Analysis")
     st.markdown("Discover the most sought-after skills in the Canadian data analytics job market")
 
-    df_skills = pd.read_csv('results/query_1_top_skills.csv')
+    df_skills = load_filtered('top_skills', filters)
+    require_rows(df_skills)
 
     st.write("")  # Spacer
 
@@ -499,7 +533,8 @@ elif page == "Company Analysis":
     st.markdown("## Top Hiring Companies")
     st.markdown("Explore which companies are actively hiring in the Canadian data analytics market")
 
-    df_companies = pd.read_csv('results/query_6_top_companies.csv')
+    df_companies = load_filtered('top_companies', filters)
+    require_rows(df_companies)
 
     st.write("")  # Spacer
 
@@ -650,14 +685,28 @@ elif page == "Skill Relationships":
     st.markdown("## Skill Co-occurrence Analysis")
     st.markdown("Discover which skills are frequently required together in job postings")
 
-    df_cooccur = pd.read_csv('results/query_4_skill_cooccurrence.csv')
+    cooccur = load_cooccurrence()
+    if cooccur.n_jobs == 0:
+        st.warning("No job postings with skills loaded yet.")
+        st.stop()
+
+    metric_labels = {
+        "Co-occurrence Count": 'pair_count',
+        "Lift": 'lift',
+        "PMI": 'pmi',
+        "Jaccard": 'jaccard',
+    }
+    df_pairs = cooccur.pairs()
+    if df_pairs.empty:
+        st.warning("No two skills have appeared in the same job posting yet.")
+        st.stop()
 
     # Top skill pairs metrics
     st.markdown("### Top Skill Combinations")
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        top_pair = df_cooccur.iloc[0]
+        top_pair = df_pairs.iloc[0]
         st.metric(
             label="Most Common Pair",
             value=f"{top_pair['skill_1']} + {top_pair['skill_2']}",
@@ -665,7 +714,7 @@ elif page == "Skill Relationships":
         )
 
     with col2:
-        total_pairs = len(df_cooccur)
+        total_pairs = len(df_pairs)
         st.metric(
             label="Unique Skill Pairs",
             value=f"{total_pairs:,}",
@@ -673,7 +722,7 @@ elif page == "Skill Relationships":
         )
 
     with col3:
-        avg_cooccurrence = df_cooccur['pair_count'].mean()
+        avg_cooccurrence = df_pairs['pair_count'].mean()
         st.metric(
             label="Avg Co-occurrence",
             value=f"{avg_cooccurrence:.1f}",
@@ -682,60 +731,120 @@ elif page == "Skill Relationships":
 
     st.markdown("---")
 
-    # Network visualization using the heatmap image
+    # Interactive heatmap of the most frequent skills
     col1, col2 = st.columns([2, 1])
 
     with col1:
         st.markdown("### Skill Co-occurrence Heatmap")
-        img = Image.open('images/skill_cooccurrence.png')
-        st.image(img, caption="Darker colors indicate stronger skill relationships")
+        hcol1, hcol2 = st.columns(2)
+        with hcol1:
+            heatmap_label = st.selectbox("Measure", list(metric_labels), key="heatmap_metric")
+        with hcol2:
+            n_heatmap = st.slider("Number of skills", 5, 40, 15, key="heatmap_slider")
+
+        df_matrix = cooccur.matrix(top_n=n_heatmap, metric=metric_labels[heatmap_label])
+        fig = go.Figure(data=go.Heatmap(
+            z=df_matrix.values,
+            x=df_matrix.columns,
+            y=df_matrix.index,
+            colorscale='YlOrRd',
+            colorbar=dict(title=heatmap_label),
+            hovertemplate='<b>%{y} + %{x}</b><br>' + heatmap_label + ': %{z:.2f}<extra></extra>'
+        ))
+        fig.update_layout(
+            height=max(450, n_heatmap * 28),
+            plot_bgcolor='white',
+            paper_bgcolor='white',
+            font=dict(size=12, color='#1e293b', family='Arial'),
+            xaxis=dict(tickangle=-45, tickfont=dict(size=11, color='#1e293b')),
+            yaxis=dict(autorange='reversed', tickfont=dict(size=11, color='#1e293b')),
+            margin=dict(l=10, r=10, t=30, b=10)
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
     with col2:
         st.markdown("### Interpretation Guide")
         st.markdown("""
         **How to read this heatmap:**
 
-        - **Darker colors** = Skills appear together more frequently
-        - **Lighter colors** = Skills rarely appear together
-        - **Diagonal** = Shows individual skill frequency
+        - **Co-occurrence Count** = Jobs asking for both skills (the diagonal is each skill on its own)
+        - **Lift** = How much more often the pair appears than if the skills were unrelated (above 1 = attracted)
+        - **PMI** = Lift on a log2 scale (above 0 = attracted, below 0 = avoided)
+        - **Jaccard** = Share of jobs asking for either skill that ask for both
 
         **What this means:**
         - Skills that cluster together should be learned as a package
-        - High co-occurrence = employers expect these skills together
+        - High lift = employers expect these skills together, beyond their popularity
         - Use this to plan your learning path
         """)
 
+    # Per-skill neighbors
+    st.markdown("### Related Skills")
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        skill = st.selectbox("Skill", cooccur.by_frequency(), key="neighbor_skill")
+    with col2:
+        neighbor_label = st.selectbox("Rank by", ["Lift", "Co-occurrence Count", "PMI", "Jaccard"], key="neighbor_metric")
+    with col3:
+        neighbor_min_count = st.number_input("Min. jobs together", min_value=1, value=3, key="neighbor_min_count")
+
+    df_neighbors = cooccur.neighbors(skill, n=10, metric=metric_labels[neighbor_label], min_count=neighbor_min_count)
+    if df_neighbors.empty:
+        st.info(f"{skill} has not appeared together with any other skill yet.")
+    else:
+        df_neighbors_formatted = df_neighbors.copy()
+        df_neighbors_formatted['confidence'] = df_neighbors_formatted['confidence'] * 100
+        st.dataframe(
+            df_neighbors_formatted,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "skill": st.column_config.TextColumn("Skill", width="medium"),
+                "pair_count": st.column_config.NumberColumn("Appears Together", width="small"),
+                "jaccard": st.column_config.NumberColumn("Jaccard", format="%.3f", width="small"),
+                "lift": st.column_config.NumberColumn("Lift", format="%.2f", width="small"),
+                "pmi": st.column_config.NumberColumn("PMI", format="%.2f", width="small"),
+                "confidence": st.column_config.NumberColumn(f"% of {skill} Jobs", format="%.1f%%", width="small")
+            }
+        )
+
     # Interactive table
     st.markdown("### Top Skill Pair Rankings")
 
     st.write("")  # Spacer
 
-    col1, col2 = st.columns([3, 1])
+    col1, col2, col3 = st.columns([2, 1, 1])
     with col1:
         n_pairs = st.slider("Number of skill pairs to display", 3, 15, 8, key="pairs_slider")
     with col2:
-        st.write("")  # Spacer
-    df_display = df_cooccur.head(n_pairs)
+        pairs_label = st.selectbox("Rank by", list(metric_labels), key="pairs_metric")
+    with col3:
+        # Lift and PMI favour rare pairs, so let those be filtered out
+        min_count = st.number_input("Min. jobs together", min_value=1, value=3, key="pairs_min_count")
+    pairs_metric = metric_labels[pairs_label]
+    df_display = cooccur.top_pairs(n=n_pairs, metric=pairs_metric, min_count=min_count)
 
     # Create interactive visualization
     fig = go.Figure(data=[
         go.Bar(
-            x=df_display['pair_count'],
+            x=df_display[pairs_metric],
             y=[f"{row['skill_1']} + {row['skill_2']}" for _, row in df_display.iterrows()],
             orientation='h',
             marker=dict(
                 color='#2d5f8d',
                 line=dict(color='#1a3a5c', width=1.5)
             ),
-            text=df_display['pair_count'],
+            text=df_display[pairs_metric].round(2),
             textposition='outside',
-            hovertemplate='<b>%{y}</b><br>Appears together in %{x} jobs<extra></extra>'
+            customdata=df_display['pair_count'],
+            hovertemplate='<b>%{y}</b><br>' + pairs_label + ': %{x:.2f}<br>Appears together in %{customdata} jobs<extra></extra>'
         )
     ])
 
     fig.update_layout(
-        title=dict(text=f'Top {n_pairs} Skill Pair Co-occurrences', font=dict(color='#1a3a5c', size=16)),
-        xaxis_title="Number of Jobs",
+        title=dict(text=f'Top {n_pairs} Skill Pairs by {pairs_label}', font=dict(color='#1a3a5c', size=16)),
+        xaxis_title=pairs_label,
         yaxis_title="Skill Pair",
         height=max(400, n_pairs * 40),
         plot_bgcolor='white',
@@ -751,7 +860,6 @@ elif page == "Skill Relationships":
     # Detailed table
     df_display_formatted = df_display.copy()
     df_display_formatted.insert(0, 'Rank', range(1, len(df_display_formatted) + 1))
-    df_display_formatted.columns = ['Rank', 'Skill 1', 'Skill 2', 'Co-occurrence Count']
 
     st.dataframe(
         df_display_formatted,
@@ -759,9 +867,12 @@ elif page == "Skill Relationships":
         hide_index=True,
         column_config={
             "Rank": st.column_config.NumberColumn("Rank", width="small"),
-            "Skill 1": st.column_config.TextColumn("Skill 1", width="medium"),
-            "Skill 2": st.column_config.TextColumn("Skill 2", width="medium"),
-            "Co-occurrence Count": st.column_config.NumberColumn("Appears Together", width="small")
+            "skill_1": st.column_config.TextColumn("Skill 1", width="medium"),
+            "skill_2": st.column_config.TextColumn("Skill 2", width="medium"),
+            "pair_count": st.column_config.NumberColumn("Appears Together", width="small"),
+            "jaccard": st.column_config.NumberColumn("Jaccard", format="%.3f", width="small"),
+            "lift": st.column_config.NumberColumn("Lift", format="%.2f", width="small"),
+            "pmi": st.column_config.NumberColumn("PMI", format="%.2f", width="small")
         }
     )
 
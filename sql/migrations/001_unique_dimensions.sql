@@ -0,0 +1,62 @@
+-- Migration 001: unique constraints on the dimension tables
+-- Racing loaders could create the same company/location/skill twice, so any
+-- duplicates are merged into the lowest id before the constraints are added.
+
+-- companies
+UPDATE job_postings AS jp
+SET company_id = d.keep_id
+FROM (
+    SELECT company_id, MIN(company_id) OVER (PARTITION BY company_name) AS keep_id
+    FROM companies
+) AS d
+WHERE jp.company_id = d.company_id
+  AND d.company_id <> d.keep_id;
+
+DELETE FROM companies AS c
+USING companies AS k
+WHERE c.company_name = k.company_name
+  AND c.company_id > k.company_id;
+
+ALTER TABLE companies ADD CONSTRAINT companies_company_name_key UNIQUE (company_name);
+
+-- locations
+UPDATE job_postings AS jp
+SET location_id = d.keep_id
+FROM (
+    SELECT location_id, MIN(location_id) OVER (PARTITION BY city, province) AS keep_id
+    FROM locations
+) AS d
+WHERE jp.location_id = d.location_id
+  AND d.location_id <> d.keep_id;
+
+DELETE FROM locations AS l
+USING locations AS k
+WHERE l.city = k.city
+  AND l.province = k.province
+  AND l.location_id > k.location_id;
+
+ALTER TABLE locations ADD CONSTRAINT locations_city_province_key UNIQUE (city, province);
+
+-- skills (a job can be linked to two copies of the same skill, so merge job_skills first)
+CREATE TEMP TABLE skill_merge ON COMMIT DROP AS
+SELECT skill_id, MIN(skill_id) OVER (PARTITION BY skill_name) AS keep_id
+FROM skills;
+
+INSERT INTO job_skills (job_id, skill_id)
+SELECT DISTINCT js.job_id, m.keep_id
+FROM job_skills AS js
+JOIN skill_merge AS m ON js.skill_id = m.skill_id
+WHERE m.skill_id <> m.keep_id
+ON CONFLICT DO NOTHING;
+
+DELETE FROM job_skills AS js
+USING skill_merge AS m
+WHERE js.skill_id = m.skill_id
+  AND m.skill_id <> m.keep_id;
+
+DELETE FROM skills AS s
+USING skill_merge AS m
+WHERE s.skill_id = m.skill_id
+  AND m.skill_id <> m.keep_id;
+
+ALTER TABLE skills ADD CONSTRAINT skills_skill_name_key UNIQUE (skill_name);
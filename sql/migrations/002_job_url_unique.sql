@@ -0,0 +1,19 @@
+-- Migration 002: declare job_postings.job_url and make it unique
+-- The loader has always written job_url but schema.sql never declared it.
+-- Postings that were inserted more than once are collapsed onto the lowest job_id.
+
+ALTER TABLE job_postings ADD COLUMN IF NOT EXISTS job_url TEXT;
+
+CREATE TEMP TABLE duplicate_jobs ON COMMIT DROP AS
+SELECT job_id
+FROM (
+    SELECT job_id, ROW_NUMBER() OVER (PARTITION BY job_url ORDER BY job_id) AS copy_number
+    FROM job_postings
+    WHERE job_url IS NOT NULL
+) AS copies
+WHERE copy_number > 1;
+
+DELETE FROM job_skills WHERE job_id IN (SELECT job_id FROM duplicate_jobs);
+DELETE FROM job_postings WHERE job_id IN (SELECT job_id FROM duplicate_jobs);
+
+CREATE UNIQUE INDEX job_postings_job_url_key ON job_postings (job_url);
@@ -0,0 +1,36 @@
+-- Migration 003: content fingerprint for postings
+-- content_hash = sha256 of the normalized title, employer, city and description
+-- (lowercased, whitespace collapsed, joined with chr(31)). It must stay in sync
+-- with job_fingerprint() in src/dedup.py.
+-- lower() and \s follow the database's locale, so this only matches Python for
+-- plain ASCII text; run `python src/backfill.py content-hashes` afterwards to
+-- recompute every hash with job_fingerprint() itself.
+
+ALTER TABLE job_postings ADD COLUMN IF NOT EXISTS content_hash CHAR(64);
+
+UPDATE job_postings AS jp
+SET content_hash = encode(sha256(convert_to(concat_ws(chr(31),
+        btrim(regexp_replace(lower(coalesce(jp.job_title, '')), '\s+', ' ', 'g')),
+        btrim(regexp_replace(lower(coalesce(c.company_name, '')), '\s+', ' ', 'g')),
+        btrim(regexp_replace(lower(coalesce(l.city, '')), '\s+', ' ', 'g')),
+        btrim(regexp_replace(lower(coalesce(jp.job_description, '')), '\s+', ' ', 'g'))
+    ), 'UTF8')), 'hex')
+FROM companies AS c, locations AS l
+WHERE c.company_id = jp.company_id
+  AND l.location_id = jp.location_id;
+
+-- postings without an apply link were re-inserted on every run, keep the first copy
+CREATE TEMP TABLE duplicate_jobs ON COMMIT DROP AS
+SELECT job_id
+FROM (
+    SELECT job_id, ROW_NUMBER() OVER (PARTITION BY content_hash ORDER BY job_id) AS copy_number
+    FROM job_postings
+) AS copies
+WHERE copy_number > 1;
+
+DELETE FROM job_skills WHERE job_id IN (SELECT job_id FROM duplicate_jobs);
+DELETE FROM job_postings WHERE job_id IN (SELECT job_id FROM duplicate_jobs);
+
+ALTER TABLE job_postings ALTER COLUMN content_hash SET NOT NULL;
+
+CREATE UNIQUE INDEX job_postings_content_hash_key ON job_postings (content_hash);
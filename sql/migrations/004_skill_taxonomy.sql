@@ -0,0 +1,8 @@
+-- Migration 004: track which skill taxonomy version each posting was extracted with
+-- Existing postings were extracted by the hardcoded list that predates
+-- config/skills.json, which counts as version 1.
+
+ALTER TABLE job_postings ADD COLUMN IF NOT EXISTS skills_version INT;
+UPDATE job_postings SET skills_version = 1 WHERE skills_version IS NULL;
+
+ALTER TABLE skills ADD COLUMN IF NOT EXISTS category VARCHAR(50);
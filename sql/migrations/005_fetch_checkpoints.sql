@@ -0,0 +1,11 @@
+-- Migration 005: per-query high-water marks for incremental fetching
+-- last_posted_at is the newest posting timestamp ingested for the query and
+-- seen_job_ids holds the JSearch job_ids posted at exactly that instant, so ties
+-- on the boundary aren't dropped or re-processed.
+
+CREATE TABLE IF NOT EXISTS fetch_checkpoints (
+    query TEXT PRIMARY KEY,
+    last_posted_at TIMESTAMPTZ,
+    seen_job_ids TEXT[] NOT NULL DEFAULT '{}',
+    last_success_at TIMESTAMPTZ NOT NULL
+);
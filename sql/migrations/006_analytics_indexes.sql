@@ -0,0 +1,27 @@
+-- Migration 006: indexes matched to the analytics queries (sql/queries.sql)
+-- Most of them cover every column their query reads so Postgres can answer
+-- from the index alone (index-only scans) instead of scanning job_postings.
+-- Checked by `python src/explain_check.py`.
+
+-- Query 1 (count per skill) and Query 4 (skill pair self-join): skill-first
+-- counterpart of the (job_id, skill_id) primary key
+CREATE INDEX IF NOT EXISTS job_skills_skill_id_job_id_idx ON job_skills (skill_id, job_id);
+
+-- Query 6 (postings per company) and the companies foreign key
+CREATE INDEX IF NOT EXISTS job_postings_company_id_idx
+    ON job_postings (company_id) INCLUDE (location_id, salary_min, salary_max);
+
+-- locations foreign key (joins, and deletes/merges on locations)
+CREATE INDEX IF NOT EXISTS job_postings_location_id_idx ON job_postings (location_id);
+
+-- Query 5 (weekly postings over the last 90 days). B-tree rather than BRIN:
+-- backfilled and late-arriving postings break the insert-order correlation BRIN needs
+CREATE INDEX IF NOT EXISTS job_postings_posted_date_idx
+    ON job_postings (posted_date) INCLUDE (company_id);
+
+-- Query 3 (salary stats per title): rows come out already grouped by title
+CREATE INDEX IF NOT EXISTS job_postings_job_title_idx
+    ON job_postings (job_title) INCLUDE (salary_min, salary_max);
+
+ANALYZE job_postings;
+ANALYZE job_skills;
@@ -0,0 +1,84 @@
+-- Migration 007: summary tables behind the analytics queries
+-- Kept up to date incrementally by src/summaries.py (apply_summary_delta) in the
+-- same transaction as every load/backfill, so analytics reads these small tables
+-- instead of re-aggregating job_postings and job_skills on every run.
+-- `python src/backfill.py summaries` rebuilds them from scratch.
+
+-- Query 1: postings per skill
+CREATE TABLE IF NOT EXISTS skill_counts (
+    skill_id INT PRIMARY KEY REFERENCES skills(skill_id),
+    job_count BIGINT NOT NULL
+);
+
+-- Query 4: postings per skill pair (skill_id_1 < skill_id_2)
+CREATE TABLE IF NOT EXISTS skill_pair_counts (
+    skill_id_1 INT NOT NULL REFERENCES skills(skill_id),
+    skill_id_2 INT NOT NULL REFERENCES skills(skill_id),
+    pair_count BIGINT NOT NULL,
+    PRIMARY KEY (skill_id_1, skill_id_2)
+);
+
+-- Query 3: salary distribution per title, one row per distinct midpoint so the
+-- median and standard deviation can still be computed exactly
+CREATE TABLE IF NOT EXISTS title_salary_counts (
+    job_title VARCHAR(255) NOT NULL,
+    salary_mid INT NOT NULL,
+    job_count BIGINT NOT NULL,
+    salary_range_sum BIGINT NOT NULL,
+    PRIMARY KEY (job_title, salary_mid)
+);
+
+-- Query 6: postings and salary totals per company and location
+CREATE TABLE IF NOT EXISTS company_location_counts (
+    company_id INT NOT NULL REFERENCES companies(company_id),
+    location_id INT NOT NULL REFERENCES locations(location_id),
+    job_count BIGINT NOT NULL,
+    salary_mid_sum BIGINT NOT NULL,
+    PRIMARY KEY (company_id, location_id)
+);
+
+-- Query 5: postings per company per day
+CREATE TABLE IF NOT EXISTS company_daily_postings (
+    posted_date DATE NOT NULL,
+    company_id INT NOT NULL REFERENCES companies(company_id),
+    job_count BIGINT NOT NULL,
+    PRIMARY KEY (posted_date, company_id)
+);
+
+-- Query 1's denominator (postings with at least one skill); a single row
+CREATE TABLE IF NOT EXISTS summary_totals (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    jobs_with_skills BIGINT NOT NULL
+);
+
+TRUNCATE skill_counts, skill_pair_counts, title_salary_counts, company_location_counts,
+    company_daily_postings, summary_totals;
+
+INSERT INTO skill_counts (skill_id, job_count)
+SELECT skill_id, COUNT(*) FROM job_skills GROUP BY skill_id;
+
+INSERT INTO skill_pair_counts (skill_id_1, skill_id_2, pair_count)
+SELECT js1.skill_id, js2.skill_id, COUNT(*)
+FROM job_skills AS js1
+JOIN job_skills AS js2 ON js1.job_id = js2.job_id AND js1.skill_id < js2.skill_id
+GROUP BY js1.skill_id, js2.skill_id;
+
+INSERT INTO title_salary_counts (job_title, salary_mid, job_count, salary_range_sum)
+SELECT job_title, (salary_min + salary_max) / 2, COUNT(*), SUM(salary_max - salary_min)
+FROM job_postings
+GROUP BY 1, 2;
+
+INSERT INTO company_location_counts (company_id, location_id, job_count, salary_mid_sum)
+SELECT company_id, location_id, COUNT(*), SUM((salary_min + salary_max) / 2)
+FROM job_postings
+GROUP BY company_id, location_id;
+
+INSERT INTO company_daily_postings (posted_date, company_id, job_count)
+SELECT posted_date, company_id, COUNT(*)
+FROM job_postings
+WHERE posted_date IS NOT NULL
+GROUP BY posted_date, company_id;
+
+INSERT INTO summary_totals (id, jobs_with_skills)
+SELECT TRUE, COUNT(DISTINCT job_id) FROM job_skills
+HAVING COUNT(DISTINCT job_id) > 0;
@@ -0,0 +1,21 @@
+-- Migration 008: ledger of scheduler runs (src/etl_runs.py)
+-- One row per attempt. scheduled_for is the slot the run covers (a cadence tick,
+-- the time of a manual run, or the day being backfilled); the scheduler compares
+-- it with the latest succeeded run to find slots missed while it was down.
+-- status: running -> succeeded | failed, or interrupted if the process died.
+
+CREATE TABLE IF NOT EXISTS etl_runs (
+    run_id BIGSERIAL PRIMARY KEY,
+    job_name VARCHAR(50) NOT NULL,
+    scheduled_for TIMESTAMPTZ NOT NULL,
+    trigger VARCHAR(20) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'running',
+    started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMPTZ,
+    jobs_loaded INTEGER,
+    error TEXT,
+    host VARCHAR(255),
+    pid INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS etl_runs_job_name_scheduled_for_idx ON etl_runs (job_name, scheduled_for);
@@ -0,0 +1,16 @@
+-- Migration 009: drop the migration 006 indexes nothing reads any more
+-- Since migration 007 the analytics queries read the summary tables, and the
+-- dashboard's filtered_* queries and the summary deltas look postings up by
+-- job_id, location_id and posted_date. These three only cost write time on
+-- every load. Checked by `python src/explain_check.py`.
+
+-- Query 3 reads title_salary_counts
+DROP INDEX IF EXISTS job_postings_job_title_idx;
+
+-- Query 6 reads company_location_counts. Companies are never deleted, so the
+-- foreign key doesn't need it either
+DROP INDEX IF EXISTS job_postings_company_id_idx;
+
+-- Queries 1 and 4 read skill_counts/skill_pair_counts; every job_skills lookup
+-- left is by job_id (the primary key)
+DROP INDEX IF EXISTS job_skills_skill_id_job_id_idx;
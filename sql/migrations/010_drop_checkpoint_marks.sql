@@ -0,0 +1,8 @@
+-- Migration 010: fetch checkpoints keep only the last successful run
+-- The fetcher picks its date_posted window from last_success_at and never
+-- filters on posting dates (results aren't in date order), so the per-query
+-- high-water mark from migration 005 was written but never read.
+
+ALTER TABLE fetch_checkpoints
+    DROP COLUMN IF EXISTS last_posted_at,
+    DROP COLUMN IF EXISTS seen_job_ids;
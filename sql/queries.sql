@@ -1,16 +1,22 @@
--- Query 1: Top 10 In-Demand Skills
+-- Analytics queries, one block per `-- name:` header. Registered (parameters,
+-- output file) in src/queries.py, which is the only place that runs them.
+-- Most read the summary tables from migration 007 (kept up to date by
+-- src/summaries.py) rather than aggregating job_postings/job_skills.
+
+-- name: top_skills
+-- Top In-Demand Skills
 SELECT
     s.skill_name,
-    COUNT(*) as job_count,
-    ROUND(COUNT(*) * 100.0 / (SELECT COUNT(DISTINCT job_id) FROM job_skills), 2) as percentage_of_jobs
-FROM job_skills js
-JOIN skills s ON js.skill_id = s.skill_id
-GROUP BY s.skill_name
-ORDER BY job_count DESC
-LIMIT 10;
+    sc.job_count,
+    ROUND(sc.job_count * 100.0 / t.jobs_with_skills, 2) as percentage_of_jobs
+FROM skill_counts sc
+JOIN skills s ON sc.skill_id = s.skill_id
+CROSS JOIN summary_totals t
+ORDER BY sc.job_count DESC, s.skill_name
+LIMIT %(limit)s;
 
-
--- Query 2: Job Postings with Company and Location Details
+-- name: job_details
+-- Job Postings with Company and Location Details
 SELECT
     jp.job_id,
     jp.job_title,
@@ -24,53 +30,143 @@ FROM job_postings jp
 JOIN companies c ON jp.company_id = c.company_id
 JOIN locations l ON jp.location_id = l.location_id
 ORDER BY jp.job_id
-LIMIT 10;
+LIMIT %(limit)s;
 
--- Query 3: Average Salary by role (rounded average, # of jobs w title, salary range, median, standard deviation)
-SELECT job_title, 
-ROUND(AVG((salary_min + salary_max) / 2 )) as avg_salary,
-COUNT(*) as job_count,
-AVG(salary_max - salary_min) as salary_range,
-PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY (salary_min + salary_max) / 2) as median_salary,
-STDDEV((salary_min + salary_max) / 2) as std_salary
-FROM job_postings
-GROUP BY job_title
-;
+-- name: salary_by_role
+-- Average Salary by role (rounded average, # of jobs w title, salary range, median, standard deviation)
+-- first_pos/n locate each salary midpoint in the title's sorted distribution so the
+-- median is interpolated exactly like PERCENTILE_CONT(0.5)
+WITH distribution AS (
+    SELECT job_title, salary_mid, job_count, salary_range_sum,
+        SUM(job_count) OVER (PARTITION BY job_title ORDER BY salary_mid) - job_count AS first_pos,
+        SUM(job_count) OVER (PARTITION BY job_title) AS n
+    FROM title_salary_counts
+)
+SELECT job_title,
+ROUND(SUM(salary_mid * job_count)::numeric / MAX(n)) as avg_salary,
+MAX(n)::bigint as job_count,
+SUM(salary_range_sum)::numeric / MAX(n) as salary_range,
+(MAX(salary_mid) FILTER (WHERE FLOOR((n - 1) / 2.0) BETWEEN first_pos AND first_pos + job_count - 1)
+ + MAX(salary_mid) FILTER (WHERE CEIL((n - 1) / 2.0) BETWEEN first_pos AND first_pos + job_count - 1)) / 2.0::float8 as median_salary,
+CASE WHEN MAX(n) > 1 THEN
+    SQRT((SUM(salary_mid::numeric * salary_mid * job_count) - SUM(salary_mid::numeric * job_count) ^ 2 / MAX(n)) / (MAX(n) - 1))
+END as std_salary
+FROM distribution
+GROUP BY job_title;
 
--- Query 4 - Skill Occurence
+-- name: skill_cooccurrence
+-- Skill Co-occurrence (pairs seen together in at least min_pairs postings)
 SELECT
     s1.skill_name AS skill_1,
     s2.skill_name AS skill_2,
-    COUNT(*) as pair_count
-FROM job_skills AS js1
-JOIN job_skills AS js2 ON js1.job_id = js2.job_id AND js1.skill_id < js2.skill_id
-JOIN skills AS s1 ON s1.skill_id = js1.skill_id
-JOIN skills AS s2 ON s2.skill_id = js2.skill_id
-GROUP BY skill_1, skill_2
-HAVING COUNT(*) >= 5
-ORDER BY pair_count DESC
-;
+    spc.pair_count
+FROM skill_pair_counts AS spc
+JOIN skills AS s1 ON s1.skill_id = spc.skill_id_1
+JOIN skills AS s2 ON s2.skill_id = spc.skill_id_2
+WHERE spc.pair_count >= %(min_pairs)s
+ORDER BY spc.pair_count DESC;
 
--- Query 5 - Hiring Trends Over Time
-SELECT 
+-- name: hiring_trends
+-- Hiring Trends Over Time (postings per week over the last `days` days)
+SELECT
     DATE_TRUNC('week', posted_date) AS week_start,
-    COUNT(*) as jobs_posted,
+    SUM(job_count)::bigint as jobs_posted,
     COUNT(DISTINCT company_id) as unique_companies
-FROM job_postings 
-WHERE posted_date >= CURRENT_DATE - INTERVAL '90 days'
+FROM company_daily_postings
+WHERE posted_date >= CURRENT_DATE - %(days)s * INTERVAL '1 day'
 GROUP BY week_start
-ORDER BY week_start DESC
-;
+ORDER BY week_start DESC;
 
--- Query 6 - Top Hiring Companies
+-- name: top_companies
+-- Top Hiring Companies (at least min_jobs postings)
 SELECT
     c.company_name,
-    COUNT(*) as job_count,
-    COUNT(DISTINCT location_id) AS unique_locations,
-    AVG((salary_min + salary_max) / 2) AS avg_salary
+    SUM(clc.job_count)::bigint as job_count,
+    COUNT(*) AS unique_locations,
+    SUM(clc.salary_mid_sum) / SUM(clc.job_count) AS avg_salary
 FROM companies AS c
-JOIN job_postings AS jp ON c.company_id = jp.company_id
+JOIN company_location_counts AS clc ON c.company_id = clc.company_id
+GROUP BY c.company_name
+HAVING SUM(clc.job_count) >= %(min_jobs)s
+ORDER BY job_count DESC;
+
+-- name: filter_options
+-- Province/city pairs that have postings (the dashboard's filter choices)
+SELECT l.province, l.city, COUNT(*) AS job_count
+FROM job_postings jp
+JOIN locations l ON jp.location_id = l.location_id
+GROUP BY l.province, l.city
+ORDER BY l.province, l.city;
+
+-- name: posting_filter
+-- Dashboard filters, included by the filtered_ queries below.
+-- Every filter is optional and on its own `AND` line: src/queries.py leaves out
+-- the lines whose parameter is None, so the planner only sees the filters that
+-- are set and can use an index for them.
+SELECT jp.job_id, jp.company_id, jp.location_id, jp.salary_min, jp.salary_max
+FROM job_postings jp
+JOIN locations l ON jp.location_id = l.location_id
+WHERE TRUE
+  AND l.province = %(province)s
+  AND l.city = %(city)s
+  AND jp.is_remote = %(is_remote)s
+  AND jp.experience_level = %(experience_level)s
+  AND jp.posted_date >= %(date_from)s
+  AND jp.posted_date <= %(date_to)s
+
+-- name: filtered_top_skills
+-- top_skills over the postings matching the dashboard filters
+WITH filtered AS (
+{{posting_filter}}
+),
+matched AS (
+    SELECT js.job_id, js.skill_id
+    FROM job_skills js
+    JOIN filtered f ON f.job_id = js.job_id
+)
+SELECT
+    s.skill_name,
+    COUNT(*) as job_count,
+    ROUND(COUNT(*) * 100.0 / (SELECT COUNT(DISTINCT job_id) FROM matched), 2) as percentage_of_jobs
+FROM matched m
+JOIN skills s ON m.skill_id = s.skill_id
+GROUP BY s.skill_name
+ORDER BY job_count DESC, s.skill_name
+LIMIT %(limit)s;
+
+-- name: filtered_job_details
+-- job_details over the postings matching the dashboard filters
+WITH filtered AS (
+{{posting_filter}}
+)
+SELECT
+    jp.job_id,
+    jp.job_title,
+    c.company_name,
+    l.city,
+    l.province,
+    jp.salary_min,
+    jp.salary_max,
+    jp.is_remote
+FROM filtered f
+JOIN job_postings jp ON jp.job_id = f.job_id
+JOIN companies c ON jp.company_id = c.company_id
+JOIN locations l ON jp.location_id = l.location_id
+ORDER BY jp.job_id
+LIMIT %(limit)s;
+
+-- name: filtered_top_companies
+-- top_companies over the postings matching the dashboard filters
+WITH filtered AS (
+{{posting_filter}}
+)
+SELECT
+    c.company_name,
+    COUNT(*) as job_count,
+    COUNT(DISTINCT f.location_id) AS unique_locations,
+    AVG((f.salary_min + f.salary_max) / 2) AS avg_salary
+FROM filtered f
+JOIN companies c ON f.company_id = c.company_id
 GROUP BY c.company_name
-HAVING COUNT(*) >= 3
-ORDER BY job_count DESC
-;
\ No newline at end of file
+HAVING COUNT(*) >= %(min_jobs)s
+ORDER BY job_count DESC;
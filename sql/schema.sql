@@ -4,7 +4,7 @@ CREATE DATABASE job_market_db;
 
 CREATE TABLE companies (
     company_id SERIAL PRIMARY KEY,
-    company_name VARCHAR(255) NOT NULL
+    company_name VARCHAR(255) NOT NULL UNIQUE
 );
 
 -- storing unique cities
@@ -12,14 +12,16 @@ CREATE TABLE companies (
 CREATE TABLE locations (
     location_id SERIAL PRIMARY KEY,
     city VARCHAR(100) NOT NULL,
-    province VARCHAR(100) NOT NULL
+    province VARCHAR(100) NOT NULL,
+    UNIQUE (city, province)
 );
 
 -- storing unique skills
 
 CREATE TABLE skills (
     skill_id SERIAL PRIMARY KEY,
-    skill_name VARCHAR(100) NOT NULL
+    skill_name VARCHAR(100) NOT NULL UNIQUE,
+    category VARCHAR(50)
 );
 
 -- job postings table (info)
@@ -35,9 +37,22 @@ CREATE TABLE job_postings (
     posted_date DATE,
     is_remote BOOLEAN,
     experience_level VARCHAR(50),
-    job_description TEXT
+    job_description TEXT,
+    job_url TEXT,
+    -- sha256 of normalized title/employer/city/description (see job_fingerprint in src/dedup.py)
+    content_hash CHAR(64) NOT NULL,
+    -- config/skills.json version the job_skills rows were extracted with
+    skills_version INT
 );
 
+-- dedup lookups for incoming postings (NULL urls are allowed to repeat)
+CREATE UNIQUE INDEX job_postings_job_url_key ON job_postings (job_url);
+CREATE UNIQUE INDEX job_postings_content_hash_key ON job_postings (content_hash);
+
+-- dashboard filter indexes, matched to sql/queries.sql (see src/explain_check.py)
+CREATE INDEX job_postings_location_id_idx ON job_postings (location_id);
+CREATE INDEX job_postings_posted_date_idx ON job_postings (posted_date) INCLUDE (company_id);
+
 -- job skills table
 CREATE TABLE job_skills (
     job_id INT NOT NULL,
@@ -46,3 +61,85 @@ CREATE TABLE job_skills (
     FOREIGN KEY (job_id) REFERENCES job_postings(job_id),
     FOREIGN KEY (skill_id) REFERENCES skills(skill_id)
 );
+
+-- per-query last successful fetch, for incremental fetching (see src/checkpoints.py)
+CREATE TABLE fetch_checkpoints (
+    query TEXT PRIMARY KEY,
+    last_success_at TIMESTAMPTZ NOT NULL
+);
+
+-- summary tables behind the analytics queries, maintained by src/summaries.py
+CREATE TABLE skill_counts (
+    skill_id INT PRIMARY KEY REFERENCES skills(skill_id),
+    job_count BIGINT NOT NULL
+);
+
+CREATE TABLE skill_pair_counts (
+    skill_id_1 INT NOT NULL REFERENCES skills(skill_id),
+    skill_id_2 INT NOT NULL REFERENCES skills(skill_id),
+    pair_count BIGINT NOT NULL,
+    PRIMARY KEY (skill_id_1, skill_id_2)
+);
+
+CREATE TABLE title_salary_counts (
+    job_title VARCHAR(255) NOT NULL,
+    salary_mid INT NOT NULL,
+    job_count BIGINT NOT NULL,
+    salary_range_sum BIGINT NOT NULL,
+    PRIMARY KEY (job_title, salary_mid)
+);
+
+CREATE TABLE company_location_counts (
+    company_id INT NOT NULL REFERENCES companies(company_id),
+    location_id INT NOT NULL REFERENCES locations(location_id),
+    job_count BIGINT NOT NULL,
+    salary_mid_sum BIGINT NOT NULL,
+    PRIMARY KEY (company_id, location_id)
+);
+
+CREATE TABLE company_daily_postings (
+    posted_date DATE NOT NULL,
+    company_id INT NOT NULL REFERENCES companies(company_id),
+    job_count BIGINT NOT NULL,
+    PRIMARY KEY (posted_date, company_id)
+);
+
+CREATE TABLE summary_totals (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    jobs_with_skills BIGINT NOT NULL
+);
+
+-- one row per scheduler run attempt, see src/etl_runs.py
+CREATE TABLE etl_runs (
+    run_id BIGSERIAL PRIMARY KEY,
+    job_name VARCHAR(50) NOT NULL,
+    scheduled_for TIMESTAMPTZ NOT NULL,
+    trigger VARCHAR(20) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'running',
+    started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMPTZ,
+    jobs_loaded INTEGER,
+    error TEXT,
+    host VARCHAR(255),
+    pid INTEGER
+);
+
+CREATE INDEX etl_runs_job_name_scheduled_for_idx ON etl_runs (job_name, scheduled_for);
+
+-- migrations already reflected in this file (see sql/migrations, applied by src/migrate.py)
+CREATE TABLE schema_migrations (
+    version VARCHAR(255) PRIMARY KEY,
+    applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO schema_migrations (version) VALUES
+    ('001_unique_dimensions'),
+    ('002_job_url_unique'),
+    ('003_content_hash'),
+    ('004_skill_taxonomy'),
+    ('005_fetch_checkpoints'),
+    ('006_analytics_indexes'),
+    ('007_summary_tables'),
+    ('008_etl_runs'),
+    ('009_drop_unused_indexes'),
+    ('010_drop_checkpoint_marks');
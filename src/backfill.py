@@ -0,0 +1,154 @@
+import argparse
+import logging
+from db import fetch_stale_skill_jobs, replace_job_skills, sync_skills, fetch_unclassified_jobs, update_job_attributes, fetch_job_contents, update_content_hashes
+from dedup import job_fingerprint
+from skills import get_skill_extractor
+from transform import TransformEngine, extract_skills, classify_experience, is_remote_job
+from checkpoints import posted_at
+from response_cache import ResponseCache
+from summaries import rebuild_summaries
+
+def backfill_skills(batch_size=5000):
+    """Re-extracts skills for every stored posting that predates the current taxonomy version.
+
+    Works through job_postings in job_id order, one transaction per batch, so it can
+    be stopped and restarted at any point. Extraction for each batch is spread over
+    a process pool, so large backfills scale with the number of cores.
+    Returns the number of postings updated.
+    """
+    extractor = get_skill_extractor()
+    sync_skills(extractor.categories)
+
+    updated = 0
+    last_job_id = 0
+
+    with TransformEngine() as engine:
+        while True:
+            rows = fetch_stale_skill_jobs(extractor.version, last_job_id, batch_size)
+            if not rows:
+                break
+
+            extracted = engine.map(extract_skills, [job_description for _, job_description in rows])
+            if any(version != extractor.version for version, _ in extracted):
+                raise RuntimeError("Skill taxonomy changed during the backfill, run it again")
+
+            job_skills = {job_id: skills for (job_id, _), (_, skills) in zip(rows, extracted)}
+            replace_job_skills(job_skills, extractor.version)
+
+            updated += len(rows)
+            last_job_id = rows[-1][0]
+            logging.info(f"Skill backfill - {updated} postings re-extracted with taxonomy v{extractor.version}")
+
+    print(f"Skill backfill complete: {updated} postings now on taxonomy v{extractor.version}")
+    return updated
+
+def cached_posted_dates(cache):
+    """job_url -> posted date for every posting in the raw response cache"""
+    posted_dates = {}
+    for day in cache.days():
+        for _, _, response in cache.iter_day(day):
+            for job in response.get('data') or []:
+                posted = posted_at(job)
+                if job.get('job_apply_link') and posted:
+                    posted_dates[job['job_apply_link']] = posted.date()
+    return posted_dates
+
+def backfill_attributes(batch_size=5000, cache=None):
+    """Fills experience_level, is_remote and posted_date on postings loaded before transform set them.
+
+    Seniority and remote status are re-derived from the stored title and description.
+    posted_date isn't stored anywhere else, so it comes from the raw API responses
+    still in the response cache (matched on job_url); postings older than the cache
+    keep a NULL posted_date and aren't revisited. Values already stored (e.g. the
+    API's job_is_remote flag) are never replaced. Returns the number of postings checked.
+    """
+    posted_dates = cached_posted_dates(cache or ResponseCache())
+    logging.info(f"Attribute backfill - {len(posted_dates)} posted dates found in the response cache")
+
+    updated = 0
+    last_job_id = 0
+
+    while True:
+        rows = fetch_unclassified_jobs(last_job_id, batch_size, posted_dates.keys())
+        if not rows:
+            break
+
+        update_job_attributes([
+            (
+                job_id,
+                classify_experience(job_title),
+                is_remote_job(job_title, job_description),
+                posted_date or posted_dates.get(job_url),
+            )
+            for job_id, job_title, job_description, job_url, posted_date in rows
+        ])
+
+        updated += len(rows)
+        last_job_id = rows[-1][0]
+        logging.info(f"Attribute backfill - {updated} postings checked")
+
+    print(f"Attribute backfill complete: {updated} postings checked")
+    return updated
+
+def backfill_content_hashes(batch_size=5000):
+    """Recomputes every stored content_hash with job_fingerprint().
+
+    Migration 003 hashed existing postings in SQL, where lower() and \\s depend on
+    the database's locale and don't match Python for non-ASCII text or no-break
+    spaces; such postings would never be recognised when fetched again. Postings
+    that now share a fingerprint are merged (see update_content_hashes). Safe to
+    rerun. Returns the number of hashes changed.
+    """
+    changed = removed = 0
+    last_job_id = 0
+
+    while True:
+        rows = fetch_job_contents(last_job_id, batch_size)
+        if not rows:
+            break
+
+        content_hashes = {}
+        for job_id, job_title, company_name, city, job_description, content_hash in rows:
+            fingerprint = job_fingerprint(job_title, company_name, city, job_description)
+            if fingerprint != content_hash:
+                content_hashes[job_id] = fingerprint
+        removed += update_content_hashes(content_hashes)
+
+        changed += len(content_hashes)
+        last_job_id = rows[-1][0]
+        logging.info(f"Content hash backfill - {changed} hashes changed so far")
+
+    print(f"Content hash backfill complete: {changed} hashes changed, {removed} duplicate postings removed")
+    return changed
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Backfill derived data for historical job postings")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    skills_parser = subcommands.add_parser('skills', help="re-extract skills after a taxonomy version bump")
+    skills_parser.add_argument('--batch-size', type=int, default=5000)
+
+    attributes_parser = subcommands.add_parser(
+        'attributes', help="fill experience_level, is_remote and posted_date on older postings"
+    )
+    attributes_parser.add_argument('--batch-size', type=int, default=5000)
+
+    content_hashes_parser = subcommands.add_parser(
+        'content-hashes', help="recompute stored content hashes with the Python fingerprint"
+    )
+    content_hashes_parser.add_argument('--batch-size', type=int, default=5000)
+
+    subcommands.add_parser('summaries', help="rebuild the analytics summary tables from scratch")
+
+    args = parser.parse_args()
+
+    if args.command == 'skills':
+        backfill_skills(batch_size=args.batch_size)
+    elif args.command == 'attributes':
+        backfill_attributes(batch_size=args.batch_size)
+    elif args.command == 'content-hashes':
+        backfill_content_hashes(batch_size=args.batch_size)
+    elif args.command == 'summaries':
+        rebuild_summaries()
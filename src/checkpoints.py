@@ -0,0 +1,93 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from psycopg2.extras import execute_values
+from db import connection
+
+def posted_at(job):
+    """The posting's timestamp as an aware UTC datetime, or None if the API didn't send one"""
+    timestamp = job.get('job_posted_at_timestamp')
+    if timestamp:
+        return datetime.fromtimestamp(int(timestamp), tz=timezone.utc)
+
+    posted = job.get('job_posted_at_datetime_utc')
+    if posted:
+        try:
+            parsed = datetime.fromisoformat(posted.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+    return None
+
+class QueryCheckpoint:
+    """Fetch checkpoint for one search query.
+
+    Chooses the narrowest JSearch `date_posted` window that still covers everything
+    since the last successful run. Nothing is dropped on posting dates: JSearch
+    doesn't return results in date order and a run only follows JSEARCH_MAX_PAGES
+    pages, so an older posting can still be new to us. Repeats are removed by
+    dedupe_jobs. The new last_success_at is only persisted (save_checkpoints) once
+    the run's loads have committed.
+    """
+
+    def __init__(self, query, last_success_at=None):
+        self.query = query
+        self.last_success_at = last_success_at
+        # Set by the fetcher when the query errors out, so its checkpoint isn't advanced
+        self.failed = False
+
+    def date_posted(self, now=None):
+        """JSearch date_posted value covering the time since the last successful run"""
+        if self.last_success_at is None:
+            return 'all'
+
+        now = now or datetime.now(timezone.utc)
+        # TIMESTAMPTZ comes back in the session time zone; compare calendar days in UTC
+        if self.last_success_at.astimezone(timezone.utc).date() == now.astimezone(timezone.utc).date():
+            return 'today'
+
+        elapsed = now - self.last_success_at
+        if elapsed <= timedelta(days=2):
+            return '3days'
+        if elapsed <= timedelta(days=6):
+            return 'week'
+        if elapsed <= timedelta(days=29):
+            return 'month'
+        return 'all'
+
+def load_checkpoints(queries):
+    """One QueryCheckpoint per query (a fresh one for queries we've never run)"""
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            "SELECT query, last_success_at FROM fetch_checkpoints WHERE query = ANY(%s)",
+            (list(queries),)
+        )
+        last_success = dict(c.fetchall())
+        c.close()
+
+    return {query: QueryCheckpoint(query, last_success.get(query)) for query in queries}
+
+def save_checkpoints(checkpoints, completed_at=None):
+    """Records the run as each query's last success; call only after everything fetched has been loaded"""
+    completed_at = completed_at or datetime.now(timezone.utc)
+
+    rows = [
+        (checkpoint.query, completed_at)
+        for checkpoint in checkpoints.values()
+        if not checkpoint.failed
+    ]
+    if not rows:
+        return
+
+    with connection() as conn:
+        c = conn.cursor()
+        execute_values(
+            c,
+            """INSERT INTO fetch_checkpoints (query, last_success_at) VALUES %s
+               ON CONFLICT (query) DO UPDATE SET last_success_at = EXCLUDED.last_success_at""",
+            rows
+        )
+        c.close()
+
+    logging.info(f"Saved fetch checkpoints for {len(rows)} queries")
@@ -0,0 +1,193 @@
+import logging
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from db import connection
+
+# Seconds before get_cooccurrence() checks whether job_skills changed (0 checks every call)
+COOCCURRENCE_CHECK_SECONDS = float(os.getenv('COOCCURRENCE_CHECK_SECONDS', 60))
+
+# Pair metrics the dashboard can rank by
+METRICS = ('pair_count', 'jaccard', 'lift', 'pmi')
+
+class Cooccurrence:
+    """Skill co-occurrence counts for every pair of skills, as a sparse matrix.
+
+    Built from a one-hot job x skill matrix X (one row per posting with skills):
+    C = X^T X, so C[i, j] is the number of postings requiring both skills i and j
+    and the diagonal C[i, i] is the number of postings requiring skill i.
+    """
+
+    def __init__(self, skills, counts, n_jobs, fingerprint=None):
+        self.skills = np.asarray(skills, dtype=object)
+        self.counts = counts.tocsr()
+        self.n_jobs = n_jobs
+        self.fingerprint = fingerprint
+        self.skill_counts = self.counts.diagonal()
+        self._index = {skill: i for i, skill in enumerate(self.skills)}
+        self._pairs = None
+
+    @classmethod
+    def from_pairs(cls, job_ids, skill_ids, skill_names, fingerprint=None):
+        """Builds C from parallel (job_id, skill_id) arrays and {skill_id: skill_name}"""
+        job_idx = np.unique(job_ids, return_inverse=True)[1]
+        skill_keys, skill_idx = np.unique(skill_ids, return_inverse=True)
+
+        x = sparse.csr_matrix(
+            (np.ones(len(job_idx), dtype=np.int32), (job_idx, skill_idx)),
+            shape=(job_idx.max() + 1 if len(job_idx) else 0, len(skill_keys))
+        )
+        # Duplicate (job, skill) rows would otherwise be summed into a 2
+        x.data[:] = 1
+        counts = (x.T @ x).tocsr()
+        return cls([skill_names[key] for key in skill_keys], counts, x.shape[0], fingerprint)
+
+    def by_frequency(self):
+        """Skill names, most frequent first"""
+        return list(self.skills[self._frequency_order()])
+
+    def _frequency_order(self):
+        return np.argsort(-self.skill_counts, kind='stable')
+
+    def pairs(self):
+        """Every co-occurring pair once (skill_1 < skill_2 by index) with count, Jaccard, lift and PMI"""
+        if self._pairs is None:
+            upper = sparse.triu(self.counts, k=1).tocoo()
+            count = upper.data.astype(float)
+            count_1 = self.skill_counts[upper.row].astype(float)
+            count_2 = self.skill_counts[upper.col].astype(float)
+            # lift = P(a, b) / (P(a) P(b)); PMI is its log
+            lift = count * self.n_jobs / (count_1 * count_2)
+
+            pairs = pd.DataFrame({
+                'skill_1': self.skills[upper.row],
+                'skill_2': self.skills[upper.col],
+                'pair_count': upper.data.astype(np.int64),
+                'jaccard': count / (count_1 + count_2 - count),
+                'lift': lift,
+                'pmi': np.log2(lift),
+            })
+            self._pairs = pairs.sort_values(['pair_count', 'skill_1', 'skill_2'], ascending=[False, True, True], ignore_index=True)
+        return self._pairs
+
+    def top_pairs(self, n=10, metric='pair_count', min_count=1):
+        """The n strongest pairs by `metric`, ignoring pairs seen in fewer than min_count postings"""
+        _check_metric(metric)
+        pairs = self.pairs()
+        pairs = pairs[pairs['pair_count'] >= min_count]
+        return pairs.sort_values([metric, 'pair_count'], ascending=False, kind='stable').head(n).reset_index(drop=True)
+
+    def neighbors(self, skill, n=10, metric='lift', min_count=1):
+        """The n skills most associated with `skill` by `metric`"""
+        _check_metric(metric)
+        i = self._index.get(skill)
+        if i is None:
+            raise KeyError(f"Unknown skill: {skill}")
+
+        row = self.counts.getrow(i).tocoo()
+        keep = (row.col != i) & (row.data >= min_count)
+        cols, count = row.col[keep], row.data[keep].astype(float)
+        count_i, count_j = float(self.skill_counts[i]), self.skill_counts[cols].astype(float)
+        lift = count * self.n_jobs / (count_i * count_j)
+
+        neighbors = pd.DataFrame({
+            'skill': self.skills[cols],
+            'pair_count': row.data[keep].astype(np.int64),
+            'jaccard': count / (count_i + count_j - count),
+            'lift': lift,
+            'pmi': np.log2(lift),
+            # Share of `skill` postings that also ask for this one
+            'confidence': count / count_i,
+        })
+        return neighbors.sort_values([metric, 'pair_count'], ascending=False, kind='stable').head(n).reset_index(drop=True)
+
+    def matrix(self, top_n=20, metric='pair_count'):
+        """Dense skill x skill DataFrame of `metric` for the top_n most frequent skills (for heatmaps).
+
+        The diagonal holds each skill's own posting count for pair_count and is
+        left empty (NaN) for the other metrics.
+        """
+        _check_metric(metric)
+        order = self._frequency_order()[:top_n]
+        counts = self.counts[order][:, order].toarray().astype(float)
+
+        if metric == 'pair_count':
+            values = counts
+        else:
+            freq = self.skill_counts[order].astype(float)
+            row, col = freq[:, None], freq[None, :]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                if metric == 'jaccard':
+                    values = counts / (row + col - counts)
+                else:
+                    values = counts * self.n_jobs / (row * col)
+                    if metric == 'pmi':
+                        values = np.log2(values)
+            values[counts == 0] = np.nan
+            np.fill_diagonal(values, np.nan)
+
+        labels = self.skills[order]
+        return pd.DataFrame(values, index=labels, columns=labels)
+
+def _check_metric(metric):
+    if metric not in METRICS:
+        raise ValueError(f"Unknown co-occurrence metric {metric!r}, expected one of {', '.join(METRICS)}")
+
+"""CHEAP CHANGE CHECK FOR JOB_SKILLS"""
+def _fingerprint(c):
+    # Everything the matrix holds (per-skill counts, pair counts, postings with
+    # skills) is kept in the summary tables (summaries.py), so hashing those is an
+    # exact change check that reads a few thousand rows instead of job_skills
+    c.execute("""
+        SELECT
+            (SELECT COALESCE(MAX(jobs_with_skills), 0) FROM summary_totals),
+            (SELECT md5(COALESCE(string_agg(skill_id || ':' || job_count, ',' ORDER BY skill_id), ''))
+             FROM skill_counts),
+            (SELECT md5(COALESCE(string_agg(skill_id_1 || ':' || skill_id_2 || ':' || pair_count, ','
+                                            ORDER BY skill_id_1, skill_id_2), ''))
+             FROM skill_pair_counts)
+    """)
+    return tuple(c.fetchone())
+
+"""BUILD THE MATRIX FROM JOB_SKILLS"""
+def build_cooccurrence():
+    start = time.perf_counter()
+    with connection() as conn:
+        c = conn.cursor()
+        fingerprint = _fingerprint(c)
+        c.execute("SELECT skill_id, skill_name FROM skills")
+        skill_names = dict(c.fetchall())
+        c.execute("SELECT job_id, skill_id FROM job_skills")
+        pairs = np.array(c.fetchall(), dtype=np.int64).reshape(-1, 2)
+
+    result = Cooccurrence.from_pairs(pairs[:, 0], pairs[:, 1], skill_names, fingerprint)
+    logging.info(
+        f"Co-occurrence - {result.n_jobs} jobs x {len(result.skills)} skills, "
+        f"{result.counts.nnz} non-zero cells in {time.perf_counter() - start:.2f}s"
+    )
+    return result
+
+_cached = None
+_checked_at = 0.0
+_cache_lock = threading.Lock()
+
+def get_cooccurrence(refresh=False):
+    """The current Cooccurrence, rebuilt only when job_skills has changed since the last build"""
+    global _cached, _checked_at
+
+    with _cache_lock:
+        if _cached is not None and not refresh:
+            if time.monotonic() - _checked_at < COOCCURRENCE_CHECK_SECONDS:
+                return _cached
+            with connection() as conn:
+                fingerprint = _fingerprint(conn.cursor())
+            _checked_at = time.monotonic()
+            if fingerprint == _cached.fingerprint:
+                return _cached
+
+        _cached = build_cooccurrence()
+        _checked_at = time.monotonic()
+        return _cached
@@ -0,0 +1,70 @@
+import os
+import streamlit as st
+from results_store import ResultsStore
+
+# 'snapshot' reads the Arrow files run_all_queries writes; 'db' queries PostgreSQL directly
+DASHBOARD_SOURCE = os.getenv('DASHBOARD_SOURCE', 'snapshot')
+# How often (seconds) a session looks for a newer snapshot; reruns in between don't touch disk
+SNAPSHOT_CHECK_SECONDS = int(os.getenv('DASHBOARD_SNAPSHOT_CHECK_SECONDS', 60))
+# How long (seconds) query results from the database are reused
+DASHBOARD_DB_TTL = int(os.getenv('DASHBOARD_DB_TTL', 300))
+DASHBOARD_DB_CACHE_ENTRIES = int(os.getenv('DASHBOARD_DB_CACHE_ENTRIES', 512))
+
+@st.cache_resource
+def get_results_store():
+    return ResultsStore()
+
+@st.cache_resource
+def get_db_pool():
+    """One connection pool shared by every session of this Streamlit server"""
+    from db import get_pool
+    return get_pool()
+
+@st.cache_data(ttl=SNAPSHOT_CHECK_SECONDS, show_spinner=False)
+def snapshot_version():
+    return get_results_store().latest_version()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _snapshot_result(name, version):
+    # Keyed on the version, so a new snapshot is a cache miss and old entries age out
+    return get_results_store().read(name, version)
+
+# Every dashboard filter combination is an entry; least recently used ones go first
+@st.cache_data(ttl=DASHBOARD_DB_TTL, max_entries=DASHBOARD_DB_CACHE_ENTRIES, show_spinner=False)
+def _db_result(name, params):
+    from queries import run_query
+    get_db_pool()
+    # Streamlit's cache is the only cache layer here, so keep out of run_query's
+    return run_query(name, cache=False, **dict(params))
+
+def query(name, **params):
+    """Registered query `name` (src/queries.py) run against PostgreSQL, cached per params"""
+    return _db_result(name, tuple(sorted(params.items())))
+
+def load_result(name):
+    """Result `name` from the configured source, served from Streamlit's cache after the first load"""
+    if DASHBOARD_SOURCE == 'db':
+        return query(name)
+    return _snapshot_result(name, snapshot_version())
+
+def load_filtered(name, filters):
+    """`name` from load_result() when no filter is set, else `filtered_<name>` from the database.
+
+    `filters` holds the posting_filter params (src/queries.py FILTER_PARAMS), None
+    meaning "any". Each filter combination is cached on its own (TTL + max_entries
+    eviction in query()), so flipping back to a previous selection is instant.
+    """
+    active = {key: value for key, value in filters.items() if value is not None}
+    if not active:
+        return load_result(name)
+    return query(f"filtered_{name}", **active)
+
+def load_cooccurrence():
+    """The skill co-occurrence matrix (src/cooccurrence.py), shared by every session.
+
+    get_cooccurrence() keeps one copy per process and rebuilds it only when
+    job_skills changes, so this is a dictionary lookup on most reruns.
+    """
+    from cooccurrence import get_cooccurrence
+    get_db_pool()
+    return get_cooccurrence()
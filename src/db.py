@@ -1,8 +1,16 @@
 import psycopg2
+import psycopg2.extensions
+from psycopg2.extras import execute_values
+from psycopg2.pool import PoolError
 import pandas as pd
 from dotenv import load_dotenv
+from collections import OrderedDict
+from contextlib import contextmanager
 import os
 import re
+import threading
+import time
+import logging
 
 load_dotenv()
 
@@ -11,7 +19,20 @@ DB_USER = os.getenv('DB_USER')
 DB_HOST = os.getenv('DB_HOST')
 DB_PORT = os.getenv('DB_PORT')
 
+# Pool sizing - a daily load only needs a handful of connections
+DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', 1))
+DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', 5))
+# Seconds a checkout waits for a free connection before giving up
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+# Idle connections older than this (seconds) are pinged before being handed out
+DB_POOL_HEALTHCHECK_AFTER = float(os.getenv('DB_POOL_HEALTHCHECK_AFTER', 60))
+# Rows per INSERT statement for the bulk loader
+BULK_PAGE_SIZE = int(os.getenv('BULK_PAGE_SIZE', 500))
+# Max companies kept in the in-process dimension cache (skills/locations are cached in full)
+COMPANY_CACHE_SIZE = int(os.getenv('COMPANY_CACHE_SIZE', 20000))
+
 def get_connection():
+    """Opens a brand-new connection (the pool uses this to create its connections)"""
     return psycopg2.connect(
         database=DB_NAME,
         user=DB_USER,
@@ -19,131 +40,858 @@ def get_connection():
         port=DB_PORT
     )
 
-"""CONVERTED COMPANY NAME TO ID"""
-def insert_company(company_name):
-    conn = get_connection()
+class PoolTimeout(PoolError):
+    """Raised when no pooled connection frees up within the checkout timeout"""
 
-    c = conn.cursor()
+class ConnectionPool:
+    """Thread-safe pool of long-lived psycopg2 connections.
 
-    c.execute("SELECT company_id FROM companies WHERE company_name = %s", (company_name,))
+    Keeps between `minconn` and `maxconn` connections open. Checkouts block
+    (up to `timeout` seconds) when every connection is in use, and idle
+    connections are pinged before reuse so a dropped connection is replaced
+    instead of handed out.
+    """
 
-    result = c.fetchone()
+    def __init__(self, minconn=DB_POOL_MIN, maxconn=DB_POOL_MAX, timeout=DB_POOL_TIMEOUT,
+                 healthcheck_after=DB_POOL_HEALTHCHECK_AFTER, connect=get_connection):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError(f"Invalid pool size: min={minconn}, max={maxconn}")
 
-    if result:
-        company_id = result[0]
-        c.close()
-        conn.close()
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.healthcheck_after = healthcheck_after
+        self._connect = connect
+
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._idle = []        # list of (connection, last_used_time)
+        self._size = 0         # connections currently open (idle + checked out)
+        self._closed = False
+
+        for _ in range(minconn):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    def _is_healthy(self, conn, last_used):
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.healthcheck_after:
+            return True
+        try:
+            c = conn.cursor()
+            c.execute("SELECT 1")
+            c.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+        with self._lock:
+            self._size -= 1
+            self._available.notify()
+
+    def getconn(self):
+        """Checks out a connection, opening a new one if the pool is below maxconn"""
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            with self._lock:
+                while not self._idle and self._size >= self.maxconn:
+                    if self._closed:
+                        raise PoolError("connection pool is closed")
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeout(f"No database connection available after {self.timeout}s")
+                    self._available.wait(remaining)
+
+                if self._closed:
+                    raise PoolError("connection pool is closed")
+
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                else:
+                    conn, last_used = None, None
+                    self._size += 1
+
+            if conn is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._lock:
+                        self._size -= 1
+                        self._available.notify()
+                    raise
+
+            # Health check happens outside the lock so a slow ping doesn't block other threads
+            if self._is_healthy(conn, last_used):
+                return conn
+
+            logging.warning("Discarding unhealthy pooled database connection")
+            self._discard(conn)
+
+    def putconn(self, conn, discard=False):
+        """Returns a connection to the pool (or closes it if it's broken)"""
+        if not discard and not conn.closed:
+            try:
+                # Never hand out a connection that's still inside a transaction
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        if discard or conn.closed:
+            self._discard(conn)
+            return
+
+        with self._lock:
+            if self._closed:
+                self._size -= 1
+                conn.close()
+                return
+            self._idle.append((conn, time.monotonic()))
+            self._available.notify()
+
+    @contextmanager
+    def connection(self):
+        """Checks out a connection for one transaction: commits on success, rolls back on error"""
+        conn = self.getconn()
+        discard = False
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                discard = True
+            raise
+        finally:
+            self.putconn(conn, discard=discard)
+
+    def closeall(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._available.notify_all()
+        for conn, _ in idle:
+            conn.close()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Returns the process-wide connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+@contextmanager
+def connection():
+    """Shortcut for get_pool().connection()"""
+    with get_pool().connection() as conn:
+        yield conn
+
+class DimensionCache:
+    """In-process name -> id maps for the companies, locations and skills tables.
+
+    Skills (~60 rows) and locations (a few hundred cities) are cached in full;
+    companies are high-cardinality so they live in a bounded LRU. The cache warms
+    itself from the tables on first use and is only ever filled with ids from
+    committed rows, so a rolled-back load can't leave dangling ids behind.
+    """
+
+    def __init__(self, company_maxsize=COMPANY_CACHE_SIZE):
+        self.company_maxsize = company_maxsize
+        self._lock = threading.Lock()
+        self._companies = OrderedDict()
+        self._locations = {}
+        self._skills = {}
+        self._warm = False
+        self.hits = 0
+        self.misses = 0
+
+    def warm(self, c=None):
+        """(Re)loads every skill and location, plus the most recent companies.
+
+        Reads through `c` when given - the cursor of a transaction that hasn't
+        written anything yet - and otherwise checks out its own connection.
+        """
+        if c is None:
+            with connection() as conn:
+                c = conn.cursor()
+                self.warm(c)
+                c.close()
+            return
+
+        c.execute("SELECT skill_name, skill_id FROM skills")
+        skills = dict(c.fetchall())
+        c.execute("SELECT city, province, location_id FROM locations")
+        locations = {(city, province): location_id for city, province, location_id in c.fetchall()}
+        c.execute(
+            "SELECT company_name, company_id FROM companies ORDER BY company_id DESC LIMIT %s",
+            (self.company_maxsize,)
+        )
+        # Oldest first so the newest companies end up at the hot end of the LRU
+        companies = OrderedDict(reversed(c.fetchall()))
+
+        with self._lock:
+            self._skills = skills
+            self._locations = locations
+            self._companies = companies
+            self._warm = True
+
+        logging.info(f"Dimension cache warmed - Skills: {len(skills)}, Locations: {len(locations)}, Companies: {len(companies)}")
+
+    def clear(self):
+        with self._lock:
+            self._companies.clear()
+            self._locations.clear()
+            self._skills.clear()
+            self._warm = False
+
+    def _ensure_warm(self, c=None):
+        if not self._warm:
+            self.warm(c)
+
+    def _lookup(self, table, key, lru=False):
+        with self._lock:
+            value = table.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                if lru:
+                    table.move_to_end(key)
+            return value
+
+    def get_company(self, company_name, c=None):
+        self._ensure_warm(c)
+        return self._lookup(self._companies, company_name, lru=True)
+
+    def get_location(self, city, province, c=None):
+        self._ensure_warm(c)
+        return self._lookup(self._locations, (city, province))
+
+    def get_skill(self, skill_name, c=None):
+        self._ensure_warm(c)
+        return self._lookup(self._skills, skill_name)
+
+    def add_companies(self, ids):
+        with self._lock:
+            for company_name, company_id in ids.items():
+                self._companies[company_name] = company_id
+                self._companies.move_to_end(company_name)
+            while len(self._companies) > self.company_maxsize:
+                self._companies.popitem(last=False)
+
+    def add_locations(self, ids):
+        with self._lock:
+            self._locations.update(ids)
+
+    def add_skills(self, ids):
+        with self._lock:
+            self._skills.update(ids)
+
+dimension_cache = DimensionCache()
+
+"""CONVERTED COMPANY NAME TO ID"""
+def insert_company(company_name):
+    company_id = dimension_cache.get_company(company_name)
+    if company_id is not None:
         return company_id
-    else:
+
+    with connection() as conn:
+        c = conn.cursor()
+
+        # Atomic get-or-create: the no-op DO UPDATE makes RETURNING work for existing rows too
         c.execute(
-            "INSERT INTO companies (company_name) VALUES (%s) RETURNING company_id",
+            """INSERT INTO companies (company_name) VALUES (%s)
+               ON CONFLICT (company_name) DO UPDATE SET company_name = EXCLUDED.company_name
+               RETURNING company_id""",
             (company_name,)
         )
         company_id = c.fetchone()[0]
-        conn.commit()
         c.close()
-        conn.close()
-        return company_id
+
+    dimension_cache.add_companies({company_name: company_id})
+    return company_id
 
 """CONVERTED LOCATION (CITY, PROVINCE) TO ID"""
 def insert_location(city, province):
-    conn = get_connection()
-    c = conn.cursor()
-
-    # Check if location already exists (matching BOTH city AND province)
-    c.execute("SELECT location_id FROM locations WHERE city = %s AND province = %s", (city, province))
+    location_id = dimension_cache.get_location(city, province)
+    if location_id is not None:
+        return location_id
 
-    result = c.fetchone()
+    with connection() as conn:
+        c = conn.cursor()
 
-    if result:
-        location_id = result[0]
-        c.close()
-        conn.close()
-        return location_id
-    else:
+        # Matches on BOTH city AND province (the locations unique constraint)
         c.execute(
-            "INSERT INTO locations (city, province) VALUES (%s, %s) RETURNING location_id",
+            """INSERT INTO locations (city, province) VALUES (%s, %s)
+               ON CONFLICT (city, province) DO UPDATE SET city = EXCLUDED.city
+               RETURNING location_id""",
             (city, province)
         )
         location_id = c.fetchone()[0]
-        conn.commit()
         c.close()
-        conn.close()
-        return location_id
+
+    dimension_cache.add_locations({(city, province): location_id})
+    return location_id
 
 """CONVERTED SKILLS TO ID"""
 def insert_skill(skill_name):
-    conn = get_connection()
-    c = conn.cursor()
-
-    c.execute("SELECT skill_id FROM skills WHERE skill_name = %s", (skill_name,))
+    skill_id = dimension_cache.get_skill(skill_name)
+    if skill_id is not None:
+        return skill_id
 
-    result = c.fetchone()
+    with connection() as conn:
+        c = conn.cursor()
 
-    if result:
-        skill_id = result[0]
-        c.close()
-        conn.close()
-        return skill_id
-    else:
         c.execute(
-            "INSERT INTO skills (skill_name) VALUES (%s) RETURNING skill_id",
+            """INSERT INTO skills (skill_name) VALUES (%s)
+               ON CONFLICT (skill_name) DO UPDATE SET skill_name = EXCLUDED.skill_name
+               RETURNING skill_id""",
             (skill_name,)
         )
         skill_id = c.fetchone()[0]
-        conn.commit()
         c.close()
-        conn.close()
-        return skill_id
+
+    dimension_cache.add_skills({skill_name: skill_id})
+    return skill_id
 
 """gets company/location ids, inserts jobs, returns job_id"""
 def insert_job(job_title, company_name, city, province, salary_min, salary_max, posted_date=None, is_remote=None, experience_level=None, job_description=None, job_url=None):
+    from dedup import job_fingerprint  # dedup imports db, so import here to avoid a cycle
+
+    content_hash = job_fingerprint(job_title, company_name, city, job_description)
+
     company_id = insert_company(company_name)
 
     location_id = insert_location(city, province)
 
-    conn = get_connection()
-
-    c = conn.cursor()
+    with connection() as conn:
+        c = conn.cursor()
 
-    c.execute(
-    "INSERT INTO job_postings (job_title, company_id, location_id, salary_min, salary_max, posted_date, is_remote, experience_level, job_description, job_url) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING job_id",
-    (job_title, company_id, location_id, salary_min, salary_max, posted_date, is_remote, experience_level, job_description, job_url)
-)
-    job_id = c.fetchone()[0]
-    conn.commit()
-    c.close()
-    conn.close()
-    return job_id
+        c.execute(
+        "INSERT INTO job_postings (job_title, company_id, location_id, salary_min, salary_max, posted_date, is_remote, experience_level, job_description, job_url, content_hash) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING job_id",
+        (job_title, company_id, location_id, salary_min, salary_max, posted_date, is_remote, experience_level, job_description, job_url, content_hash)
+    )
+        job_id = c.fetchone()[0]
+        c.close()
+        return job_id
 
 """links jobs to multiple skills in junction table"""
 def insert_job_skills(job_id, skill_id):
-    conn = get_connection()
-    c = conn.cursor()
-    
-    c.execute(
-        "INSERT INTO job_skills (job_id, skill_id) VALUES (%s, %s)",
-        (job_id, skill_id)
-    )
-    
-    conn.commit()
-    c.close()
-    conn.close()
+    with connection() as conn:
+        c = conn.cursor()
+
+        c.execute(
+            "INSERT INTO job_skills (job_id, skill_id) VALUES (%s, %s)",
+            (job_id, skill_id)
+        )
+
+        c.close()
 
 #Check for duplicates (if job_url exists then skip)
 
 def check_if_job_exists(job_url):
-    conn = get_connection()
-    c = conn.cursor()
+    with connection() as conn:
+        c = conn.cursor()
 
-    c.execute("SELECT job_id FROM job_postings WHERE job_url = %s", (job_url,))
-    result = c.fetchone()
+        c.execute("SELECT job_id FROM job_postings WHERE job_url = %s", (job_url,))
+        result = c.fetchone()
 
-    c.close()
-    conn.close()
+        c.close()
 
     if result:
         return True
     else:
         return False
-       
\ No newline at end of file
+
+"""RETURNS THE job_urls AND content_hashes ALREADY IN job_postings (one query for the whole batch)"""
+def find_existing_jobs(job_urls, content_hashes):
+    job_urls = list(set(url for url in job_urls if url))
+    content_hashes = list(set(content_hashes))
+    if not job_urls and not content_hashes:
+        return set(), set()
+
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            "SELECT job_url, content_hash FROM job_postings WHERE job_url = ANY(%s) OR content_hash = ANY(%s)",
+            (job_urls, content_hashes)
+        )
+        rows = c.fetchall()
+        c.close()
+
+    existing_urls = {job_url for job_url, _ in rows if job_url}
+    existing_hashes = {content_hash for _, content_hash in rows}
+    return existing_urls, existing_hashes
+
+"""RESOLVES A WHOLE BATCH OF COMPANY NAMES TO IDS (cache first, then one multi-row upsert)"""
+def resolve_company_ids(c, company_names):
+    ids = {}
+    missing = []
+    for name in sorted(set(company_names)):
+        company_id = dimension_cache.get_company(name, c)
+        if company_id is None:
+            missing.append((name,))
+        else:
+            ids[name] = company_id
+
+    if missing:
+        # Keys are de-duplicated and sorted: ON CONFLICT DO UPDATE can't touch a row twice
+        # in one statement, and a stable lock order keeps parallel loaders from deadlocking
+        rows = execute_values(
+            c,
+            """INSERT INTO companies (company_name) VALUES %s
+               ON CONFLICT (company_name) DO UPDATE SET company_name = EXCLUDED.company_name
+               RETURNING company_name, company_id""",
+            missing, page_size=BULK_PAGE_SIZE, fetch=True
+        )
+        ids.update(rows)
+    return ids
+
+"""RESOLVES A WHOLE BATCH OF (CITY, PROVINCE) PAIRS TO IDS"""
+def resolve_location_ids(c, locations):
+    ids = {}
+    missing = []
+    for city, province in sorted(set(locations)):
+        location_id = dimension_cache.get_location(city, province, c)
+        if location_id is None:
+            missing.append((city, province))
+        else:
+            ids[(city, province)] = location_id
+
+    if missing:
+        rows = execute_values(
+            c,
+            """INSERT INTO locations (city, province) VALUES %s
+               ON CONFLICT (city, province) DO UPDATE SET city = EXCLUDED.city
+               RETURNING city, province, location_id""",
+            missing, page_size=BULK_PAGE_SIZE, fetch=True
+        )
+        ids.update({(city, province): location_id for city, province, location_id in rows})
+    return ids
+
+"""RESOLVES A WHOLE BATCH OF SKILL NAMES TO IDS"""
+def resolve_skill_ids(c, skill_names):
+    ids = {}
+    missing = []
+    for name in sorted(set(skill_names)):
+        skill_id = dimension_cache.get_skill(name, c)
+        if skill_id is None:
+            missing.append((name,))
+        else:
+            ids[name] = skill_id
+
+    if missing:
+        rows = execute_values(
+            c,
+            """INSERT INTO skills (skill_name) VALUES %s
+               ON CONFLICT (skill_name) DO UPDATE SET skill_name = EXCLUDED.skill_name
+               RETURNING skill_name, skill_id""",
+            missing, page_size=BULK_PAGE_SIZE, fetch=True
+        )
+        ids.update(rows)
+    return ids
+
+def bulk_load_jobs(jobs):
+    """Loads a whole batch of postings (and their skills) in one transaction.
+
+    `jobs` is a list of dicts with the insert_job() fields plus a `skills` list of
+    canonical skill names. Dimensions come from the dimension cache, with multi-row
+    upserts only for cache misses, and postings/job_skills rows are written with
+    multi-row INSERTs, so either the whole batch lands or none of it does.
+
+    A posting whose job_url or content_hash is already stored (e.g. committed by
+    another batch after this one was deduplicated) is skipped rather than failing
+    the batch. The new postings are added to the summary tables (src/summaries.py)
+    before commit. Returns the new job_ids in input order.
+    """
+    if not jobs:
+        return []
+
+    with connection() as conn:
+        c = conn.cursor()
+
+        # summaries imports db, so import here to avoid a cycle
+        from summaries import SUMMARY_LOCK_KEY, apply_summary_delta
+        # Concurrent batches can share postings and new companies/locations/skills
+        # (dedupe only sees committed rows) and would wait on each other's uncommitted
+        # rows in opposite orders - a deadlock. The summary update below serializes
+        # loads on this lock anyway, so take it before writing anything.
+        c.execute("SELECT pg_advisory_xact_lock(%s)", (SUMMARY_LOCK_KEY,))
+
+        company_ids = resolve_company_ids(c, [job['company_name'] for job in jobs])
+        location_ids = resolve_location_ids(c, [(job['city'], job['province']) for job in jobs])
+        skill_ids = resolve_skill_ids(c, [skill for job in jobs for skill in job.get('skills', ())])
+
+        # Conflicting rows aren't RETURNed, so job_ids are matched back through content_hash
+        job_rows = execute_values(
+            c,
+            "INSERT INTO job_postings (job_title, company_id, location_id, salary_min, salary_max, posted_date, is_remote, experience_level, job_description, job_url, content_hash, skills_version) VALUES %s ON CONFLICT DO NOTHING RETURNING content_hash, job_id",
+            [
+                (
+                    job['job_title'],
+                    company_ids[job['company_name']],
+                    location_ids[(job['city'], job['province'])],
+                    job['salary_min'],
+                    job['salary_max'],
+                    job.get('posted_date'),
+                    job.get('is_remote'),
+                    job.get('experience_level'),
+                    job.get('job_description'),
+                    job.get('job_url'),
+                    job['content_hash'],
+                    job.get('skills_version'),
+                )
+                for job in jobs
+            ],
+            page_size=BULK_PAGE_SIZE, fetch=True
+        )
+        job_ids_by_hash = dict(job_rows)
+        inserted = [(job_ids_by_hash[job['content_hash']], job) for job in jobs if job['content_hash'] in job_ids_by_hash]
+        job_ids = [job_id for job_id, _ in inserted]
+
+        job_skill_rows = [
+            (job_id, skill_ids[skill])
+            for job_id, job in inserted
+            for skill in set(job.get('skills', ()))
+        ]
+        if job_skill_rows:
+            execute_values(
+                c,
+                "INSERT INTO job_skills (job_id, skill_id) VALUES %s",
+                job_skill_rows, page_size=BULK_PAGE_SIZE
+            )
+
+        # Fold just this batch into the analytics summary tables, in the same transaction
+        apply_summary_delta(c, job_ids)
+
+        c.close()
+
+    # Only cache ids once the transaction that created them has committed
+    dimension_cache.add_companies(company_ids)
+    dimension_cache.add_locations(location_ids)
+    dimension_cache.add_skills(skill_ids)
+
+    return job_ids
+
+def upsert_jobs(jobs):
+    """Loads a batch like bulk_load_jobs(), but overwrites postings that are already stored.
+
+    For reprocessing cached responses after a transform or skill-extraction fix:
+    a posting whose content_hash is stored gets the freshly transformed columns
+    and skills (stored experience_level/is_remote/posted_date/job_url are kept
+    where the new value is NULL), and is taken out of the summary tables before
+    the update and added back after it, like update_job_attributes(). A posting
+    whose job_url is stored under a different content_hash is skipped. Returns the
+    job_ids written (inserted or updated) in input order.
+    """
+    if not jobs:
+        return []
+
+    # ON CONFLICT DO UPDATE can't touch a row twice in one statement: one posting per hash and per url
+    by_hash, seen_urls = {}, set()
+    for job in jobs:
+        if job['content_hash'] in by_hash or (job.get('job_url') and job['job_url'] in seen_urls):
+            continue
+        by_hash[job['content_hash']] = job
+        if job.get('job_url'):
+            seen_urls.add(job['job_url'])
+
+    from summaries import SUMMARY_LOCK_KEY, apply_summary_delta
+
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute("SELECT pg_advisory_xact_lock(%s)", (SUMMARY_LOCK_KEY,))
+
+        c.execute(
+            "SELECT job_url, content_hash, job_id FROM job_postings WHERE content_hash = ANY(%s) OR job_url = ANY(%s)",
+            (list(by_hash), list(seen_urls))
+        )
+        rows = c.fetchall()
+        existing = {content_hash: job_id for _, content_hash, job_id in rows if content_hash in by_hash}
+        url_hashes = {job_url: content_hash for job_url, content_hash, _ in rows if job_url}
+        jobs = [job for job in by_hash.values() if url_hashes.get(job.get('job_url'), job['content_hash']) == job['content_hash']]
+        if len(jobs) < len(by_hash):
+            logging.warning(f"Reprocess - {len(by_hash) - len(jobs)} postings skipped: job_url stored with different content")
+
+        company_ids = resolve_company_ids(c, [job['company_name'] for job in jobs])
+        location_ids = resolve_location_ids(c, [(job['city'], job['province']) for job in jobs])
+        skill_ids = resolve_skill_ids(c, [skill for job in jobs for skill in job.get('skills', ())])
+
+        # The stored versions come out of the summaries before they change
+        stored_ids = list(existing.values())
+        apply_summary_delta(c, stored_ids, sign=-1)
+        c.execute("DELETE FROM job_skills WHERE job_id = ANY(%s)", (stored_ids,))
+
+        job_rows = execute_values(
+            c,
+            """INSERT INTO job_postings (job_title, company_id, location_id, salary_min, salary_max, posted_date, is_remote, experience_level, job_description, job_url, content_hash, skills_version) VALUES %s
+               ON CONFLICT (content_hash) DO UPDATE SET
+                   job_title = EXCLUDED.job_title,
+                   company_id = EXCLUDED.company_id,
+                   location_id = EXCLUDED.location_id,
+                   salary_min = EXCLUDED.salary_min,
+                   salary_max = EXCLUDED.salary_max,
+                   posted_date = COALESCE(EXCLUDED.posted_date, job_postings.posted_date),
+                   is_remote = COALESCE(EXCLUDED.is_remote, job_postings.is_remote),
+                   experience_level = COALESCE(EXCLUDED.experience_level, job_postings.experience_level),
+                   job_description = EXCLUDED.job_description,
+                   job_url = COALESCE(EXCLUDED.job_url, job_postings.job_url),
+                   skills_version = EXCLUDED.skills_version
+               RETURNING content_hash, job_id""",
+            [
+                (
+                    job['job_title'],
+                    company_ids[job['company_name']],
+                    location_ids[(job['city'], job['province'])],
+                    job['salary_min'],
+                    job['salary_max'],
+                    job.get('posted_date'),
+                    job.get('is_remote'),
+                    job.get('experience_level'),
+                    job.get('job_description'),
+                    job.get('job_url'),
+                    job['content_hash'],
+                    job.get('skills_version'),
+                )
+                for job in jobs
+            ],
+            page_size=BULK_PAGE_SIZE, fetch=True
+        )
+        job_ids_by_hash = dict(job_rows)
+        job_ids = [job_ids_by_hash[job['content_hash']] for job in jobs]
+
+        job_skill_rows = [
+            (job_ids_by_hash[job['content_hash']], skill_ids[skill])
+            for job in jobs
+            for skill in set(job.get('skills', ()))
+        ]
+        if job_skill_rows:
+            execute_values(
+                c,
+                "INSERT INTO job_skills (job_id, skill_id) VALUES %s",
+                job_skill_rows, page_size=BULK_PAGE_SIZE
+            )
+
+        apply_summary_delta(c, job_ids)
+        c.close()
+
+    dimension_cache.add_companies(company_ids)
+    dimension_cache.add_locations(location_ids)
+    dimension_cache.add_skills(skill_ids)
+
+    return job_ids
+
+"""UPSERTS EVERY TAXONOMY SKILL WITH ITS CATEGORY"""
+def sync_skills(categories):
+    """`categories` maps canonical skill name -> category (SkillExtractor.categories)"""
+    with connection() as conn:
+        c = conn.cursor()
+        rows = execute_values(
+            c,
+            """INSERT INTO skills (skill_name, category) VALUES %s
+               ON CONFLICT (skill_name) DO UPDATE SET category = EXCLUDED.category
+               RETURNING skill_name, skill_id""",
+            sorted(categories.items()), page_size=BULK_PAGE_SIZE, fetch=True
+        )
+        c.close()
+
+    dimension_cache.add_skills(dict(rows))
+
+"""NEXT BATCH OF POSTINGS WITH THE COLUMNS THEIR CONTENT FINGERPRINT IS BUILT FROM"""
+def fetch_job_contents(after_job_id, limit):
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            """SELECT jp.job_id, jp.job_title, c.company_name, l.city, jp.job_description, jp.content_hash
+               FROM job_postings jp
+               JOIN companies c ON jp.company_id = c.company_id
+               JOIN locations l ON jp.location_id = l.location_id
+               WHERE jp.job_id > %s
+               ORDER BY jp.job_id
+               LIMIT %s""",
+            (after_job_id, limit)
+        )
+        rows = c.fetchall()
+        c.close()
+    return rows
+
+def update_content_hashes(content_hashes):
+    """Stores recomputed fingerprints (`content_hashes` maps job_id -> content_hash).
+
+    Postings that turn out to share a fingerprint are the same posting: the one
+    with the lowest job_id keeps it and the others are deleted (and taken out of
+    the summary tables). Returns the number of postings deleted.
+    """
+    if not content_hashes:
+        return 0
+
+    from summaries import SUMMARY_LOCK_KEY, apply_summary_delta
+
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute("SELECT pg_advisory_xact_lock(%s)", (SUMMARY_LOCK_KEY,))
+        c.execute(
+            "SELECT content_hash, job_id FROM job_postings WHERE content_hash = ANY(%s)",
+            (list(set(content_hashes.values())),)
+        )
+
+        claims = {}
+        for job_id, content_hash in content_hashes.items():
+            claims.setdefault(content_hash, []).append(job_id)
+        for content_hash, job_id in c.fetchall():
+            # A holder that is being rehashed to something else gives its hash up
+            if content_hashes.get(job_id, content_hash) == content_hash and job_id not in claims[content_hash]:
+                claims[content_hash].append(job_id)
+        duplicate_ids = sorted(job_id for job_ids in claims.values() for job_id in sorted(job_ids)[1:])
+
+        if duplicate_ids:
+            apply_summary_delta(c, duplicate_ids, sign=-1)
+            c.execute("DELETE FROM job_skills WHERE job_id = ANY(%s)", (duplicate_ids,))
+            c.execute("DELETE FROM job_postings WHERE job_id = ANY(%s)", (duplicate_ids,))
+
+        duplicates = set(duplicate_ids)
+        execute_values(
+            c,
+            """UPDATE job_postings AS jp
+               SET content_hash = v.content_hash
+               FROM (VALUES %s) AS v(job_id, content_hash)
+               WHERE jp.job_id = v.job_id""",
+            [(job_id, content_hash) for job_id, content_hash in sorted(content_hashes.items()) if job_id not in duplicates],
+            page_size=BULK_PAGE_SIZE
+        )
+        c.close()
+
+    return len(duplicate_ids)
+
+"""NEXT BATCH OF POSTINGS WHOSE SKILLS WERE EXTRACTED WITH A DIFFERENT TAXONOMY VERSION"""
+def fetch_stale_skill_jobs(skills_version, after_job_id, limit):
+    # Postings loaded before descriptions were stored can't be re-extracted, so they keep their skills
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            """SELECT job_id, job_description
+               FROM job_postings
+               WHERE job_id > %s
+                 AND job_description IS NOT NULL
+                 AND skills_version IS DISTINCT FROM %s
+               ORDER BY job_id
+               LIMIT %s""",
+            (after_job_id, skills_version, limit)
+        )
+        rows = c.fetchall()
+        c.close()
+    return rows
+
+"""NEXT BATCH OF POSTINGS MISSING experience_level, is_remote OR posted_date"""
+def fetch_unclassified_jobs(after_job_id, limit, dated_urls=()):
+    # Only postings something can be filled in for: a missing posted_date counts
+    # just when its job_url is in `dated_urls`, so postings older than the response
+    # cache aren't picked up again on every backfill
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            """SELECT job_id, job_title, job_description, job_url, posted_date
+               FROM job_postings
+               WHERE job_id > %s
+                 AND ((experience_level IS NULL AND job_title <> '')
+                      OR is_remote IS NULL
+                      OR (posted_date IS NULL AND job_url = ANY(%s)))
+               ORDER BY job_id
+               LIMIT %s""",
+            (after_job_id, list(dated_urls), limit)
+        )
+        rows = c.fetchall()
+        c.close()
+    return rows
+
+"""WRITES DERIVED ATTRIBUTES FOR A BATCH OF POSTINGS IN ONE STATEMENT"""
+def update_job_attributes(rows):
+    """`rows` are (job_id, experience_level, is_remote, posted_date); only NULL columns are filled, stored values win"""
+    if not rows:
+        return
+
+    from summaries import apply_summary_delta
+    job_ids = [row[0] for row in rows]
+
+    with connection() as conn:
+        c = conn.cursor()
+        # posted_date feeds the weekly trend summary: take the rows out, update, put them back
+        apply_summary_delta(c, job_ids, sign=-1)
+        execute_values(
+            c,
+            """UPDATE job_postings AS jp
+               SET experience_level = COALESCE(jp.experience_level, v.experience_level),
+                   is_remote = COALESCE(jp.is_remote, v.is_remote),
+                   posted_date = COALESCE(jp.posted_date, v.posted_date)
+               FROM (VALUES %s) AS v(job_id, experience_level, is_remote, posted_date)
+               WHERE jp.job_id = v.job_id""",
+            rows, template="(%s, %s::varchar, %s::boolean, %s::date)", page_size=BULK_PAGE_SIZE
+        )
+        apply_summary_delta(c, job_ids)
+        c.close()
+
+def replace_job_skills(job_skills, skills_version):
+    """Swaps the job_skills rows of a batch of postings in one transaction.
+
+    `job_skills` maps job_id -> set of canonical skill names. Every listed posting
+    is stamped with `skills_version` so the backfill can resume where it stopped.
+    """
+    if not job_skills:
+        return
+
+    from summaries import SUMMARY_LOCK_KEY, apply_summary_delta
+    job_ids = list(job_skills)
+
+    with connection() as conn:
+        c = conn.cursor()
+        # Before the skill upsert, so a concurrent load adding the same new skill can't deadlock with it
+        c.execute("SELECT pg_advisory_xact_lock(%s)", (SUMMARY_LOCK_KEY,))
+        skill_ids = resolve_skill_ids(c, [skill for skills in job_skills.values() for skill in skills])
+
+        # Skill and pair counts: take the old skills out, put the new ones back in
+        apply_summary_delta(c, job_ids, sign=-1)
+        c.execute("DELETE FROM job_skills WHERE job_id = ANY(%s)", (job_ids,))
+
+        job_skill_rows = [
+            (job_id, skill_ids[skill])
+            for job_id, skills in job_skills.items()
+            for skill in skills
+        ]
+        if job_skill_rows:
+            execute_values(
+                c,
+                "INSERT INTO job_skills (job_id, skill_id) VALUES %s",
+                job_skill_rows, page_size=BULK_PAGE_SIZE
+            )
+
+        apply_summary_delta(c, job_ids)
+
+        c.execute(
+            "UPDATE job_postings SET skills_version = %s WHERE job_id = ANY(%s)",
+            (skills_version, job_ids)
+        )
+        c.close()
+
+    dimension_cache.add_skills(skill_ids)
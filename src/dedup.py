@@ -0,0 +1,54 @@
+import hashlib
+from db import find_existing_jobs
+
+def normalize_text(value):
+    """Lowercases and collapses whitespace so cosmetic differences don't change the fingerprint"""
+    return ' '.join((value or '').lower().split())
+
+def job_fingerprint(job_title, company_name, city, job_description):
+    """sha256 of the normalized posting content (stored hashes: `python src/backfill.py content-hashes`)"""
+    content = chr(31).join(normalize_text(value) for value in (job_title, company_name, city, job_description))
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def fingerprint_job(job):
+    """job_fingerprint() for a raw JSearch record, with the same defaults transform_job() stores"""
+    return job_fingerprint(
+        job.get('job_title') or 'Unknown',
+        job.get('employer_name') or 'Unknown',
+        job.get('job_city') or 'Unknown',
+        job.get('job_description'),
+    )
+
+def dedupe_jobs(jobs):
+    """Drops postings we've already stored or already seen earlier in this batch.
+
+    A posting is a duplicate if its apply link or its content fingerprint has been
+    seen, so postings without an apply link are caught too. Overlapping queries
+    ("data analyst Montreal" vs "junior data analyst British Columbia") return the
+    same posting, so the batch is de-duplicated first, then every remaining link and
+    fingerprint is checked against job_postings in a single query.
+    Returns (new_jobs, duplicate_count); each new job carries its fingerprint under
+    '_content_hash' so the loader doesn't hash the description twice.
+    """
+    unique_jobs = []
+    seen_urls = set()
+    seen_hashes = set()
+
+    for job in jobs:
+        job_url = job.get('job_apply_link')
+        content_hash = fingerprint_job(job)
+
+        if (job_url and job_url in seen_urls) or content_hash in seen_hashes:
+            continue
+        if job_url:
+            seen_urls.add(job_url)
+        seen_hashes.add(content_hash)
+        unique_jobs.append(dict(job, _content_hash=content_hash))
+
+    existing_urls, existing_hashes = find_existing_jobs(seen_urls, seen_hashes)
+    new_jobs = [
+        job for job in unique_jobs
+        if job.get('job_apply_link') not in existing_urls and job['_content_hash'] not in existing_hashes
+    ]
+
+    return new_jobs, len(jobs) - len(new_jobs)
@@ -0,0 +1,132 @@
+import logging
+import os
+import socket
+from contextlib import contextmanager
+from db import connection, get_connection
+
+# Arbitrary key for pg_try_advisory_lock: at most one scheduler run (any job, any
+# host) at a time. Session-level, so it's released if the runner's process dies.
+ETL_LOCK_KEY = 4242003
+
+class EtlLockBusy(RuntimeError):
+    """Raised when another process is already running an ETL job"""
+
+@contextmanager
+def etl_lock():
+    """Holds the ETL advisory lock for the duration of the block, or raises EtlLockBusy.
+
+    The lock lives on its own connection, outside the pool, so a run still has
+    every pooled connection available for its loads and queries.
+    """
+    conn = get_connection()
+    conn.autocommit = True
+    try:
+        c = conn.cursor()
+        c.execute("SELECT pg_try_advisory_lock(%s)", (ETL_LOCK_KEY,))
+        if not c.fetchone()[0]:
+            raise EtlLockBusy("Another ETL run holds the scheduler lock")
+        try:
+            yield
+        finally:
+            c.execute("SELECT pg_advisory_unlock(%s)", (ETL_LOCK_KEY,))
+    finally:
+        conn.close()
+
+"""MARK RUNS LEFT BEHIND BY A DEAD PROCESS"""
+def recover_interrupted_runs():
+    # Only called with the lock held, so nothing is really still running
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute("""
+            UPDATE etl_runs
+            SET status = 'interrupted', finished_at = NOW()
+            WHERE status = 'running'
+            RETURNING run_id, job_name
+        """)
+        rows = c.fetchall()
+        c.close()
+
+    for run_id, job_name in rows:
+        logging.warning(f"ETL Runs - Run {run_id} ({job_name}) never finished, marked interrupted")
+    return len(rows)
+
+"""RECORD A RUN STARTING"""
+def start_run(job_name, scheduled_for, trigger):
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            """INSERT INTO etl_runs (job_name, scheduled_for, trigger, host, pid)
+               VALUES (%s, %s, %s, %s, %s)
+               RETURNING run_id""",
+            (job_name, scheduled_for, trigger, socket.gethostname(), os.getpid())
+        )
+        run_id = c.fetchone()[0]
+        c.close()
+    return run_id
+
+"""RECORD HOW A RUN ENDED"""
+def finish_run(run_id, status, jobs_loaded=None, error=None):
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            """UPDATE etl_runs
+               SET status = %s, finished_at = NOW(), jobs_loaded = %s, error = %s
+               WHERE run_id = %s""",
+            (status, jobs_loaded, error, run_id)
+        )
+        c.close()
+
+"""LATEST SLOT A JOB COMPLETED"""
+def last_success(job_name):
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            "SELECT MAX(scheduled_for) FROM etl_runs WHERE job_name = %s AND status = 'succeeded'",
+            (job_name,)
+        )
+        scheduled_for = c.fetchone()[0]
+        c.close()
+    return scheduled_for
+
+"""MOST RECENT ATTEMPT AT A JOB"""
+def last_attempt(job_name):
+    # (scheduled_for, status, finished_at), or None if the job never ran
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            """SELECT scheduled_for, status, finished_at FROM etl_runs
+               WHERE job_name = %s
+               ORDER BY started_at DESC
+               LIMIT 1""",
+            (job_name,)
+        )
+        row = c.fetchone()
+        c.close()
+    return row
+
+"""LATEST RUNS FOR THE STATUS COMMAND"""
+def recent_runs(limit=20):
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            """SELECT run_id, job_name, scheduled_for, trigger, status, started_at, finished_at, jobs_loaded, error
+               FROM etl_runs
+               ORDER BY started_at DESC
+               LIMIT %s""",
+            (limit,)
+        )
+        rows = c.fetchall()
+        c.close()
+    return rows
+
+"""WHETHER A JOB ALREADY COMPLETED A GIVEN SLOT"""
+def has_succeeded(job_name, scheduled_for):
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            "SELECT 1 FROM etl_runs WHERE job_name = %s AND scheduled_for = %s AND status = 'succeeded' LIMIT 1",
+            (job_name, scheduled_for)
+        )
+        found = c.fetchone() is not None
+        c.close()
+    return found
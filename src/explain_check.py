@@ -0,0 +1,130 @@
+import json
+import os
+import sys
+from datetime import date, timedelta
+from db import connection
+from queries import REGISTRY, query_sql
+
+# Tables smaller than this (planner row estimate) are skipped: on a dev or CI
+# database a sequential scan is the right plan and says nothing about production
+EXPLAIN_MIN_ROWS = int(os.getenv('EXPLAIN_MIN_ROWS', 10000))
+
+# (query, params, indexes its plan has to use). Params are sample dashboard
+# filters: 'city' picks a typical city from the data, 'days' a recent date window.
+# The unfiltered analytics queries read the small summary tables (migration 007)
+# in full, which is expected; only the ones below depend on an index.
+CHECKS = [
+    ('job_details', {}, ['job_postings_pkey']),
+    ('hiring_trends', {}, ['company_daily_postings_pkey']),
+    # ORDER BY job_id LIMIT: walking the primary key beats collecting every match
+    ('filtered_job_details', {'city': True}, ['job_postings_pkey']),
+    ('filtered_top_companies', {'city': True}, ['job_postings_location_id_idx']),
+    ('filtered_top_skills', {'city': True}, ['job_postings_location_id_idx', 'job_skills_pkey']),
+    ('filtered_top_companies', {'days': 7}, ['job_postings_posted_date_idx']),
+]
+# Tables a checked query must never scan sequentially
+NO_SEQ_SCAN = {'job_postings', 'job_skills'}
+
+def plan_nodes(plan):
+    """Every node of an EXPLAIN (FORMAT JSON) plan tree, depth first"""
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from plan_nodes(child)
+
+def explain(c, sql, params=None):
+    c.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+    result = c.fetchone()[0]
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]['Plan']
+
+def typical_city(c):
+    """(province, city) of the median city by posting count, or None without postings"""
+    c.execute(
+        """SELECT l.province, l.city
+           FROM job_postings jp
+           JOIN locations l ON jp.location_id = l.location_id
+           GROUP BY l.province, l.city
+           ORDER BY COUNT(*), l.province, l.city"""
+    )
+    rows = c.fetchall()
+    return rows[len(rows) // 2] if rows else None
+
+def sample_params(c, sample):
+    """Turns a CHECKS params entry into query params"""
+    params = {}
+    if sample.get('city'):
+        params['province'], params['city'] = typical_city(c) or (None, None)
+    if 'days' in sample:
+        params['date_from'] = date.today() - timedelta(days=sample['days'])
+    return params
+
+def estimated_rows(c, index):
+    """Planner row estimate (pg_class.reltuples) of the table `index` is on; None if it doesn't exist"""
+    c.execute(
+        """SELECT t.relname, t.reltuples
+           FROM pg_class i
+           JOIN pg_index x ON x.indexrelid = i.oid
+           JOIN pg_class t ON t.oid = x.indrelid
+           WHERE i.relname = %s""",
+        (index,)
+    )
+    return c.fetchone()
+
+def check_query(c, name, params, indexes):
+    """Returns (problems, skipped reason) for one query; both empty/None if it uses its indexes"""
+    for index in indexes:
+        table = estimated_rows(c, index)
+        if table is None:
+            return [f"index {index} does not exist"], None
+        # reltuples is -1 (or 0) until the table has been vacuumed/analyzed
+        if table[1] < EXPLAIN_MIN_ROWS:
+            return [], f"{table[0]} has ~{max(int(table[1]), 0)} rows (< {EXPLAIN_MIN_ROWS}); ANALYZE or load more data"
+
+    query = REGISTRY[name]
+    bound = query.bind(sample_params(c, params))
+    nodes = list(plan_nodes(explain(c, query_sql(name, bound), bound)))
+    used = {node['Index Name'] for node in nodes if 'Index Name' in node}
+    seq_scans = {node['Relation Name'] for node in nodes if node['Node Type'] == 'Seq Scan'}
+
+    problems = []
+    for index in indexes:
+        if index not in used:
+            problems.append(f"does not use {index} (uses: {', '.join(sorted(used)) or 'no indexes'})")
+    for table in sorted(seq_scans & NO_SEQ_SCAN):
+        problems.append(f"seq-scans {table}")
+    return problems, None
+
+def check_all():
+    """EXPLAINs the index-dependent analytics queries and reports any that stopped using their indexes.
+
+    Plans come from the default planner settings on the database's own data, so
+    they match what the dashboard actually runs. Checks whose tables hold fewer
+    than EXPLAIN_MIN_ROWS rows are skipped rather than passed or failed.
+    Returns True unless a check fails.
+    """
+    failures = skipped = 0
+
+    with connection() as conn:
+        c = conn.cursor()
+
+        for name, params, indexes in CHECKS:
+            label = f"{name} {params}" if params else name
+            problems, reason = check_query(c, name, params, indexes)
+            if reason:
+                skipped += 1
+                print(f"skip {label}: {reason}")
+            elif problems:
+                failures += 1
+                for problem in problems:
+                    print(f"FAIL {label}: {problem}")
+            else:
+                print(f"ok   {label}")
+
+        c.close()
+
+    print(f"{len(CHECKS) - failures - skipped}/{len(CHECKS)} checks use their indexes, {skipped} skipped")
+    return failures == 0
+
+if __name__ == "__main__":
+    sys.exit(0 if check_all() else 1)
@@ -0,0 +1,259 @@
+import json
+import queue
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+load_dotenv()
+
+JSEARCH_URL = "https://jsearch.p.rapidapi.com/search"
+JSEARCH_HOST = "jsearch.p.rapidapi.com"
+
+# Requests per second allowed by our RapidAPI plan, and how many can go out back-to-back
+JSEARCH_RATE_LIMIT = float(os.getenv('JSEARCH_RATE_LIMIT', 5))
+JSEARCH_BURST = int(os.getenv('JSEARCH_BURST', 5))
+JSEARCH_MAX_WORKERS = int(os.getenv('JSEARCH_MAX_WORKERS', 8))
+JSEARCH_TIMEOUT = float(os.getenv('JSEARCH_TIMEOUT', 30))
+JSEARCH_MAX_RETRIES = int(os.getenv('JSEARCH_MAX_RETRIES', 5))
+# Pages to follow per query; JSearch returns JSEARCH_PAGE_SIZE results per page
+JSEARCH_MAX_PAGES = int(os.getenv('JSEARCH_MAX_PAGES', 5))
+JSEARCH_PAGE_SIZE = 10
+# Fetched pages allowed to wait for the loader before fetch threads block
+JSEARCH_QUEUE_PAGES = int(os.getenv('JSEARCH_QUEUE_PAGES', 20))
+
+# Rate limited or a server-side hiccup: worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+QUERIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'config', 'queries.json')
+
+def load_queries(path=QUERIES_PATH):
+    """Search queries from config/queries.json.
+
+    Explicit "queries" are used as-is, and every role in "roles" is crossed with every
+    entry in "locations", so hundreds of city x role searches are a two-list edit.
+    """
+    with open(path) as f:
+        config = json.load(f)
+
+    queries = list(config.get('queries', []))
+    queries += [f"{role} {location}" for role in config.get('roles', []) for location in config.get('locations', [])]
+
+    # Keep the order but drop repeats
+    return list(dict.fromkeys(queries))
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens/second, holding at most `capacity`"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a token is available, then takes it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+def backoff_delay(attempt, retry_after=None):
+    """Exponential backoff with jitter, honouring a Retry-After header when the API sends one"""
+    if retry_after:
+        try:
+            return min(BACKOFF_MAX, float(retry_after))
+        except ValueError:
+            pass
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)
+    return random.uniform(delay / 2, delay)
+
+class JSearchClient:
+    """JSearch API client shared by every fetch in a run.
+
+    One keep-alive requests.Session (connection pool sized to the worker count),
+    a token bucket matched to the RapidAPI quota, per-request timeouts, and
+    jittered retries on 429/5xx and connection errors. With a ResponseCache every
+    raw response is stored; with read_cache=True a repeat of the same request on
+    the same day is also answered from disk without spending quota. Incremental
+    fetches must not read: their params repeat within a day (date_posted='today')
+    but the results behind them don't.
+    """
+
+    def __init__(self, api_key=None, rate_limit=JSEARCH_RATE_LIMIT, burst=JSEARCH_BURST,
+                 max_workers=JSEARCH_MAX_WORKERS, timeout=JSEARCH_TIMEOUT, max_retries=JSEARCH_MAX_RETRIES,
+                 cache=None, read_cache=True):
+        self.cache = cache
+        self.read_cache = read_cache
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(rate_limit, burst)
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            "X-RapidAPI-Key": api_key or os.getenv('JSEARCH_API_KEY'),
+            "X-RapidAPI-Host": JSEARCH_HOST,
+        })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+
+    def search(self, query, page=1, num_pages=1, **extra_params):
+        """One /search call; returns the list under 'data'"""
+        params = {
+            "query": query,
+            "page": page,
+            "num_pages": num_pages,
+            "country": "ca",
+            **extra_params,
+        }
+
+        if self.cache is not None and self.read_cache:
+            cached = self.cache.get(query, page, params)
+            if cached is not None:
+                return cached.get('data') or []
+
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                response = self.session.get(JSEARCH_URL, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = backoff_delay(attempt)
+                logging.warning(f"API Retry - Query: {query}, Error: {str(e)}, Waiting: {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                delay = backoff_delay(attempt, response.headers.get('Retry-After'))
+                logging.warning(f"API Retry - Query: {query}, Status: {response.status_code}, Waiting: {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            response.raise_for_status()
+            body = response.json()
+            if self.cache is not None:
+                self.cache.put(query, page, params, body)
+            return body.get('data') or []
+
+    def iter_pages(self, query, max_pages=JSEARCH_MAX_PAGES, stop=None, **extra_params):
+        """Yields one query's results page by page until they run out or `max_pages` is hit"""
+        for page in range(1, max_pages + 1):
+            if stop is not None and stop.is_set():
+                return
+
+            jobs = self.search(query, page=page, **extra_params)
+            # Log API call
+            logging.info(f"API Call - Query: {query}, Page: {page}, Results: {len(jobs)}")
+
+            if jobs:
+                yield jobs
+            if len(jobs) < JSEARCH_PAGE_SIZE:
+                return
+
+    def stream_jobs(self, queries, max_pages=JSEARCH_MAX_PAGES, queue_pages=JSEARCH_QUEUE_PAGES, checkpoints=None):
+        """Yields jobs as pages arrive from all queries, fetched concurrently.
+
+        Pages go through a bounded queue, so the fetch threads run ahead of the
+        consumer by at most `queue_pages` pages and memory stays flat however many
+        pages are pulled. A query that fails after its retries is logged and
+        skipped; the stream only raises if every query failed.
+
+        With `checkpoints` (query -> QueryCheckpoint) each query only asks for the
+        date_posted window since its last successful run. Everything in that window
+        is passed on, since results aren't in date order; dedupe_jobs drops what's
+        already stored.
+        """
+        if not queries:
+            return
+
+        pages = queue.Queue(maxsize=queue_pages)
+        stop = threading.Event()
+        done = object()
+        failed = []
+
+        def put(item):
+            # Give up waiting for queue space once the consumer has gone away
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce(query):
+            checkpoint = checkpoints.get(query) if checkpoints else None
+            extra_params = {'date_posted': checkpoint.date_posted()} if checkpoint else {}
+            try:
+                for jobs in self.iter_pages(query, max_pages=max_pages, stop=stop, **extra_params):
+                    if not put(jobs):
+                        return
+            except Exception as e:
+                failed.append(query)
+                if checkpoint is not None:
+                    checkpoint.failed = True
+                logging.error(f"API Call failed - Query: {query}, Error: {str(e)}")
+            finally:
+                put(done)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            for query in queries:
+                executor.submit(produce, query)
+
+            remaining = len(queries)
+            while remaining:
+                item = pages.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                yield from item
+        finally:
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        if len(failed) == len(queries):
+            raise RuntimeError(f"All {len(failed)} JSearch queries failed")
+
+    def fetch_all(self, queries, max_pages=JSEARCH_MAX_PAGES):
+        """Every job from every query as one list (use stream_jobs for large pulls)"""
+        return list(self.stream_jobs(queries, max_pages=max_pages))
+
+    def close(self):
+        self.session.close()
+
+def chunked(iterable, size):
+    """Groups an iterable into lists of at most `size` items"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def replay_jobs(cache, day):
+    """Yields every job from the responses cached on `day` - no network, no quota"""
+    for query, page, response in cache.iter_day(day):
+        jobs = response.get('data') or []
+        logging.info(f"Replay - Query: {query}, Page: {page}, Results: {len(jobs)}")
+        yield from jobs
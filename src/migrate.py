@@ -0,0 +1,59 @@
+import os
+import logging
+from db import connection
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sql', 'migrations')
+
+# Arbitrary key for pg_advisory_xact_lock so two processes never migrate at once
+MIGRATION_LOCK_KEY = 4242001
+
+def list_migrations():
+    """Returns (version, path) for every .sql file in sql/migrations, in order"""
+    files = sorted(f for f in os.listdir(MIGRATIONS_DIR) if f.endswith('.sql'))
+    return [(f[:-len('.sql')], os.path.join(MIGRATIONS_DIR, f)) for f in files]
+
+def applied_migrations():
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version VARCHAR(255) PRIMARY KEY,
+                applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+            )
+        """)
+        c.execute("SELECT version FROM schema_migrations")
+        versions = {row[0] for row in c.fetchall()}
+        c.close()
+    return versions
+
+def migrate():
+    """Applies pending migrations, each one in its own transaction"""
+    applied = applied_migrations()
+    pending = [(version, path) for version, path in list_migrations() if version not in applied]
+
+    for version, path in pending:
+        with open(path) as f:
+            sql = f.read()
+
+        with connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_KEY,))
+
+            # Another process may have applied it while we waited for the lock
+            c.execute("SELECT 1 FROM schema_migrations WHERE version = %s", (version,))
+            if c.fetchone():
+                c.close()
+                continue
+
+            c.execute(sql)
+            c.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+            c.close()
+
+        logging.info(f"Applied migration {version}")
+        print(f"Applied migration {version}")
+
+    if not pending:
+        print("Database schema is up to date")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,155 @@
+import logging
+import queue
+import threading
+import time
+
+class Stage:
+    """One step of a Pipeline: `func` is called on every item with `workers` threads.
+
+    Whatever `func` returns is passed to the next stage (None and empty results
+    are dropped). The last stage's results are collected by Pipeline.run().
+    """
+
+    def __init__(self, name, func, workers=1):
+        if workers < 1:
+            raise ValueError(f"Stage {name} needs at least one worker")
+        self.name = name
+        self.func = func
+        self.workers = workers
+
+class PipelineError(Exception):
+    """Raised by Pipeline.run() when a stage fails; the original error is the __cause__"""
+
+class Pipeline:
+    """Runs a source iterable through a chain of stages that overlap in time.
+
+    Every stage runs on its own threads and stages are linked by bounded queues,
+    so fetching, transforming and loading happen concurrently: wall-clock time
+    tracks the slowest stage instead of the sum, and the bounded queues keep a
+    fast producer from piling up work in memory. Busy time per stage is recorded
+    in `self.timings` so the bottleneck shows up in the logs.
+    """
+
+    def __init__(self, stages, queue_size=4):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.timings = {}
+
+    def run(self, source, source_name='source'):
+        """Feeds `source` through the stages; returns the last stage's results in completion order"""
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        abort = threading.Event()
+        errors = []
+        results = []
+        lock = threading.Lock()
+        done = object()
+
+        self.timings = {source_name: {'items': 0, 'seconds': 0.0}}
+        for stage in self.stages:
+            self.timings[stage.name] = {'items': 0, 'seconds': 0.0}
+
+        def record(name, seconds):
+            with lock:
+                self.timings[name]['items'] += 1
+                self.timings[name]['seconds'] += seconds
+
+        def fail(name, error):
+            with lock:
+                errors.append((name, error))
+            abort.set()
+
+        def put(q, item):
+            # Stop waiting for space once another stage has failed
+            while not abort.is_set():
+                try:
+                    q.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def feed():
+            iterator = iter(source)
+            try:
+                while not abort.is_set():
+                    start = time.perf_counter()
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        break
+                    record(source_name, time.perf_counter() - start)
+                    if not put(queues[0], item):
+                        break
+            except Exception as e:
+                fail(source_name, e)
+            finally:
+                close = getattr(iterator, 'close', None)
+                if close is not None:
+                    close()
+                for _ in range(self.stages[0].workers):
+                    put(queues[0], done)
+
+        def work(index, stage, finished):
+            inbox = queues[index]
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            try:
+                while True:
+                    try:
+                        item = inbox.get(timeout=0.5)
+                    except queue.Empty:
+                        if abort.is_set():
+                            return
+                        continue
+                    if item is done:
+                        return
+                    if abort.is_set():
+                        continue
+
+                    start = time.perf_counter()
+                    try:
+                        result = stage.func(item)
+                    except Exception as e:
+                        fail(stage.name, e)
+                        continue
+                    record(stage.name, time.perf_counter() - start)
+
+                    if result is None or (hasattr(result, '__len__') and len(result) == 0):
+                        continue
+                    if outbox is None:
+                        with lock:
+                            results.append(result)
+                    elif not put(outbox, result):
+                        return
+            finally:
+                # The last worker of a stage to finish tells the next stage to stop
+                with lock:
+                    finished[index] -= 1
+                    last = finished[index] == 0
+                if last and outbox is not None:
+                    for _ in range(self.stages[index + 1].workers):
+                        put(outbox, done)
+
+        finished = [stage.workers for stage in self.stages]
+        threads = [threading.Thread(target=feed, name=f"pipeline-{source_name}", daemon=True)]
+        for index, stage in enumerate(self.stages):
+            for n in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=work, args=(index, stage, finished), name=f"pipeline-{stage.name}-{n}", daemon=True
+                ))
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        for name, timing in self.timings.items():
+            logging.info(f"Pipeline Stage - {name}: {timing['items']} batches, {timing['seconds']:.2f}s busy")
+        logging.info(f"Pipeline - Wall time: {elapsed:.2f}s")
+
+        if errors:
+            name, error = errors[0]
+            raise PipelineError(f"Stage {name} failed: {str(error)}") from error
+
+        return results
@@ -0,0 +1,236 @@
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+import pandas as pd
+from db import connection
+from query_runner import run_in_snapshot
+
+QUERIES_SQL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sql', 'queries.sql')
+RESULTS_DIR = os.getenv('RESULTS_DIR', 'results')
+# Seconds a query result is reused for the same parameters (0 disables the cache)
+QUERY_CACHE_TTL = float(os.getenv('QUERY_CACHE_TTL', 300))
+# Most (name, params) results kept; the least recently used go first
+QUERY_CACHE_SIZE = int(os.getenv('QUERY_CACHE_SIZE', 128))
+
+class Query:
+    """One named analytics query.
+
+    The SQL lives in sql/queries.sql under `-- name: <name>` and uses %(param)s
+    placeholders; `params` holds their defaults. `output` is the CSV file (under
+    RESULTS_DIR) that run_queries() writes the result to, if any. A block can pull
+    in another block (e.g. a shared filter) with {{block_name}}. `optional` names
+    params whose `AND ...` condition lines are left out of the SQL when they're None.
+    """
+
+    def __init__(self, name, description, params=None, output=None, snapshot=True, optional=()):
+        self.name = name
+        self.description = description
+        self.params = params or {}
+        self.output = output
+        # False for on-demand queries (dashboard filters) that run_queries() skips by default
+        self.snapshot = snapshot
+        self.optional = frozenset(optional)
+
+    def bind(self, overrides):
+        """Default params updated with `overrides`; unknown names are an error"""
+        unknown = set(overrides) - set(self.params)
+        if unknown:
+            raise ValueError(f"Query {self.name} has no parameter(s): {', '.join(sorted(unknown))}")
+        return {**self.params, **overrides}
+
+# Parameters of the posting_filter block; None means "don't filter on this"
+FILTER_PARAMS = {
+    'province': None,
+    'city': None,
+    'is_remote': None,
+    'experience_level': None,
+    'date_from': None,
+    'date_to': None,
+}
+
+# A new metric is a block in sql/queries.sql plus one entry here
+REGISTRY = {query.name: query for query in [
+    Query('top_skills', "Top 10 In-Demand Skills", {'limit': 10}, 'query_1_top_skills.csv'),
+    Query('job_details', "Job Postings with Company and Location Details", {'limit': 10}, 'query_2_job_details.csv'),
+    Query('salary_by_role', "Average Salary by Role", {}, 'query_3_salary_by_role.csv'),
+    Query('skill_cooccurrence', "Skill Co-occurrence", {'min_pairs': 5}, 'query_4_skill_cooccurrence.csv'),
+    Query('hiring_trends', "Hiring Trends Over Time", {'days': 90}, 'query_5_hiring_trends.csv'),
+    Query('top_companies', "Top Hiring Companies", {'min_jobs': 3}, 'query_6_top_companies.csv'),
+    Query('filter_options', "Dashboard Filter Options"),
+    # Dashboard filters: same columns as their unfiltered counterparts, run on demand
+    Query('filtered_top_skills', "Top Skills (filtered)", {**FILTER_PARAMS, 'limit': 10}, snapshot=False, optional=FILTER_PARAMS),
+    Query('filtered_job_details', "Job Details (filtered)", {**FILTER_PARAMS, 'limit': 10}, snapshot=False, optional=FILTER_PARAMS),
+    Query('filtered_top_companies', "Top Companies (filtered)", {**FILTER_PARAMS, 'min_jobs': 1}, snapshot=False, optional=FILTER_PARAMS),
+]}
+
+_sql = None
+_sql_mtime = None
+_sql_lock = threading.Lock()
+
+def load_sql(path=QUERIES_SQL_PATH):
+    """{name: sql} from sql/queries.sql, re-read only when the file changes"""
+    global _sql, _sql_mtime
+
+    mtime = os.stat(path).st_mtime
+    with _sql_lock:
+        if _sql is None or mtime != _sql_mtime:
+            with open(path) as f:
+                text = f.read()
+            parts = re.split(r'^--\s*name:\s*(\w+)\s*$', text, flags=re.MULTILINE)
+            _sql = {name: sql.strip() for name, sql in zip(parts[1::2], parts[2::2])}
+            _sql_mtime = mtime
+        return _sql
+
+def get_query(name):
+    try:
+        return REGISTRY[name]
+    except KeyError:
+        raise KeyError(f"Unknown analytics query: {name}") from None
+
+def query_sql(name, params=None):
+    """The SQL registered for `name`.
+
+    Given the bound `params`, condition lines that only use optional params set
+    to None are dropped, so the statement filters on exactly what's set.
+    """
+    query = get_query(name)
+    blocks = load_sql()
+    if name not in blocks:
+        raise KeyError(f"No '-- name: {name}' block in {QUERIES_SQL_PATH}")
+    sql = _expand(blocks[name], blocks, (name,))
+
+    unset = {param for param in query.optional if params is not None and params.get(param) is None}
+    if unset:
+        sql = '\n'.join(line for line in sql.split('\n') if not _unset_condition(line, unset))
+    return sql
+
+def _unset_condition(line, unset):
+    if not line.lstrip().upper().startswith('AND '):
+        return False
+    used = set(re.findall(r'%\((\w+)\)s', line))
+    return bool(used) and used <= unset
+
+def _expand(sql, blocks, including=()):
+    def include(match):
+        block = match.group(1)
+        if block not in blocks:
+            raise KeyError(f"No '-- name: {block}' block in {QUERIES_SQL_PATH} to include")
+        if block in including:
+            raise ValueError(f"Block {block} in {QUERIES_SQL_PATH} includes itself")
+        return _expand(blocks[block], blocks, including + (block,))
+    return re.sub(r'\{\{(\w+)\}\}', include, sql)
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+def _cache_get(key):
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is None:
+            return None
+        if cached[0] <= now:
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return cached[1]
+
+def _cache_put(key, df):
+    now = time.monotonic()
+    with _cache_lock:
+        _cache[key] = (now + QUERY_CACHE_TTL, df)
+        _cache.move_to_end(key)
+        for stale in [k for k, (expires, _) in _cache.items() if expires <= now]:
+            del _cache[stale]
+        while len(_cache) > QUERY_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+def run_query(name, conn=None, cache=True, **params):
+    """Runs registered query `name` and returns its DataFrame.
+
+    Keyword arguments override the query's default params. Results are cached for
+    QUERY_CACHE_TTL seconds per (name, params), up to QUERY_CACHE_SIZE entries;
+    cache=False runs the query without reading or writing the cache.
+    Runs on `conn` if given (e.g. a run_in_snapshot connection), else a pooled one.
+    """
+    query = get_query(name)
+    bound = query.bind(params)
+    key = (name, tuple(sorted(bound.items())))
+
+    use_cache = cache and QUERY_CACHE_TTL > 0 and QUERY_CACHE_SIZE > 0
+    if use_cache:
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
+    sql = query_sql(name, bound)
+    start = time.perf_counter()
+    if conn is not None:
+        df = pd.read_sql(sql, conn, params=bound)
+    else:
+        with connection() as conn:
+            df = pd.read_sql(sql, conn, params=bound)
+    logging.info(f"Query {name} - {len(df)} rows in {time.perf_counter() - start:.2f}s")
+
+    if use_cache:
+        _cache_put(key, df)
+    return df
+
+def run_queries(names=None, params=None, refresh=False, write=False):
+    """Runs several registered queries concurrently on one snapshot (see run_in_snapshot).
+
+    `names` defaults to every snapshot query in the registry and `params` maps
+    name -> overrides. refresh=True bypasses the result cache (see run_query).
+    With write=True each result is saved to its query's output CSV.
+    Returns {name: DataFrame}.
+    """
+    names = list(names or [name for name, query in REGISTRY.items() if query.snapshot])
+    params = params or {}
+
+    results = run_in_snapshot({
+        name: (lambda conn, name=name: run_query(name, conn=conn, cache=not refresh, **params.get(name, {})))
+        for name in names
+    })
+
+    if write:
+        write_csvs(results)
+
+    return results
+
+def write_csvs(results):
+    """Saves each result in `results` ({name: DataFrame}) to its query's output CSV in RESULTS_DIR.
+
+    A CSV is written to a temp file and swapped in with os.replace, so anyone
+    reading it sees the old or the new export, never a partial one; exports whose
+    contents haven't changed are left untouched.
+    """
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    for name, result in results.items():
+        query = REGISTRY[name]
+        if not query.output:
+            continue
+
+        path = os.path.join(RESULTS_DIR, query.output)
+        data = result.to_csv(index=False)
+        if os.path.exists(path):
+            with open(path, newline='') as f:
+                if f.read() == data:
+                    continue
+
+        fd, tmp_path = tempfile.mkstemp(dir=RESULTS_DIR, prefix=f".{query.output}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', newline='') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        print(f"{query.description} saved to {path}")
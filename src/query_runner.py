@@ -0,0 +1,105 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from db import connection, DB_POOL_MAX
+
+# Queries run at once; each holds a pooled connection, and one more holds the snapshot
+ANALYTICS_WORKERS = int(os.getenv('ANALYTICS_WORKERS', 4))
+# Per-query limit in milliseconds (0 = no limit)
+ANALYTICS_STATEMENT_TIMEOUT_MS = int(os.getenv('ANALYTICS_STATEMENT_TIMEOUT_MS', 300000))
+
+def _begin_snapshot(c, snapshot_id, statement_timeout_ms):
+    # SET TRANSACTION has to come before the transaction's first query
+    c.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+    if snapshot_id:
+        c.execute("SET TRANSACTION SNAPSHOT %s", (snapshot_id,))
+    c.execute("SET LOCAL statement_timeout = %s", (statement_timeout_ms,))
+
+def run_in_snapshot(tasks, workers=ANALYTICS_WORKERS, statement_timeout_ms=ANALYTICS_STATEMENT_TIMEOUT_MS):
+    """Runs read-only `tasks` ({name: func(conn) -> result}) concurrently on one database snapshot.
+
+    A leader transaction exports its REPEATABLE READ snapshot (pg_export_snapshot) and
+    every task's transaction imports it, so all results describe the same instant even
+    if a load commits halfway through. Each task gets its own pooled connection and a
+    statement_timeout. Wall time is roughly the slowest task rather than the sum.
+
+    Returns {name: result}. Every task runs to completion (or timeout) before the
+    first failure, if any, is re-raised.
+
+    With a one-connection pool (DB_POOL_MAX=1) there is nothing to import the
+    snapshot into, so the tasks run one after another on the leader's connection.
+    """
+    if DB_POOL_MAX < 2:
+        return _run_on_leader(tasks, statement_timeout_ms)
+
+    # The leader keeps one connection busy for the whole run
+    workers = max(1, min(workers, len(tasks), DB_POOL_MAX - 1))
+    results = {}
+    errors = []
+
+    with connection() as leader:
+        c = leader.cursor()
+        _begin_snapshot(c, None, statement_timeout_ms)
+        c.execute("SELECT pg_export_snapshot()")
+        snapshot_id = c.fetchone()[0]
+
+        def run(name, func):
+            start = time.perf_counter()
+            with connection() as conn:
+                cursor = conn.cursor()
+                _begin_snapshot(cursor, snapshot_id, statement_timeout_ms)
+                cursor.close()
+                result = func(conn)
+            logging.info(f"Analytics - {name} took {time.perf_counter() - start:.2f}s")
+            return result
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='analytics') as executor:
+            futures = {name: executor.submit(run, name, func) for name, func in tasks.items()}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    logging.error(f"Analytics - {name} failed: {str(e)}")
+                    errors.append(e)
+
+        c.close()
+
+    logging.info(f"Analytics - {len(tasks)} queries on {workers} connections in {time.perf_counter() - started:.2f}s")
+
+    if errors:
+        raise errors[0]
+    return results
+
+def _run_on_leader(tasks, statement_timeout_ms):
+    """run_in_snapshot() for a one-connection pool: the tasks share one transaction, in turn"""
+    results = {}
+    errors = []
+
+    started = time.perf_counter()
+    with connection() as conn:
+        c = conn.cursor()
+        _begin_snapshot(c, None, statement_timeout_ms)
+
+        for name, func in tasks.items():
+            start = time.perf_counter()
+            # A failed statement would abort the shared transaction for every later task
+            c.execute("SAVEPOINT analytics_task")
+            try:
+                results[name] = func(conn)
+            except Exception as e:
+                c.execute("ROLLBACK TO SAVEPOINT analytics_task")
+                logging.error(f"Analytics - {name} failed: {str(e)}")
+                errors.append(e)
+                continue
+            c.execute("RELEASE SAVEPOINT analytics_task")
+            logging.info(f"Analytics - {name} took {time.perf_counter() - start:.2f}s")
+
+        c.close()
+
+    logging.info(f"Analytics - {len(tasks)} queries on 1 connection in {time.perf_counter() - started:.2f}s")
+
+    if errors:
+        raise errors[0]
+    return results
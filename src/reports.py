@@ -0,0 +1,130 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import pandas as pd
+from results_store import ResultsStore
+
+IMAGES_DIR = os.getenv('IMAGES_DIR', 'images')
+# Input hash of every chart drawn so far, kept next to the charts
+REPORTS_MANIFEST = '.reports.json'
+
+def _pyplot():
+    # Imported on first draw only, with a headless backend: the scheduler and the
+    # transform workers never need matplotlib unless a chart actually changes
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+def top_skills_chart(df, path):
+    plt = _pyplot()
+
+    # Get top 9 skills
+    df_top_skills = df.head(9)
+
+    fig = plt.figure(figsize=(10, 8))
+    # Horizontal bar chart: skill names on Y-axis, percentages on X-axis
+    plt.barh(df_top_skills['skill_name'], df_top_skills['percentage_of_jobs'])
+
+    plt.xlabel('Percentage of Jobs')
+    plt.ylabel('Skill')
+    plt.title('Top 9 In-Demand Skills')
+
+    # bbox_inches='tight' removes extra whitespace
+    fig.savefig(path, format='png', bbox_inches='tight')
+    plt.close(fig)
+
+def top_companies_chart(df, path):
+    plt = _pyplot()
+
+    # Get top 10 companies
+    df_top_companies = df.head(10)
+
+    fig = plt.figure(figsize=(10, 8))
+    # Pie chart with percentages
+    plt.pie(df_top_companies['job_count'], labels=df_top_companies['company_name'], autopct='%1.1f%%')
+    # White circle in the center for the donut effect
+    circle = plt.Circle((0, 0), 0.70, fc='white')
+    plt.gca().add_artist(circle)
+
+    plt.title('Top 10 Hiring Companies: Market Share')
+
+    fig.savefig(path, format='png', bbox_inches='tight')
+    plt.close(fig)
+
+# (image under IMAGES_DIR, snapshot result it is drawn from, renderer)
+REPORTS = [
+    ('top_skills.png', 'top_skills', top_skills_chart),
+    ('top_companies.png', 'top_companies', top_companies_chart),
+]
+
+def content_hash(df):
+    """sha256 of a result's columns, types and values (stable across processes and snapshots)"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[name, str(dtype)] for name, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+def _load_manifest(images_dir):
+    try:
+        with open(os.path.join(images_dir, REPORTS_MANIFEST)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def _save_manifest(images_dir, manifest):
+    path = os.path.join(images_dir, REPORTS_MANIFEST)
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+def render_reports(version=None, store=None, images_dir=IMAGES_DIR, force=False):
+    """Draws the report charts from an analytics snapshot (default: latest).
+
+    A chart is redrawn only when the hash of its input result differs from the
+    one it was last drawn from (or its image is missing, or force=True).
+    Returns the paths of the images written.
+    """
+    store = store or ResultsStore()
+    version = version or store.latest_version()
+    if version is None:
+        logging.warning(f"Reports - No analytics snapshot in {store.root} yet, nothing to draw")
+        return []
+
+    os.makedirs(images_dir, exist_ok=True)
+    manifest = _load_manifest(images_dir)
+    written = []
+
+    for image, result, render in REPORTS:
+        path = os.path.join(images_dir, image)
+        df = store.read(result, version)
+        digest = content_hash(df)
+
+        if not force and manifest.get(image) == digest and os.path.exists(path):
+            logging.info(f"Reports - {image} unchanged, skipped")
+            continue
+
+        # Drawn to a temp file and renamed, so nobody sees a half-written image
+        tmp_path = os.path.join(images_dir, f".{image}.tmp")
+        render(df, tmp_path)
+        os.replace(tmp_path, path)
+
+        manifest[image] = digest
+        written.append(path)
+        logging.info(f"Reports - Drew {image} from snapshot {version}")
+
+    _save_manifest(images_dir, manifest)
+    return written
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Draw the report charts from an analytics snapshot")
+    parser.add_argument('--version', help="snapshot to draw from (default: latest)")
+    parser.add_argument('--force', action='store_true', help="redraw every chart even if its input is unchanged")
+    args = parser.parse_args()
+
+    for path in render_reports(args.version, force=args.force):
+        print(f"Saved {path}")
@@ -0,0 +1,132 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import date, datetime, timedelta
+
+RESPONSE_CACHE_DIR = os.getenv(
+    'RESPONSE_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'raw')
+)
+RESPONSE_CACHE_TTL_DAYS = int(os.getenv('RESPONSE_CACHE_TTL_DAYS', 30))
+RESPONSE_CACHE_MAX_MB = int(os.getenv('RESPONSE_CACHE_MAX_MB', 1024))
+
+class ResponseCache:
+    """On-disk cache of raw JSearch responses, one gzipped JSON file per request.
+
+    Files live at <root>/<YYYY-MM-DD>/<key>.json.gz where the key is a sha256 of
+    the query, page, request params and date, so a rerun on the same day never
+    spends quota twice and any day's pull can be replayed offline. Days older than
+    `ttl_days` are dropped, and the oldest files go first once the cache is over
+    `max_bytes`.
+    """
+
+    def __init__(self, root=RESPONSE_CACHE_DIR, ttl_days=RESPONSE_CACHE_TTL_DAYS,
+                 max_bytes=RESPONSE_CACHE_MAX_MB * 1024 * 1024):
+        self.root = root
+        self.ttl_days = ttl_days
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(query, page, params, day):
+        identity = json.dumps({'query': query, 'page': page, 'params': params, 'date': day}, sort_keys=True)
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    def _path(self, day, key):
+        return os.path.join(self.root, day, f"{key}.json.gz")
+
+    def get(self, query, page, params, day=None):
+        """Returns the cached response body, or None on a miss"""
+        day = day or date.today().isoformat()
+        path = self._path(day, self.key(query, page, params, day))
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)['response']
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            # A truncated or corrupt entry is just a miss
+            logging.warning(f"Ignoring unreadable cache entry {path}: {str(e)}")
+            return None
+
+    def put(self, query, page, params, response, day=None):
+        day = day or date.today().isoformat()
+        directory = os.path.join(self.root, day)
+        os.makedirs(directory, exist_ok=True)
+
+        entry = {
+            'query': query,
+            'page': page,
+            'params': params,
+            'fetched_at': datetime.now().isoformat(timespec='seconds'),
+            'response': response,
+        }
+
+        # Write to a temp file and rename so a reader never sees half an entry
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                f.write(json.dumps(entry).encode('utf-8'))
+            os.replace(tmp_path, self._path(day, self.key(query, page, params, day)))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def days(self):
+        """Cached dates, oldest first"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(d for d in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, d)))
+
+    def iter_day(self, day):
+        """Yields (query, page, response) for every entry cached on `day`, in query/page order"""
+        directory = os.path.join(self.root, day)
+        if not os.path.isdir(directory):
+            return
+
+        entries = []
+        for name in os.listdir(directory):
+            if not name.endswith('.json.gz'):
+                continue
+            try:
+                with gzip.open(os.path.join(directory, name), 'rt', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Skipping unreadable cache entry {name}: {str(e)}")
+                continue
+            entries.append(entry)
+
+        entries.sort(key=lambda entry: (entry['query'], entry['page']))
+        for entry in entries:
+            yield entry['query'], entry['page'], entry['response']
+
+    def evict(self):
+        """Drops days past the TTL, then the oldest files until the cache fits in max_bytes"""
+        cutoff = (date.today() - timedelta(days=self.ttl_days)).isoformat()
+        for day in self.days():
+            if day < cutoff:
+                shutil.rmtree(os.path.join(self.root, day), ignore_errors=True)
+
+        files = []
+        for day in self.days():
+            directory = os.path.join(self.root, day)
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                stat = os.stat(path)
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            os.unlink(path)
+            total -= size
+
+        # Tidy up day directories that eviction emptied
+        for day in self.days():
+            directory = os.path.join(self.root, day)
+            if not os.listdir(directory):
+                os.rmdir(directory)
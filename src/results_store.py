@@ -0,0 +1,133 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timezone
+import pyarrow as pa
+
+RESULTS_STORE_DIR = os.getenv(
+    'RESULTS_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'results', 'snapshots')
+)
+# Snapshots kept after each write (older ones are deleted)
+RESULTS_KEEP_SNAPSHOTS = int(os.getenv('RESULTS_KEEP_SNAPSHOTS', 30))
+
+LATEST_POINTER = 'LATEST'
+MANIFEST = 'manifest.json'
+
+def _fsync_write(path, data):
+    with open(path, 'w') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+class ResultsStore:
+    """Versioned snapshots of analytics results as Arrow IPC (Feather v2) files.
+
+    Each analytics run becomes <root>/<version>/<query name>.arrow plus a
+    manifest.json (row counts and column types), where the version is the UTC
+    time of the run. A snapshot is written in a temp directory and renamed into
+    place, then the LATEST pointer file is swapped with os.replace, so a reader
+    sees either the previous snapshot or the complete new one, never a mix.
+
+    Files are uncompressed so readers can memory-map them: read_table() returns
+    Arrow tables backed by the page cache instead of parsed copies, and the
+    column types survive the round trip (CSV turned them all into text).
+    """
+
+    def __init__(self, root=RESULTS_STORE_DIR, keep=RESULTS_KEEP_SNAPSHOTS):
+        self.root = root
+        self.keep = keep
+
+    def write(self, results):
+        """Saves {name: DataFrame} as a new snapshot and points LATEST at it; returns the version"""
+        os.makedirs(self.root, exist_ok=True)
+        version = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S.%fZ')
+
+        tmp_dir = tempfile.mkdtemp(dir=self.root, prefix='.tmp-')
+        try:
+            tables = {}
+            for name, df in results.items():
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                with open(os.path.join(tmp_dir, f"{name}.arrow"), 'wb') as f:
+                    with pa.ipc.new_file(f, table.schema) as writer:
+                        writer.write_table(table)
+                    f.flush()
+                    os.fsync(f.fileno())
+                tables[name] = {
+                    'rows': table.num_rows,
+                    'columns': {field.name: str(field.type) for field in table.schema},
+                }
+
+            manifest = {
+                'version': version,
+                'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'tables': tables,
+            }
+            _fsync_write(os.path.join(tmp_dir, MANIFEST), json.dumps(manifest, indent=2))
+            os.replace(tmp_dir, os.path.join(self.root, version))
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        pointer_tmp = os.path.join(self.root, f".{LATEST_POINTER}.tmp")
+        _fsync_write(pointer_tmp, version)
+        os.replace(pointer_tmp, os.path.join(self.root, LATEST_POINTER))
+
+        logging.info(f"Results Store - Wrote snapshot {version} ({len(results)} tables)")
+        self.prune()
+        return version
+
+    def versions(self):
+        """Complete snapshots, oldest first"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if not name.startswith('.') and os.path.isfile(os.path.join(self.root, name, MANIFEST))
+        )
+
+    def latest_version(self):
+        """The version LATEST points at, or None if nothing has been written yet"""
+        try:
+            with open(os.path.join(self.root, LATEST_POINTER)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def manifest(self, version=None):
+        version = version or self._require_latest()
+        with open(os.path.join(self.root, version, MANIFEST)) as f:
+            return json.load(f)
+
+    def read_table(self, name, version=None):
+        """Memory-maps result `name` from a snapshot (default: latest) as a pyarrow Table"""
+        version = version or self._require_latest()
+        path = os.path.join(self.root, version, f"{name}.arrow")
+        return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+    def read(self, name, version=None):
+        """Result `name` as a DataFrame"""
+        return self.read_table(name, version).to_pandas()
+
+    def prune(self):
+        """Deletes all but the newest `keep` snapshots (never the one LATEST points at)"""
+        latest = self.latest_version()
+        versions = self.versions()
+        for version in versions[:max(0, len(versions) - self.keep)]:
+            if version != latest:
+                shutil.rmtree(os.path.join(self.root, version), ignore_errors=True)
+
+        # Leftovers from writes that died before their rename (old enough not to be in progress)
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.startswith('.tmp-') and time.time() - os.path.getmtime(path) > 3600:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _require_latest(self):
+        version = self.latest_version()
+        if version is None:
+            raise FileNotFoundError(f"No analytics results in {self.root} yet, run the analytics first")
+        return version
@@ -1,17 +1,24 @@
-import schedule
+import sys
 import time
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from analytics import run_all_queries
-import requests
-from dotenv import load_dotenv
+from reports import render_reports
 import os
-from db import insert_job, insert_skill, insert_job_skills, check_if_job_exists
-import pandas as pd
-import re
+from db import bulk_load_jobs, upsert_jobs, sync_skills
+from dedup import dedupe_jobs
+from transform import TransformEngine
+from skills import get_skill_extractor
+from pipeline import Pipeline, Stage
+from jsearch import JSearchClient, load_queries, chunked, replay_jobs
+from response_cache import ResponseCache
+from checkpoints import load_checkpoints, save_checkpoints
+from etl_runs import EtlLockBusy, etl_lock, recover_interrupted_runs, start_run, finish_run, last_success, last_attempt, recent_runs, has_succeeded
+import argparse
 import logging
 from logging.handlers import TimedRotatingFileHandler
 
 # Set up log rotation (keeps last 30 days)
+os.makedirs('logs', exist_ok=True)
 handler = TimedRotatingFileHandler(
     filename='logs/scheduler.log',
     when='midnight',      
@@ -24,149 +31,322 @@ logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 logger.addHandler(handler)
 
+# Postings per load_to_database call (one transaction each)
+LOAD_BATCH_SIZE = int(os.getenv('LOAD_BATCH_SIZE', 200))
+# Worker threads per pipeline stage, and batches allowed to queue between stages
+# (transform threads only dispatch to the TransformEngine's process pool)
+TRANSFORM_WORKERS = int(os.getenv('TRANSFORM_WORKERS', 2))
+# bulk_load_jobs holds the summary advisory lock for its whole transaction (it has
+# to be taken before the company/location/skill upserts to avoid deadlocks), so
+# loads run one at a time whatever this is set to; more workers only hold pooled
+# connections while they wait for the lock
+LOAD_WORKERS = int(os.getenv('LOAD_WORKERS', 1))
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', 4))
 
 # ETL (Extract, Transform, Load)
-def fetch_jobs():
+def fetch_jobs(checkpoints=None):
+    """Streams jobs from every configured query, following pages as they arrive"""
+    cache = ResponseCache()
+    # Write-only: the cache keeps raw responses for replay/backfill, but an hourly
+    # fetch sends the same params all day and must always reach the API
+    client = JSearchClient(cache=cache, read_cache=False)
     try:
-        load_dotenv()
-
-        app_key = os.getenv('JSEARCH_API_KEY')
-
-        url = "https://jsearch.p.rapidapi.com/search"
-
-        headers = {
-            "X-RapidAPI-Key": app_key,
-            "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
-        }
-
-        queries = [
-            "data analyst Montreal",
-            "business analyst Vancouver",
-            "data engineer Toronto", 
-            "remote data scientist Alberta",
-            "junior data analyst British Columbia"
-        ]
-
-        all_jobs = []
-        for query in queries:
-            params = {
-                "query": query,
-                "num_pages": 1,
-                "country": "ca",
-            }
-
-            response = requests.get(url = url, headers = headers, params = params)
-            response.raise_for_status()
-            data = response.json()
-
-            for job in data['data']:
-                all_jobs.append(job)
-
-        # Log API call
-            logging.info(f"API Call - Query: {params['query']}, Results: {len(data['data'])}")
-
-        return all_jobs
+        yield from client.stream_jobs(load_queries(), checkpoints=checkpoints)
     except Exception as e:
         logging.error(f"Error fetching jobs: {str(e)}")
         raise
+    finally:
+        client.close()
+        cache.evict()
 
-def process_jobs(jobs):
-    skills_list = ['python', 'r', 'java', 'scala', 'julia', 'c++', 'javascript', 'typescript', 'sql', 'mysql', 'postgresql', 'postgres', 'mongodb', 'redis', 'cassandra', 'oracle', 'snowflake', 'bigquery', 'aws', 'azure', 'gcp', 'google cloud', 'spark', 'hadoop', 'kafka', 'flink', 'hive', 'presto', 'tableau', 'power bi', 'looker', 'qlik', 'metabase', 'superset', 'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy', 'keras', 'xgboost', 'excel', 'git', 'docker', 'kubernetes', 'k8s', 'airflow', 'dbt', 'databricks', 'etl', 'data pipeline', 'data warehouse', 'data lake', 'statistics', 'machine learning', 'deep learning', 'nlp', 'computer vision', 'sas', 'spss', 'matlab']
-
-    for job in jobs:
-        job_description = job.get('job_description')
-        job_title = job.get("job_title")
-        
-        if job_description: 
-            desc_lower = job_description.lower()
-            
-            for skill in skills_list:
-                if skill.lower() in desc_lower:
-                    print(f"NEEDS {skill}")
-        
-        if job_title:
-            title_lower = job_title.lower()
-        
-            if "junior" in title_lower or "entry" in title_lower:
-                print("Entry Level")
-            elif "senior" in title_lower or "lead" in title_lower:
-                print("Senior Level")
-            else:
-                print("Mid Level")
-
-        if (job_title and "remote" in job_title.lower()) or (job_description and "remote" in job_description.lower()):
-            print("This is a remote job")
-
-def load_to_database(jobs):
-    skills_list = ['python', 'r', 'java', 'scala', 'julia', 'c++', 'javascript', 'typescript', 'sql', 'mysql', 'postgresql', 'postgres', 'mongodb', 'redis', 'cassandra', 'oracle', 'snowflake', 'bigquery', 'aws', 'azure', 'gcp', 'google cloud', 'spark', 'hadoop', 'kafka', 'flink', 'hive', 'presto', 'tableau', 'power bi', 'looker', 'qlik', 'metabase', 'superset', 'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy', 'keras', 'xgboost', 'excel', 'git', 'docker', 'kubernetes', 'k8s', 'airflow', 'dbt', 'databricks', 'etl', 'data pipeline', 'data warehouse', 'data lake', 'statistics', 'machine learning', 'deep learning', 'nlp', 'computer vision', 'sas', 'spss', 'matlab']
-
-    skill_mapping = {
-        'postgres': 'postgresql',
-        'k8s': 'kubernetes',
-        'sklearn': 'scikit-learn',
-        'gcp': 'google cloud',
-    }
-
-    added_count = 0
-    duplicate_count = 0
+def dedupe_batch(jobs):
+    new_jobs, duplicate_count = dedupe_jobs(jobs)
+    logging.info(f"Dedup - New jobs: {len(new_jobs)}, Duplicates skipped: {duplicate_count}")
+    return new_jobs
 
+def load_to_database(rows):
     try:
-        for job in jobs:
-            job_url = job.get('job_apply_link')
-
-            if job_url and check_if_job_exists(job_url):
-                duplicate_count += 1
-                continue
-
-            job_title = job.get('job_title')
-            company_name = job.get('employer_name')
-            city = job.get('job_city')
-            province = job.get('job_state')
-            salary_min = int(job.get('job_min_salary', 0))
-            salary_max = int(job.get('job_max_salary', 0))
-
-            job_id = insert_job(
-                job_title=job_title,
-                company_name=company_name,
-                city=city,
-                province=province,
-                salary_min=salary_min,
-                salary_max=salary_max,
-                job_url=job_url,
-            )
-
-            job_description = job.get('job_description')
-            if job_description:
-                desc_lower = job_description.lower()
-                found_skills = set()
-
-                for skill in skills_list:
-                    if re.search(rf'\b{re.escape(skill)}\b', desc_lower):
-                        canonical_skill = skill_mapping.get(skill, skill)
-                        found_skills.add(canonical_skill)
-
-                for canonical_skill in found_skills:
-                    skill_id = insert_skill(canonical_skill)
-                    insert_job_skills(job_id, skill_id)
-
-            added_count += 1
+        # One transaction for the whole batch
+        job_ids = bulk_load_jobs(rows)
 
         # Log results
-        logging.info(f"Database Load - Jobs added: {added_count}, Duplicates skipped: {duplicate_count}")
+        logging.info(f"Database Load - Jobs added: {len(job_ids)}")
+
+        return job_ids
 
     except Exception as e:
         logging.error(f"Error loading to database: {str(e)}")
         raise
 
-def job():
-    jobs = fetch_jobs()
-    process_jobs(jobs)
-    load_to_database(jobs)
-    run_all_queries()
+def reprocess_in_database(rows):
+    try:
+        # Stored postings are overwritten with the new transform output, in one transaction
+        job_ids = upsert_jobs(rows)
+        logging.info(f"Database Reprocess - Jobs written: {len(job_ids)}")
+        return job_ids
+
+    except Exception as e:
+        logging.error(f"Error reprocessing into database: {str(e)}")
+        raise
 
-#ensures that it runs at 6 am everyday
-schedule.every().day.at("06:00").do(job)
+# Taxonomy version whose categories this process last wrote to the skills table
+_synced_taxonomy_version = None
+
+def sync_skill_taxonomy():
+    """Writes config/skills.json's skills and categories to the skills table once per taxonomy version.
+
+    Loads insert skills they haven't seen before without a category, so this runs
+    before every ETL run; a taxonomy hot-reloaded mid-run is picked up by the next one.
+    """
+    global _synced_taxonomy_version
+    extractor = get_skill_extractor()
+    if extractor.version != _synced_taxonomy_version:
+        sync_skills(extractor.categories)
+        _synced_taxonomy_version = extractor.version
+        logging.info(f"Skill categories synced from taxonomy v{extractor.version}")
+
+def run_etl(jobs, reprocess=False):
+    """Streams raw jobs through dedupe -> transform -> load; returns the new job_ids.
+
+    Stages run concurrently on bounded queues, so loading overlaps with fetching
+    and the run takes about as long as its slowest stage. The transform stage
+    hands its batches to a process pool so it isn't limited to one core.
+
+    With reprocess=True there is no dedupe stage and postings already stored are
+    overwritten (upsert_jobs), so a transform fix reaches them; returns the
+    job_ids written.
+    """
+    sync_skill_taxonomy()
+
+    with TransformEngine() as engine:
+        stages = [] if reprocess else [Stage('dedupe', dedupe_batch)]
+        pipeline = Pipeline(stages + [
+            Stage('transform', engine.transform, workers=TRANSFORM_WORKERS),
+            Stage('load', reprocess_in_database if reprocess else load_to_database, workers=LOAD_WORKERS),
+        ], queue_size=PIPELINE_QUEUE_SIZE)
+
+        results = pipeline.run(chunked(jobs, LOAD_BATCH_SIZE), source_name='fetch')
+
+    return [job_id for job_ids in results for job_id in job_ids]
+
+# Minutes between incremental fetches (counted from midnight), and the local time of the nightly analytics
+FETCH_INTERVAL_MINUTES = int(os.getenv('FETCH_INTERVAL_MINUTES', 60))
+ANALYTICS_AT = os.getenv('ANALYTICS_AT', '06:00')
+# How often the daemon looks for due jobs, and how long a failed slot waits before it's retried
+SCHEDULER_POLL_SECONDS = int(os.getenv('SCHEDULER_POLL_SECONDS', 60))
+ETL_RETRY_MINUTES = int(os.getenv('ETL_RETRY_MINUTES', 15))
+
+def fetch_job():
+    """Incremental fetch + load; returns the number of postings added"""
+    # Only pull what's been posted since each query's last successful run
+    checkpoints = load_checkpoints(load_queries())
+
+    job_ids = run_etl(fetch_jobs(checkpoints))
+
+    # Everything fetched is committed, so the checkpoints can move forward
+    save_checkpoints(checkpoints)
+    return len(job_ids)
+
+def analytics_job():
+    """All analytics queries into a new snapshot, then the charts that changed"""
+    run_all_queries()
+    render_reports()
+
+def replay(day, reprocess=False):
+    """Re-runs transform + load over the raw responses cached on `day` (YYYY-MM-DD), offline.
+
+    Postings already stored are skipped, or overwritten with reprocess=True.
+    """
+    logging.info(f"{'Reprocessing' if reprocess else 'Replaying'} cached API responses from {day}")
+    return len(run_etl(replay_jobs(ResponseCache(), day), reprocess=reprocess))
+
+def fetch_slot(now):
+    """Latest fetch tick at or before `now`"""
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    minutes = int((now - midnight).total_seconds() // 60)
+    return midnight + timedelta(minutes=minutes - minutes % FETCH_INTERVAL_MINUTES)
+
+def analytics_slot(now):
+    """Latest ANALYTICS_AT at or before `now`"""
+    hour, minute = (int(part) for part in ANALYTICS_AT.split(':'))
+    slot = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return slot if slot <= now else slot - timedelta(days=1)
+
+# (job name, function, latest slot due at a given time, time between slots)
+# Checked in this order, so the nightly analytics see that tick's fetch
+JOBS = [
+    ('fetch', fetch_job, fetch_slot, timedelta(minutes=FETCH_INTERVAL_MINUTES)),
+    ('analytics', analytics_job, analytics_slot, timedelta(days=1)),
+]
+
+def execute(job_name, func, scheduled_for, trigger):
+    """Runs func() as one ledgered run of job_name under the ETL lock.
+
+    Raises EtlLockBusy (without recording anything) if another process is
+    running a job; otherwise the run ends up succeeded, failed or interrupted
+    in etl_runs, and func's exception (if any) is re-raised.
+    """
+    with etl_lock():
+        recover_interrupted_runs()
+        run_id = start_run(job_name, scheduled_for, trigger)
+        logging.info(f"Scheduler - Run {run_id}: {job_name} for {scheduled_for:%Y-%m-%d %H:%M} ({trigger})")
+
+        try:
+            jobs_loaded = func()
+        except BaseException as e:
+            status = 'interrupted' if isinstance(e, KeyboardInterrupt) else 'failed'
+            finish_run(run_id, status, error=f"{type(e).__name__}: {e}")
+            logging.error(f"Scheduler - Run {run_id} ({job_name}) {status}: {str(e)}")
+            raise
+
+        finish_run(run_id, 'succeeded', jobs_loaded=jobs_loaded)
+        logging.info(f"Scheduler - Run {run_id} ({job_name}) succeeded")
+    return jobs_loaded
+
+def due_slot(job_name, slot_for, period, now):
+    """(slot, trigger) if job_name has a slot at or before `now` that hasn't succeeded, else None"""
+    slot = slot_for(now)
+    last = last_success(job_name)
+    if last is not None and last >= slot:
+        return None
+
+    # Back off after a failure instead of retrying on every poll
+    attempt = last_attempt(job_name)
+    if attempt is not None:
+        scheduled_for, status, finished_at = attempt
+        if status == 'failed' and scheduled_for >= slot and now - finished_at < timedelta(minutes=ETL_RETRY_MINUTES):
+            return None
+
+    # Slots missed while the scheduler was down collapse into one run: fetches resume
+    # from their checkpoints and the analytics read the whole database anyway
+    trigger = 'catchup' if last is not None and last < slot - period else 'schedule'
+    return slot, trigger
+
+def run_due_jobs(now=None):
+    """Runs every job that is due at `now` (default: current time); returns the names of those that succeeded"""
+    now = now or datetime.now().astimezone()
+    succeeded = []
+
+    for job_name, func, slot_for, period in JOBS:
+        due = due_slot(job_name, slot_for, period, now)
+        if due is None:
+            continue
+
+        try:
+            execute(job_name, func, *due)
+        except EtlLockBusy:
+            logging.info(f"Scheduler - {job_name} is due but another run holds the lock, retrying next poll")
+            break
+        except Exception:
+            # Already in the ledger as failed; retried after ETL_RETRY_MINUTES
+            continue
+        succeeded.append(job_name)
+
+    return succeeded
+
+def daemon():
+    """Runs due jobs every SCHEDULER_POLL_SECONDS until stopped"""
+    logging.info(
+        f"Scheduler - Started: fetch every {FETCH_INTERVAL_MINUTES} min, analytics daily at {ANALYTICS_AT}"
+    )
+    while True:
+        try:
+            run_due_jobs()
+        except Exception as e:
+            # e.g. the database is unreachable - keep the daemon alive and try again
+            logging.error(f"Scheduler - Couldn't check for due jobs: {str(e)}")
+        time.sleep(SCHEDULER_POLL_SECONDS)
+
+def run_now(job_name):
+    """Runs a job (or 'all' of them, in order) immediately"""
+    now = datetime.now().astimezone()
+    for name, func, _, _ in JOBS:
+        if job_name in (name, 'all'):
+            execute(name, func, now, 'manual')
+
+def backfill(start, end=None, force=False, analytics=True, reprocess=False):
+    """Reloads the cached API responses for every day from start to end (inclusive).
+
+    Days already backfilled successfully are skipped unless force=True, so an
+    interrupted range can simply be run again. reprocess=True overwrites postings
+    that are already stored with the current transform's output (every day is
+    run, as with force). Runs the analytics once at the end if anything was loaded.
+    """
+    cached_days = set(ResponseCache().days())
+    loaded = 0
+
+    day = start
+    while day <= (end or start):
+        scheduled_for = datetime(day.year, day.month, day.day).astimezone()
+
+        if day.isoformat() not in cached_days:
+            logging.warning(f"Scheduler - No cached API responses for {day}, skipped")
+            print(f"{day}: no cached API responses, skipped")
+        elif not (force or reprocess) and has_succeeded('backfill', scheduled_for):
+            print(f"{day}: already backfilled, skipped (--force to reload)")
+        else:
+            added = execute('backfill', lambda: replay(day.isoformat(), reprocess), scheduled_for,
+                            'reprocess' if reprocess else 'backfill')
+            loaded += added
+            print(f"{day}: {added} postings {'reprocessed' if reprocess else 'added'}")
+
+        day += timedelta(days=1)
+
+    if analytics and loaded:
+        execute('analytics', analytics_job, datetime.now().astimezone(), 'backfill')
+    return loaded
+
+def print_status(limit=20):
+    for run_id, job_name, scheduled_for, trigger, status, started_at, finished_at, jobs_loaded, error in recent_runs(limit):
+        took = f"{(finished_at - started_at).total_seconds():.0f}s" if finished_at else "-"
+        loaded = "" if jobs_loaded is None else f" {jobs_loaded} postings"
+        print(
+            f"{run_id:>6}  {job_name:<10} {scheduled_for:%Y-%m-%d %H:%M}  {trigger:<9} {status:<12} {took:>6}{loaded}"
+            + (f"  {error}" if error else "")
+        )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Job market ETL scheduler")
+    parser.add_argument('--replay', metavar='YYYY-MM-DD', type=date.fromisoformat,
+                        help="same as `backfill YYYY-MM-DD --force --no-analytics`: loads the postings "
+                             "from that day's cached responses that aren't stored yet")
+    subcommands = parser.add_subparsers(dest='command')
+
+    subcommands.add_parser('daemon', help="run the jobs on their schedules until stopped (the default)")
+
+    run_parser = subcommands.add_parser('run', help="run a job now")
+    run_parser.add_argument('job', choices=[name for name, *_ in JOBS] + ['all'])
+
+    backfill_parser = subcommands.add_parser(
+        'backfill', help="load the API responses cached on these dates instead of calling the API"
+    )
+    backfill_parser.add_argument('start', metavar='START', type=date.fromisoformat, help="YYYY-MM-DD")
+    backfill_parser.add_argument('end', metavar='END', type=date.fromisoformat, nargs='?',
+                                 help="YYYY-MM-DD, inclusive (default: START)")
+    backfill_parser.add_argument('--force', action='store_true', help="reload days that were already backfilled")
+    backfill_parser.add_argument('--no-analytics', action='store_true', help="don't rerun the analytics afterwards")
+    backfill_parser.add_argument('--reprocess', action='store_true',
+                                 help="overwrite postings already stored with the current transform (e.g. after a parser fix)")
+
+    status_parser = subcommands.add_parser('status', help="show the latest runs")
+    status_parser.add_argument('--limit', type=int, default=20)
+
+    args = parser.parse_args(argv)
 
-while True:
-    schedule.run_pending()
-    time.sleep(60)
\ No newline at end of file
+    try:
+        if args.replay:
+            backfill(args.replay, analytics=False, force=True)
+        elif args.command == 'run':
+            run_now(args.job)
+        elif args.command == 'backfill':
+            backfill(args.start, args.end, force=args.force, analytics=not args.no_analytics, reprocess=args.reprocess)
+        elif args.command == 'status':
+            print_status(args.limit)
+        else:
+            daemon()
+    except EtlLockBusy as e:
+        print(f"{e}, try again once it finishes")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
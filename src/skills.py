@@ -0,0 +1,131 @@
+import json
+import logging
+import os
+import re
+import threading
+
+TAXONOMY_PATH = os.getenv(
+    'SKILL_TAXONOMY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'config', 'skills.json')
+)
+
+def load_taxonomy(path=TAXONOMY_PATH):
+    """Reads and validates the skill taxonomy file.
+
+    Format: {"version": int, "skills": [{"name", "category", "aliases"}, ...]}.
+    Bump "version" whenever the list or aliases change so historical postings
+    get re-extracted by `python src/backfill.py skills`.
+    """
+    with open(path) as f:
+        taxonomy = json.load(f)
+
+    if not isinstance(taxonomy.get('version'), int):
+        raise ValueError(f"{path}: 'version' must be an integer")
+
+    seen_terms = {}
+    for skill in taxonomy.get('skills', []):
+        name = skill.get('name')
+        if not name or name != name.lower():
+            raise ValueError(f"{path}: skill names must be non-empty and lowercase, got {name!r}")
+        for term in [name] + skill.get('aliases', []):
+            term = term.lower()
+            if term in seen_terms and seen_terms[term] != name:
+                raise ValueError(f"{path}: {term!r} maps to both {seen_terms[term]!r} and {name!r}")
+            seen_terms[term] = name
+
+    if not seen_terms:
+        raise ValueError(f"{path}: taxonomy has no skills")
+
+    return taxonomy
+
+def _trie_regex(terms):
+    """Builds a regex from a prefix trie of `terms` so shared prefixes are only tested once.
+
+    e.g. ['data lake', 'data pipeline', 'databricks'] -> 'data(?:\\ (?:lake|pipeline)|bricks)'
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = {}  # end of a term
+
+    def build(node):
+        ends_here = '' in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not ends_here:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        # Greedy optional branch: 'postgres' + 'ql' is tried before plain 'postgres'
+        return group + '?' if ends_here else group
+
+    return build(trie)
+
+class SkillExtractor:
+    """Finds every known skill in a description in a single pass.
+
+    The whole taxonomy (canonical names and aliases) is compiled once into one
+    trie-shaped regex, so each description is lowercased and scanned once instead
+    of once per skill. Matches have to sit on word boundaries (so 'r' doesn't
+    match inside 'for') and are mapped to their canonical name ('k8s' -> 'kubernetes').
+    """
+
+    def __init__(self, taxonomy):
+        self.version = taxonomy['version']
+        self.categories = {}
+        self.canonical = {}
+
+        for skill in taxonomy['skills']:
+            name = skill['name']
+            self.categories[name] = skill.get('category')
+            for term in [name] + skill.get('aliases', []):
+                self.canonical[term.lower()] = name
+
+        # Lookarounds instead of \b so terms ending in punctuation ('c++') still match
+        self.pattern = re.compile(r'(?<!\w)' + _trie_regex(sorted(self.canonical)) + r'(?!\w)')
+
+    @classmethod
+    def from_file(cls, path=TAXONOMY_PATH):
+        return cls(load_taxonomy(path))
+
+    def extract(self, text):
+        """Returns the set of canonical skill names found in `text`"""
+        if not text:
+            return set()
+        return {self.canonical[match] for match in self.pattern.findall(text.lower())}
+
+_extractor = None
+_extractor_mtime = None
+_extractor_lock = threading.Lock()
+
+def get_skill_extractor(path=TAXONOMY_PATH):
+    """Returns the shared SkillExtractor, recompiling it if the taxonomy file changed.
+
+    Costs one os.stat per call, so the scheduler picks up taxonomy edits on its next
+    batch without a restart. A broken edit is logged and the previous extractor kept.
+    """
+    global _extractor, _extractor_mtime
+
+    mtime = os.stat(path).st_mtime
+    if _extractor is not None and mtime == _extractor_mtime:
+        return _extractor
+
+    with _extractor_lock:
+        if _extractor is None or mtime != _extractor_mtime:
+            try:
+                extractor = SkillExtractor.from_file(path)
+            except (OSError, ValueError) as e:
+                if _extractor is None:
+                    raise
+                logging.error(f"Keeping skill taxonomy v{_extractor.version}, failed to reload {path}: {str(e)}")
+                _extractor_mtime = mtime
+                return _extractor
+
+            if _extractor is not None:
+                logging.info(f"Reloaded skill taxonomy: v{_extractor.version} -> v{extractor.version}")
+            _extractor = extractor
+            _extractor_mtime = mtime
+
+    return _extractor
@@ -0,0 +1,101 @@
+import logging
+from db import connection
+
+# Arbitrary key for pg_advisory_xact_lock: concurrent loads take turns updating the
+# summary rows (and a rebuild waits for them) so they can't deadlock on shared rows
+SUMMARY_LOCK_KEY = 4242002
+
+# (table, key columns, value columns, aggregate over the postings matched by {jobs})
+# Every value is a sum, so a batch can be added (sign=1) or taken back out (sign=-1)
+SUMMARIES = [
+    ('skill_counts', ('skill_id',), ('job_count',), """
+        SELECT skill_id, COUNT(*)
+        FROM job_skills
+        WHERE {jobs}
+        GROUP BY skill_id"""),
+    ('skill_pair_counts', ('skill_id_1', 'skill_id_2'), ('pair_count',), """
+        SELECT js1.skill_id, js2.skill_id, COUNT(*)
+        FROM job_skills AS js1
+        JOIN job_skills AS js2 ON js1.job_id = js2.job_id AND js1.skill_id < js2.skill_id
+        WHERE {jobs}
+        GROUP BY js1.skill_id, js2.skill_id"""),
+    ('title_salary_counts', ('job_title', 'salary_mid'), ('job_count', 'salary_range_sum'), """
+        SELECT job_title, (salary_min + salary_max) / 2, COUNT(*), SUM(salary_max - salary_min)
+        FROM job_postings
+        WHERE {jobs}
+        GROUP BY 1, 2"""),
+    ('company_location_counts', ('company_id', 'location_id'), ('job_count', 'salary_mid_sum'), """
+        SELECT company_id, location_id, COUNT(*), SUM((salary_min + salary_max) / 2)
+        FROM job_postings
+        WHERE {jobs}
+        GROUP BY company_id, location_id"""),
+    ('company_daily_postings', ('posted_date', 'company_id'), ('job_count',), """
+        SELECT posted_date, company_id, COUNT(*)
+        FROM job_postings
+        WHERE {jobs} AND posted_date IS NOT NULL
+        GROUP BY posted_date, company_id"""),
+    ('summary_totals', ('id',), ('jobs_with_skills',), """
+        SELECT TRUE, COUNT(DISTINCT job_id)
+        FROM job_skills
+        WHERE {jobs}"""),
+]
+
+# Column each aggregate filters its postings on
+JOB_ID_COLUMN = {
+    'skill_pair_counts': 'js1.job_id',
+}
+
+def _upsert_sql(table, keys, values, select):
+    columns = ', '.join(keys + values)
+    key_list = ', '.join(keys)
+    return f"""
+        INSERT INTO {table} ({columns})
+        SELECT {key_list}, {', '.join(f'%(sign)s * {value}' for value in values)}
+        FROM ({select}) AS delta ({columns})
+        ORDER BY {key_list}
+        ON CONFLICT ({key_list}) DO UPDATE
+        SET {', '.join(f'{value} = {table}.{value} + EXCLUDED.{value}' for value in values)}
+        RETURNING {key_list}, {table}.{values[0]}"""
+
+def apply_summary_delta(c, job_ids, sign=1):
+    """Adds (sign=1) or removes (sign=-1) a batch of postings from every summary table.
+
+    Runs on the caller's cursor so the summaries commit or roll back together with
+    the change to job_postings/job_skills. Each aggregate only reads the given
+    job_ids (primary-key lookups), so the cost follows the batch size rather than
+    the size of the tables. To change a posting, remove it, update it, add it back.
+    """
+    if not job_ids:
+        return
+
+    job_ids = list(job_ids)
+    c.execute("SELECT pg_advisory_xact_lock(%s)", (SUMMARY_LOCK_KEY,))
+
+    for table, keys, values, select in SUMMARIES:
+        job_filter = f"{JOB_ID_COLUMN.get(table, 'job_id')} = ANY(%(job_ids)s)"
+        c.execute(_upsert_sql(table, keys, values, select.format(jobs=job_filter)),
+                  {'sign': sign, 'job_ids': job_ids})
+
+        # Groups that lost their last posting disappear, so COUNT(*) over them stays right
+        emptied = [row[:len(keys)] for row in c.fetchall() if row[len(keys)] <= 0]
+        if emptied:
+            c.execute(f"DELETE FROM {table} WHERE ({', '.join(keys)}) IN %s", (tuple(emptied),))
+
+def rebuild_summaries():
+    """Recomputes every summary table from scratch in one transaction.
+
+    Only needed if job_postings/job_skills were changed outside the loader and the
+    backfills (manual deletes, ad-hoc SQL), or to verify the incremental updates.
+    """
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute("SELECT pg_advisory_xact_lock(%s)", (SUMMARY_LOCK_KEY,))
+        c.execute(f"TRUNCATE {', '.join(table for table, _, _, _ in SUMMARIES)}")
+
+        for table, keys, values, select in SUMMARIES:
+            c.execute(_upsert_sql(table, keys, values, select.format(jobs='TRUE')), {'sign': 1})
+            logging.info(f"Rebuilt summary table {table}: {c.rowcount} rows")
+
+        c.close()
+
+    print("Summary tables rebuilt")
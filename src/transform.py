@@ -0,0 +1,143 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dedup import fingerprint_job
+from skills import get_skill_extractor
+from checkpoints import posted_at
+
+TRANSFORM_PROCESSES = int(os.getenv('TRANSFORM_PROCESSES', os.cpu_count() or 1))
+# Records per task sent to a worker process; big enough to amortize pickling
+TRANSFORM_CHUNK_SIZE = int(os.getenv('TRANSFORM_CHUNK_SIZE', 100))
+
+# The only raw JSearch fields transform_job() reads - everything else stays out of the pickles
+RAW_FIELDS = (
+    'job_title', 'employer_name', 'job_city', 'job_state', 'job_min_salary', 'job_max_salary',
+    'job_description', 'job_apply_link', 'job_is_remote', 'job_posted_at_timestamp',
+    'job_posted_at_datetime_utc', '_content_hash',
+)
+
+def classify_experience(job_title):
+    """Seniority bucket from the title: 'Entry Level', 'Mid Level' or 'Senior Level'"""
+    if not job_title:
+        return None
+
+    title_lower = job_title.lower()
+    if "junior" in title_lower or "entry" in title_lower:
+        return "Entry Level"
+    elif "senior" in title_lower or "lead" in title_lower:
+        return "Senior Level"
+    return "Mid Level"
+
+def is_remote_job(job_title, job_description, api_flag=None):
+    """Trusts the API's job_is_remote when it sent one, otherwise looks for 'remote' in the text"""
+    if api_flag is not None:
+        return bool(api_flag)
+    return bool(
+        (job_title and "remote" in job_title.lower())
+        or (job_description and "remote" in job_description.lower())
+    )
+
+def transform_job(job, skill_extractor):
+    """Turns one raw JSearch record into a bulk_load_jobs() row in a single pass"""
+    job_title = job.get('job_title')
+    job_description = job.get('job_description')
+    posted = posted_at(job)
+
+    return {
+        # job_title and company_name are NOT NULL too; one posting without them
+        # would otherwise roll back its whole batch
+        'job_title': job_title or 'Unknown',
+        'company_name': job.get('employer_name') or 'Unknown',
+        # locations columns are NOT NULL, remote postings often have no city
+        'city': job.get('job_city') or 'Unknown',
+        'province': job.get('job_state') or 'Unknown',
+        'salary_min': int(job.get('job_min_salary') or 0),
+        'salary_max': int(job.get('job_max_salary') or 0),
+        'posted_date': posted.date() if posted else None,
+        'is_remote': is_remote_job(job_title, job_description, job.get('job_is_remote')),
+        'experience_level': classify_experience(job_title),
+        'job_description': job_description,
+        'job_url': job.get('job_apply_link'),
+        # dedupe_jobs() already hashed it, no need to hash the description twice
+        'content_hash': job.get('_content_hash') or fingerprint_job(job),
+        'skills': skill_extractor.extract(job_description),
+        'skills_version': skill_extractor.version,
+    }
+
+def transform_jobs(jobs):
+    """transform_job() over a batch, picking up taxonomy edits between batches"""
+    skill_extractor = get_skill_extractor()
+    return [transform_job(job, skill_extractor) for job in jobs]
+
+def extract_skills(descriptions):
+    """(taxonomy version, skills) for each description - the skill backfill's unit of work"""
+    skill_extractor = get_skill_extractor()
+    return [(skill_extractor.version, skill_extractor.extract(description)) for description in descriptions]
+
+def _warm_worker(_):
+    get_skill_extractor()
+
+def compact_job(job):
+    return {field: job[field] for field in RAW_FIELDS if field in job}
+
+class TransformEngine:
+    """Fans CPU-bound transforms out across a process pool.
+
+    Work is split into chunks of `chunk_size` records, each chunk is pickled to a
+    worker process, and results come back in input order. Each worker compiles the
+    skill taxonomy once and reuses it for every chunk. Small batches (or
+    processes=1) run inline, where a process round trip would cost more than it saves.
+    """
+
+    def __init__(self, processes=TRANSFORM_PROCESSES, chunk_size=TRANSFORM_CHUNK_SIZE):
+        self.processes = processes
+        self.chunk_size = chunk_size
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            # fork so workers don't re-import the calling script (and everything the
+            # scheduler imports); spawn only where fork isn't available
+            method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context(method)
+            )
+        return self._executor
+
+    def start(self):
+        """Starts the workers and compiles the taxonomy in each one.
+
+        Called on __enter__, i.e. before any pipeline threads exist, so the
+        workers are never forked while another thread holds a lock.
+        """
+        if self.processes > 1:
+            list(self._pool().map(_warm_worker, range(self.processes)))
+        return self
+
+    def map(self, func, items):
+        """func(list) -> list, applied chunk by chunk; returns the concatenated results in order"""
+        items = list(items)
+        if self.processes <= 1 or len(items) <= self.chunk_size:
+            return func(items)
+
+        chunks = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        results = []
+        for chunk_result in self._pool().map(func, chunks):
+            results.extend(chunk_result)
+        return results
+
+    def transform(self, jobs):
+        """transform_jobs() for a batch of raw JSearch records"""
+        return self.map(transform_jobs, [compact_job(job) for job in jobs])
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,80 @@
+import os
+import sys
+import pytest
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+
+# Database tests drop and recreate this database from sql/schema.sql, so it must be
+# a scratch one (DB_USER/DB_HOST/DB_PORT as usual). Without it they are skipped.
+TEST_DB_NAME = os.getenv('TEST_DB_NAME')
+
+@pytest.fixture
+def database(monkeypatch):
+    """A fresh, empty database built from sql/schema.sql; db.py is pointed at it"""
+    if not TEST_DB_NAME:
+        pytest.skip("set TEST_DB_NAME to a scratch database to run the database tests")
+
+    import psycopg2
+    import db
+    import queries
+
+    # A pool left behind by the last test would keep the old database open
+    db.close_pool()
+    admin = psycopg2.connect(dbname='postgres', user=db.DB_USER, host=db.DB_HOST, port=db.DB_PORT)
+    admin.autocommit = True
+    c = admin.cursor()
+    c.execute(f'DROP DATABASE IF EXISTS "{TEST_DB_NAME}"')
+    c.execute(f'CREATE DATABASE "{TEST_DB_NAME}"')
+    admin.close()
+
+    with open(os.path.join(REPO_ROOT, 'sql', 'schema.sql')) as f:
+        schema = f.read().replace('CREATE DATABASE job_market_db;', '')
+    conn = psycopg2.connect(dbname=TEST_DB_NAME, user=db.DB_USER, host=db.DB_HOST, port=db.DB_PORT)
+    with conn:
+        conn.cursor().execute(schema)
+    conn.close()
+
+    monkeypatch.setattr(db, 'DB_NAME', TEST_DB_NAME)
+    # Ids cached from another database would point at the wrong rows
+    monkeypatch.setattr(db, 'dimension_cache', db.DimensionCache())
+    queries.clear_cache()
+    yield
+    db.close_pool()
+
+SKILLS = ['python', 'sql', 'aws', 'docker', 'spark', 'tableau', 'excel', 'java']
+TITLES = ['Data Analyst', 'Senior Data Engineer', 'ML Engineer', 'BI Developer']
+
+@pytest.fixture
+def make_job():
+    """Factory for synthetic bulk_load_jobs() rows; make_job(i) is reproducible"""
+    import random
+    from datetime import date, timedelta
+    from dedup import job_fingerprint
+
+    def make(i, **overrides):
+        rng = random.Random(i)
+        title = rng.choice(TITLES)
+        company = f'Company {i % 7}'
+        city = f'City {i % 3}'
+        salary_min = rng.choice([0, 50000, 60000, 70000, 80001])
+        job = {
+            'job_title': title,
+            'company_name': company,
+            'city': city,
+            'province': 'ON',
+            'salary_min': salary_min,
+            'salary_max': salary_min + rng.choice([0, 10000, 20001]),
+            'posted_date': date.today() - timedelta(days=rng.randint(0, 120)) if i % 5 else None,
+            'is_remote': None if i % 4 == 0 else rng.random() < 0.3,
+            'experience_level': None if i % 6 == 0 else 'Mid Level',
+            'job_description': f'description {i}',
+            'job_url': f'https://jobs.example.com/{i}',
+            'content_hash': job_fingerprint(title, company, city, f'description {i}'),
+            'skills': rng.sample(SKILLS, rng.randint(0, 4)),
+            'skills_version': 1,
+        }
+        job.update(overrides)
+        return job
+
+    return make
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from checkpoints import QueryCheckpoint, posted_at
+
+NOW = datetime(2026, 10, 18, 15, 0, tzinfo=timezone.utc)
+
+def test_posted_at_prefers_the_timestamp():
+    job = {'job_posted_at_timestamp': 1760000000, 'job_posted_at_datetime_utc': '2000-01-01T00:00:00Z'}
+    assert posted_at(job) == datetime.fromtimestamp(1760000000, tz=timezone.utc)
+
+def test_posted_at_parses_the_iso_string():
+    assert posted_at({'job_posted_at_datetime_utc': '2026-10-18T09:30:00.000Z'}) == datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc)
+    assert posted_at({'job_posted_at_datetime_utc': 'yesterday'}) is None
+    assert posted_at({}) is None
+
+@pytest.mark.parametrize('last_success_at, expected', [
+    (None, 'all'),
+    (NOW - timedelta(hours=1), 'today'),
+    (NOW - timedelta(days=1), '3days'),
+    (NOW - timedelta(days=2), '3days'),
+    (NOW - timedelta(days=5), 'week'),
+    (NOW - timedelta(days=20), 'month'),
+    (NOW - timedelta(days=45), 'all'),
+])
+def test_date_posted_window(last_success_at, expected):
+    assert QueryCheckpoint('q', last_success_at=last_success_at).date_posted(now=NOW) == expected
+
+def test_date_posted_compares_utc_days():
+    # 01:00 UTC today is still yesterday evening in Toronto
+    toronto = timezone(timedelta(hours=-4))
+    last_success_at = datetime(2026, 10, 18, 1, 0, tzinfo=timezone.utc).astimezone(toronto)
+    assert QueryCheckpoint('q', last_success_at=last_success_at).date_posted(now=NOW) == 'today'
+
+    last_success_at = datetime(2026, 10, 17, 23, 0, tzinfo=timezone.utc).astimezone(toronto)
+    assert QueryCheckpoint('q', last_success_at=last_success_at).date_posted(now=NOW) == '3days'
+
+def test_only_successful_queries_are_saved(database):
+    from checkpoints import load_checkpoints, save_checkpoints
+
+    checkpoints = load_checkpoints(['ok', 'broken'])
+    assert [checkpoint.last_success_at for checkpoint in checkpoints.values()] == [None, None]
+
+    checkpoints['broken'].failed = True
+    save_checkpoints(checkpoints, completed_at=NOW)
+
+    reloaded = load_checkpoints(['ok', 'broken'])
+    assert reloaded['ok'].last_success_at == NOW
+    assert reloaded['broken'].last_success_at is None
@@ -0,0 +1,82 @@
+import math
+import numpy as np
+import pytest
+from cooccurrence import Cooccurrence
+
+# job -> skills; 4 postings with skills
+POSTINGS = {
+    1: ['python', 'sql'],
+    2: ['python', 'sql', 'aws'],
+    3: ['python'],
+    4: ['aws', 'excel'],
+}
+NAMES = {10: 'python', 20: 'sql', 30: 'aws', 40: 'excel'}
+IDS = {name: skill_id for skill_id, name in NAMES.items()}
+
+@pytest.fixture
+def cooccur():
+    pairs = [(job_id, IDS[skill]) for job_id, skills in POSTINGS.items() for skill in skills]
+    job_ids, skill_ids = (np.array(column) for column in zip(*pairs))
+    return Cooccurrence.from_pairs(job_ids, skill_ids, NAMES)
+
+def brute_force_count(a, b):
+    return sum(1 for skills in POSTINGS.values() if a in skills and b in skills)
+
+def test_counts_match_brute_force(cooccur):
+    assert cooccur.n_jobs == 4
+    for row in cooccur.pairs().itertuples():
+        assert row.pair_count == brute_force_count(row.skill_1, row.skill_2)
+    assert len(cooccur.pairs()) == 4  # python-sql, python-aws, sql-aws, aws-excel
+    assert dict(zip(cooccur.skills, cooccur.skill_counts)) == {'python': 3, 'sql': 2, 'aws': 2, 'excel': 1}
+
+def test_metrics(cooccur):
+    pairs = cooccur.pairs().set_index(['skill_1', 'skill_2'])
+    row = pairs.loc[('python', 'sql')] if ('python', 'sql') in pairs.index else pairs.loc[('sql', 'python')]
+
+    # 2 of 4 postings have both; python is in 3 and sql in 2
+    assert row['pair_count'] == 2
+    assert row['jaccard'] == pytest.approx(2 / (3 + 2 - 2))
+    assert row['lift'] == pytest.approx((2 / 4) / ((3 / 4) * (2 / 4)))
+    assert row['pmi'] == pytest.approx(math.log2(row['lift']))
+
+def test_duplicate_rows_count_once():
+    cooccur = Cooccurrence.from_pairs(np.array([1, 1, 1]), np.array([10, 10, 20]), NAMES)
+    assert list(cooccur.skill_counts) == [1, 1]
+    assert cooccur.pairs()['pair_count'].tolist() == [1]
+
+def test_neighbors(cooccur):
+    neighbors = cooccur.neighbors('aws', metric='pair_count')
+    assert set(neighbors['skill']) == {'python', 'sql', 'excel'}
+    assert 'aws' not in set(neighbors['skill'])
+    assert neighbors.set_index('skill').loc['excel', 'confidence'] == pytest.approx(0.5)
+
+    assert cooccur.neighbors('aws', min_count=2).empty
+    with pytest.raises(KeyError):
+        cooccur.neighbors('cobol')
+
+def test_top_pairs_ranking(cooccur):
+    assert cooccur.top_pairs(1, metric='lift').iloc[0][['skill_1', 'skill_2']].tolist() in (['aws', 'excel'], ['excel', 'aws'])
+    assert cooccur.top_pairs(10, min_count=2)['pair_count'].tolist() == [2]
+    with pytest.raises(ValueError):
+        cooccur.top_pairs(metric='support')
+
+def test_matrix(cooccur):
+    counts = cooccur.matrix(top_n=2)
+    assert list(counts.index) == ['python', 'sql'] or list(counts.index) == ['python', 'aws']
+    assert counts.loc['python', 'python'] == 3
+
+    lift = cooccur.matrix(top_n=4, metric='lift')
+    assert np.isnan(lift.loc['python', 'python'])
+    assert np.isnan(lift.loc['python', 'excel'])  # never together
+    assert lift.loc['aws', 'excel'] == pytest.approx(lift.loc['excel', 'aws'])
+
+def test_no_pairs():
+    cooccur = Cooccurrence.from_pairs(np.array([1, 2]), np.array([10, 20]), NAMES)
+    assert cooccur.n_jobs == 2
+    assert cooccur.pairs().empty
+
+def test_empty():
+    cooccur = Cooccurrence.from_pairs(np.array([], dtype=np.int64), np.array([], dtype=np.int64), {})
+    assert cooccur.n_jobs == 0
+    assert cooccur.pairs().empty
+    assert cooccur.matrix().shape == (0, 0)
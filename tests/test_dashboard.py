@@ -0,0 +1,56 @@
+import os
+import pytest
+import db
+import cooccurrence
+import dashboard_data
+from conftest import REPO_ROOT
+from queries import run_queries
+from results_store import ResultsStore
+
+AppTest = pytest.importorskip('streamlit.testing.v1').AppTest
+st = pytest.importorskip('streamlit')
+
+PAGES = ["Overview", "Skills Analysis", "Company Analysis", "Skill Relationships"]
+
+@pytest.fixture
+def dashboard(database, tmp_path, monkeypatch):
+    """Runs dashboard.py against the test database and a snapshot of it in tmp_path"""
+    def load_and_snapshot(jobs):
+        db.bulk_load_jobs(jobs)
+        store = ResultsStore(root=str(tmp_path / 'snapshots'))
+        store.write(run_queries(refresh=True))
+        monkeypatch.setattr(dashboard_data, 'get_results_store', lambda: store)
+        monkeypatch.setattr(cooccurrence, '_cached', None)
+        st.cache_data.clear()
+        st.cache_resource.clear()
+
+        app = AppTest.from_file(os.path.join(REPO_ROOT, 'dashboard.py'), default_timeout=60)
+        return app.run()
+
+    return load_and_snapshot
+
+def test_every_page_renders(dashboard, make_job):
+    app = dashboard([make_job(i) for i in range(60)])
+    assert not app.exception
+
+    for page in PAGES:
+        app.sidebar.radio[0].set_value(page).run()
+        assert not app.exception, page
+
+def test_filters_switch_to_live_queries(dashboard, make_job):
+    app = dashboard([make_job(i) for i in range(60)])
+
+    app.sidebar.selectbox[0].set_value('ON').run()
+    app.sidebar.selectbox[1].set_value('City 1').run()
+    assert not app.exception
+
+    app.sidebar.selectbox[3].set_value('Senior Level').run()
+    assert not app.exception
+    assert [warning.value for warning in app.warning] == ["No job postings match the selected filters."]
+
+def test_skill_relationships_without_pairs(dashboard, make_job):
+    app = dashboard([make_job(i, skills=['python']) for i in range(5)])
+
+    app.sidebar.radio[0].set_value("Skill Relationships").run()
+    assert not app.exception
+    assert [warning.value for warning in app.warning] == ["No two skills have appeared in the same job posting yet."]
@@ -0,0 +1,244 @@
+import threading
+from datetime import date, timedelta
+import psycopg2
+import pytest
+import db
+from backfill import backfill_content_hashes
+from cooccurrence import _fingerprint
+from dedup import dedupe_jobs, job_fingerprint
+from summaries import SUMMARIES, rebuild_summaries
+
+def summary_contents():
+    """Every summary table's rows, sorted, with zero-count rows left out"""
+    contents = {}
+    with db.connection() as conn:
+        c = conn.cursor()
+        for table, keys, values, _ in SUMMARIES:
+            c.execute(f"SELECT {', '.join(keys + values)} FROM {table} WHERE {values[0]} <> 0 ORDER BY {', '.join(keys)}")
+            contents[table] = c.fetchall()
+        c.close()
+    return contents
+
+def fetch_all(sql, params=()):
+    with db.connection() as conn:
+        c = conn.cursor()
+        c.execute(sql, params)
+        rows = c.fetchall()
+        c.close()
+    return rows
+
+def raw_record(job, **overrides):
+    """The JSearch record a make_job() row would have been transformed from"""
+    record = {
+        'job_title': job['job_title'],
+        'employer_name': job['company_name'],
+        'job_city': job['city'],
+        'job_state': job['province'],
+        'job_description': job['job_description'],
+        'job_apply_link': job['job_url'],
+    }
+    record.update(overrides)
+    return record
+
+def test_bulk_load_writes_the_whole_batch(database, make_job):
+    jobs = [make_job(i, skills=['python', 'sql'] if i % 2 else []) for i in range(10)]
+    job_ids = db.bulk_load_jobs(jobs)
+
+    assert len(job_ids) == 10
+    stored = dict(fetch_all("SELECT job_url, job_id FROM job_postings"))
+    assert job_ids == [stored[job['job_url']] for job in jobs]
+    assert fetch_all("SELECT COUNT(*) FROM job_skills") == [(10,)]
+    # Dimensions are shared, not repeated per posting
+    assert fetch_all("SELECT COUNT(*) FROM companies") == [(7,)]
+    assert fetch_all("SELECT COUNT(*) FROM locations") == [(3,)]
+    assert fetch_all("SELECT COUNT(*) FROM skills") == [(2,)]
+
+def test_bulk_load_is_all_or_nothing(database, make_job):
+    jobs = [make_job(1), make_job(2, job_title=None)]
+    with pytest.raises(psycopg2.IntegrityError):
+        db.bulk_load_jobs(jobs)
+
+    assert fetch_all("SELECT COUNT(*) FROM job_postings") == [(0,)]
+    assert fetch_all("SELECT COUNT(*) FROM companies") == [(0,)]
+
+def test_dedupe_drops_stored_and_repeated_postings(database, make_job):
+    db.bulk_load_jobs([make_job(1)])
+
+    new_jobs, duplicates = dedupe_jobs([raw_record(make_job(i)) for i in (1, 2, 2, 3)])
+
+    assert [job['job_apply_link'] for job in new_jobs] == ['https://jobs.example.com/2', 'https://jobs.example.com/3']
+    assert duplicates == 2
+
+def test_dedupe_catches_postings_without_an_apply_link(database, make_job):
+    db.bulk_load_jobs([make_job(1, job_url=None)])
+
+    # The same posting again, reformatted, and a genuinely new one
+    repost = raw_record(make_job(1), job_apply_link=None, job_description='  DESCRIPTION\n 1 ')
+    new = raw_record(make_job(2), job_apply_link=None)
+    new_jobs, duplicates = dedupe_jobs([repost, new])
+
+    assert [job['job_description'] for job in new_jobs] == ['description 2']
+    assert duplicates == 1
+
+def test_postings_committed_after_dedupe_are_skipped(database, make_job):
+    first = db.bulk_load_jobs([make_job(1), make_job(2)])
+    again = db.bulk_load_jobs([make_job(2), make_job(3)])
+
+    assert len(first) == 2
+    assert again == [fetch_all("SELECT job_id FROM job_postings WHERE job_url = %s", ('https://jobs.example.com/3',))[0][0]]
+    assert fetch_all("SELECT COUNT(*) FROM job_postings") == [(3,)]
+
+def test_update_job_attributes_fills_missing_columns(database, make_job):
+    stored_date = date(2026, 1, 2)
+    [job_id] = db.bulk_load_jobs([make_job(1, experience_level=None, is_remote=None, posted_date=stored_date)])
+
+    db.update_job_attributes([(job_id, 'Senior Level', True, None)])
+
+    assert fetch_all("SELECT experience_level, is_remote, posted_date FROM job_postings WHERE job_id = %s", (job_id,)) == \
+        [('Senior Level', True, stored_date)]
+
+def test_update_job_attributes_keeps_stored_values(database, make_job):
+    stored_date = date(2026, 1, 2)
+    [job_id] = db.bulk_load_jobs([make_job(1, experience_level='Entry Level', is_remote=None, posted_date=stored_date)])
+
+    db.update_job_attributes([(job_id, 'Senior Level', True, date(2026, 5, 5))])
+
+    assert fetch_all("SELECT experience_level, is_remote, posted_date FROM job_postings WHERE job_id = %s", (job_id,)) == \
+        [('Entry Level', True, stored_date)]
+
+def test_unclassified_postings_are_not_selected_again(database, make_job):
+    job_ids = db.bulk_load_jobs([make_job(i, experience_level=None, is_remote=None, posted_date=None) for i in range(3)])
+    dated_urls = ['https://jobs.example.com/0']
+
+    assert [row[0] for row in db.fetch_unclassified_jobs(0, 10, dated_urls)] == job_ids
+    db.update_job_attributes([(job_id, 'Mid Level', False, date(2026, 1, 1) if i == 0 else None) for i, job_id in enumerate(job_ids)])
+
+    # Posted dates that nothing can fill in don't bring postings back
+    assert db.fetch_unclassified_jobs(0, 10, dated_urls) == []
+
+def test_incremental_summaries_match_a_rebuild(database, make_job):
+    job_ids = []
+    for batch in range(5):
+        job_ids += db.bulk_load_jobs([make_job(batch * 100 + i) for i in range(100)])
+    assert len(job_ids) == 500
+
+    # The skill backfill and the attribute backfill both move postings between summary rows
+    db.replace_job_skills({job_id: {'python', 'spark', 'excel'} for job_id in job_ids[:80]}, 2)
+    db.replace_job_skills({job_id: set() for job_id in job_ids[80:100]}, 2)
+    undated = [row[0] for row in fetch_all("SELECT job_id FROM job_postings WHERE posted_date IS NULL")]
+    db.update_job_attributes([(job_id, 'Senior Level', True, date.today() - timedelta(days=3)) for job_id in undated])
+
+    incremental = summary_contents()
+    rebuild_summaries()
+    assert summary_contents() == incremental
+    assert incremental['skill_counts']
+
+def test_cooccurrence_fingerprint_sees_a_skill_moving(database, make_job):
+    [job_id] = db.bulk_load_jobs([make_job(1, skills=['python', 'sql'])])
+    db.bulk_load_jobs([make_job(2, skills=['aws'])])
+
+    def fingerprint():
+        with db.connection() as conn:
+            return _fingerprint(conn.cursor())
+
+    before = fingerprint()
+    # Same number of postings with skills and of job_skills rows, different pairs
+    db.replace_job_skills({job_id: {'python', 'java'}}, 2)
+    assert fingerprint() != before
+
+def run_concurrently(*funcs):
+    """Runs each func on its own thread; returns the exceptions raised"""
+    errors = []
+
+    def run(func):
+        try:
+            func()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(func,)) for func in funcs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+def test_concurrent_overlapping_loads_do_not_deadlock(database, make_job):
+    # Every loader shares half its postings, and all of the new companies, with the next one
+    def load(offset):
+        for round_ in range(5):
+            start = round_ * 40 + offset * 10
+            db.bulk_load_jobs([make_job(i) for i in range(start, start + 20)])
+
+    assert run_concurrently(*(lambda offset=offset: load(offset) for offset in range(4))) == []
+    assert fetch_all("SELECT COUNT(*) FROM job_postings") == [(len({
+        i for offset in range(4) for round_ in range(5)
+        for i in range(round_ * 40 + offset * 10, round_ * 40 + offset * 10 + 20)
+    }),)]
+
+def test_skill_backfill_and_loads_do_not_deadlock(database, make_job):
+    job_ids = db.bulk_load_jobs([make_job(i) for i in range(20)])
+
+    # Both sides add the same brand-new skills
+    backfills = [lambda n=n: db.replace_job_skills({job_id: {f'new skill {k}' for k in range(n, n + 5)} for job_id in job_ids}, 2)
+                 for n in range(3)]
+    loads = [lambda n=n: db.bulk_load_jobs([make_job(100 + n * 10 + i, skills=[f'new skill {k}' for k in range(5)]) for i in range(10)])
+             for n in range(3)]
+
+    assert run_concurrently(*backfills, *loads) == []
+
+def test_cold_dimension_cache_warms_on_the_load_connection(database, make_job, monkeypatch):
+    db.bulk_load_jobs([make_job(1)])
+    monkeypatch.setattr(db, 'dimension_cache', db.DimensionCache())
+    monkeypatch.setattr(db, '_pool', db.ConnectionPool(minconn=1, maxconn=1, timeout=2))
+
+    # Warming used to check out a second connection while the load held the only one
+    assert len(db.bulk_load_jobs([make_job(1), make_job(2)])) == 1
+    assert db.dimension_cache.get_company('Company 1') is not None
+
+def test_upsert_jobs_overwrites_stored_postings(database, make_job):
+    [stored_id] = db.bulk_load_jobs([make_job(1, skills=['python'], salary_min=0, salary_max=0, is_remote=True)])
+    db.bulk_load_jobs([make_job(2)])
+
+    # A parser fix: same posting, new salary and skills; plus one new posting and a stored url under other content
+    job_ids = db.upsert_jobs([
+        make_job(1, skills=['sql', 'aws'], salary_min=90000, salary_max=110000, is_remote=None),
+        make_job(3),
+        make_job(4, job_url='https://jobs.example.com/2'),
+    ])
+
+    assert len(job_ids) == 2 and job_ids[0] == stored_id
+    assert fetch_all("SELECT salary_min, salary_max, is_remote FROM job_postings WHERE job_id = %s", (stored_id,)) == \
+        [(90000, 110000, True)]
+    assert {row[0] for row in fetch_all(
+        "SELECT s.skill_name FROM job_skills js JOIN skills s ON s.skill_id = js.skill_id WHERE js.job_id = %s", (stored_id,)
+    )} == {'sql', 'aws'}
+    assert fetch_all("SELECT COUNT(*) FROM job_postings") == [(3,)]
+
+    incremental = summary_contents()
+    rebuild_summaries()
+    assert summary_contents() == incremental
+
+def test_content_hash_backfill_matches_the_python_fingerprint(database, make_job):
+    jobs = [
+        make_job(1, job_title='Analyste de données', job_description='Ärger\xa0mit  SQL'),
+        make_job(2, job_title='ANALYSTE DE DONNÉES', company_name='Company 1', city='City 1',
+                 job_description='ärger mit sql'),
+        make_job(3),
+    ]
+    job_ids = db.bulk_load_jobs(jobs)
+    # What a locale-dependent SQL backfill left behind
+    with db.connection() as conn:
+        conn.cursor().execute("UPDATE job_postings SET content_hash = md5(job_id::text) || md5(job_url)")
+
+    backfill_content_hashes(batch_size=2)
+
+    # 1 and 2 are the same posting once normalized: the older one is kept
+    assert fetch_all("SELECT job_id, content_hash FROM job_postings ORDER BY job_id") == [
+        (job_ids[0], job_fingerprint(jobs[0]['job_title'], jobs[0]['company_name'], jobs[0]['city'], jobs[0]['job_description'])),
+        (job_ids[2], job_fingerprint(jobs[2]['job_title'], jobs[2]['company_name'], jobs[2]['city'], jobs[2]['job_description'])),
+    ]
+    incremental = summary_contents()
+    rebuild_summaries()
+    assert summary_contents() == incremental
+    assert backfill_content_hashes() == 0
@@ -0,0 +1,17 @@
+import db
+import explain_check
+from queries import REGISTRY
+
+def test_checks_name_registered_queries_and_real_indexes(database):
+    with db.connection() as conn:
+        c = conn.cursor()
+        for name, params, indexes in explain_check.CHECKS:
+            assert name in REGISTRY
+            for index in indexes:
+                assert explain_check.estimated_rows(c, index) is not None, index
+
+def test_small_tables_are_skipped_not_failed(database, make_job, capsys):
+    db.bulk_load_jobs([make_job(i) for i in range(20)])
+
+    assert explain_check.check_all()
+    assert f"0/{len(explain_check.CHECKS)} checks use their indexes, {len(explain_check.CHECKS)} skipped" in capsys.readouterr().out
@@ -0,0 +1,131 @@
+import time
+from datetime import datetime, timezone
+import pytest
+import jsearch
+from checkpoints import QueryCheckpoint
+from jsearch import BACKOFF_MAX, JSearchClient, TokenBucket, backoff_delay, chunked
+
+def test_token_bucket_allows_a_burst_then_paces():
+    bucket = TokenBucket(rate=50, capacity=3)
+
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.05
+
+    for _ in range(5):
+        bucket.acquire()
+    # 5 more tokens at 50/s take about 0.1s
+    assert time.monotonic() - start >= 0.08
+
+def test_backoff_grows_with_jitter_and_is_capped():
+    for attempt in range(8):
+        delay = backoff_delay(attempt)
+        ceiling = min(BACKOFF_MAX, jsearch.BACKOFF_BASE * 2 ** attempt)
+        assert ceiling / 2 <= delay <= ceiling
+    assert backoff_delay(50) <= BACKOFF_MAX
+
+def test_backoff_honours_retry_after():
+    assert backoff_delay(0, retry_after='7') == 7
+    assert backoff_delay(0, retry_after='3600') == BACKOFF_MAX
+    # Unparseable (e.g. an HTTP date) falls back to exponential backoff
+    assert backoff_delay(0, retry_after='Wed, 21 Oct 2015 07:28:00 GMT') <= jsearch.BACKOFF_BASE
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 3)) == []
+
+class FakeResponse:
+    def __init__(self, data, status_code=200, headers=None):
+        self.data = data
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'data': self.data}
+
+class FakeCache:
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, query, page, params):
+        return self.entries.get((query, page, tuple(sorted(params.items()))))
+
+    def put(self, query, page, params, body):
+        self.entries[(query, page, tuple(sorted(params.items())))] = body
+
+def stub_client(responses, **kwargs):
+    """JSearchClient whose session answers each call with the next of `responses` (FakeResponses or job lists)"""
+    client = JSearchClient(api_key='test', rate_limit=1000, burst=1000, **kwargs)
+    calls = []
+
+    def get(url, params, timeout):
+        calls.append(params)
+        response = responses[len(calls) - 1] if len(calls) <= len(responses) else []
+        return response if isinstance(response, FakeResponse) else FakeResponse(response)
+
+    client.session.get = get
+    return client, calls
+
+def test_rate_limited_request_is_retried():
+    client, calls = stub_client([FakeResponse([], status_code=429, headers={'Retry-After': '0'}), [{'job_id': 'a'}]])
+
+    assert client.search('analyst') == [{'job_id': 'a'}]
+    assert len(calls) == 2
+
+def test_repeated_request_is_answered_from_the_cache():
+    cache = FakeCache()
+    client, calls = stub_client([[{'job_id': 'a'}], [{'job_id': 'b'}]], cache=cache)
+
+    assert client.search('analyst', date_posted='today') == [{'job_id': 'a'}]
+    assert client.search('analyst', date_posted='today') == [{'job_id': 'a'}]
+    assert len(calls) == 1
+
+def test_write_only_cache_always_calls_the_api():
+    cache = FakeCache()
+    client, calls = stub_client([[{'job_id': 'a'}], [{'job_id': 'b'}]], cache=cache, read_cache=False)
+
+    assert client.search('analyst', date_posted='today') == [{'job_id': 'a'}]
+    assert client.search('analyst', date_posted='today') == [{'job_id': 'b'}]
+    assert len(calls) == 2
+    # Still stored for replay/backfill
+    assert len(cache.entries) == 1
+
+def job(job_id, timestamp=None):
+    return {'job_id': job_id, 'job_posted_at_timestamp': timestamp}
+
+def test_paging_stops_at_a_short_page():
+    full_page = [job(f'a{i}') for i in range(jsearch.JSEARCH_PAGE_SIZE)]
+    client, calls = stub_client([full_page, [job('b')], [job('never fetched')]])
+
+    assert len(client.fetch_all(['analyst'], max_pages=5)) == jsearch.JSEARCH_PAGE_SIZE + 1
+    assert [params['page'] for params in calls] == [1, 2]
+
+def test_stream_keeps_postings_older_than_the_last_run():
+    # Results aren't in date order: page 1 is all older than the last run, page 2 has a new one
+    page_1 = [job(f'old{i}', 100 + i) for i in range(jsearch.JSEARCH_PAGE_SIZE)]
+    page_2 = [job('new', 900)]
+    client, calls = stub_client([page_1, page_2])
+
+    checkpoint = QueryCheckpoint('analyst', last_success_at=datetime.now(timezone.utc))
+    jobs = list(client.stream_jobs(['analyst'], max_pages=3, checkpoints={'analyst': checkpoint}))
+
+    assert {j['job_id'] for j in jobs} == {j['job_id'] for j in page_1 + page_2}
+    assert calls[0]['date_posted'] == 'today'
+
+def test_a_failing_query_is_skipped_unless_all_fail():
+    client, _ = stub_client([])
+
+    def search(query, **kwargs):
+        if query == 'broken':
+            raise RuntimeError("boom")
+        return [{'job_id': query}]
+
+    client.search = search
+    assert [j['job_id'] for j in client.fetch_all(['ok', 'broken'])] == ['ok']
+
+    with pytest.raises(RuntimeError, match="All 1 JSearch queries failed"):
+        client.fetch_all(['broken'])
@@ -0,0 +1,71 @@
+import threading
+import time
+import pytest
+from pipeline import Pipeline, PipelineError, Stage
+
+def test_runs_every_item_through_every_stage():
+    pipeline = Pipeline([
+        Stage('double', lambda x: x * 2, workers=3),
+        Stage('wrap', lambda x: [x], workers=2),
+    ], queue_size=2)
+
+    results = pipeline.run(range(50))
+
+    assert sorted(value for batch in results for value in batch) == [x * 2 for x in range(50)]
+    assert pipeline.timings['double']['items'] == 50
+
+def test_empty_results_are_not_passed_on():
+    seen = []
+    pipeline = Pipeline([
+        Stage('filter', lambda x: [x] if x % 2 else []),
+        Stage('collect', lambda batch: seen.extend(batch)),
+    ])
+
+    assert pipeline.run(range(10)) == []
+    assert sorted(seen) == [1, 3, 5, 7, 9]
+
+def test_stage_error_stops_the_run_and_closes_the_source():
+    closed = threading.Event()
+
+    def source():
+        try:
+            for i in range(10_000):
+                yield i
+        finally:
+            closed.set()
+
+    def explode(x):
+        if x == 3:
+            raise ValueError("bad item")
+        return x
+
+    with pytest.raises(PipelineError, match="Stage explode failed: bad item") as error:
+        Pipeline([Stage('explode', explode)], queue_size=1).run(source())
+
+    assert isinstance(error.value.__cause__, ValueError)
+    assert closed.is_set()
+
+def test_source_error_is_reported_as_the_source_stage():
+    def source():
+        yield 1
+        raise RuntimeError("api down")
+
+    with pytest.raises(PipelineError, match="Stage fetch failed: api down"):
+        Pipeline([Stage('noop', lambda x: x)]).run(source(), source_name='fetch')
+
+def test_a_failure_does_not_leave_threads_behind():
+    def slow(x):
+        time.sleep(0.01)
+        return x
+
+    def explode(x):
+        raise ValueError("stop")
+
+    before = threading.active_count()
+    with pytest.raises(PipelineError):
+        Pipeline([Stage('slow', slow, workers=2), Stage('explode', explode)], queue_size=1).run(range(1000))
+    assert threading.active_count() == before
+
+def test_stage_needs_a_worker():
+    with pytest.raises(ValueError):
+        Stage('none', lambda x: x, workers=0)
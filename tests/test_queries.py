@@ -0,0 +1,84 @@
+from contextlib import contextmanager
+import os
+import pandas as pd
+import pytest
+import queries
+
+@pytest.fixture
+def runs(monkeypatch):
+    """Stands in for the database: every run_query() that reaches it is recorded"""
+    calls = []
+
+    @contextmanager
+    def connection():
+        yield None
+
+    def read_sql(sql, conn, params):
+        calls.append(params['limit'])
+        return [f'run {len(calls)}']
+
+    monkeypatch.setattr(queries, 'connection', connection)
+    monkeypatch.setattr(queries.pd, 'read_sql', read_sql)
+    monkeypatch.setattr(queries, '_cache', queries.OrderedDict())
+    return calls
+
+def test_repeated_query_is_served_from_the_cache(runs):
+    assert queries.run_query('top_skills', limit=5) == queries.run_query('top_skills', limit=5)
+    assert runs == [5]
+
+def test_uncached_runs_leave_the_cache_alone(runs):
+    first = queries.run_query('top_skills', limit=5)
+    assert queries.run_query('top_skills', cache=False, limit=5) != first
+    assert queries.run_query('top_skills', cache=False, limit=6) is not None
+    assert list(queries._cache) == [('top_skills', (('limit', 5),))]
+
+def test_cache_keeps_the_most_recently_used_entries(runs, monkeypatch):
+    monkeypatch.setattr(queries, 'QUERY_CACHE_SIZE', 2)
+    for limit in (1, 2, 1, 3):
+        queries.run_query('top_skills', limit=limit)
+
+    assert [dict(key[1])['limit'] for key in queries._cache] == [1, 3]
+
+def test_expired_entries_are_dropped(runs, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(queries.time, 'monotonic', lambda: clock[0])
+    queries.run_query('top_skills', limit=1)
+    queries.run_query('top_skills', limit=2)
+
+    clock[0] += queries.QUERY_CACHE_TTL
+    queries.run_query('top_skills', limit=2)
+    assert runs == [1, 2, 2]
+    assert [dict(key[1])['limit'] for key in queries._cache] == [2]
+
+def test_unset_filters_are_left_out_of_the_sql():
+    params = queries.get_query('filtered_top_companies').bind({'city': 'Toronto', 'is_remote': False})
+    sql = queries.query_sql('filtered_top_companies', params)
+
+    assert 'l.city = %(city)s' in sql
+    assert 'jp.is_remote = %(is_remote)s' in sql
+    for param in ('province', 'experience_level', 'date_from', 'date_to'):
+        assert f'%({param})s' not in sql
+    # min_jobs isn't a filter, so its condition always stays
+    assert '%(min_jobs)s' in sql
+
+def test_sql_stays_valid_without_the_last_filter():
+    params = queries.get_query('filtered_top_skills').bind({'province': 'ON'})
+    sql = queries.query_sql('filtered_top_skills', params)
+
+    assert 'jp.posted_date' not in sql
+    assert sql.count('(') == sql.count(')')
+
+def test_csv_exports_are_replaced_whole_and_only_when_changed(tmp_path, monkeypatch):
+    monkeypatch.setattr(queries, 'RESULTS_DIR', str(tmp_path))
+    path = tmp_path / queries.REGISTRY['top_skills'].output
+
+    queries.write_csvs({'top_skills': pd.DataFrame({'skill_name': ['sql'], 'job_count': [3]})})
+    assert path.read_text() == 'skill_name,job_count\nsql,3\n'
+
+    os.utime(path, (0, 0))
+    queries.write_csvs({'top_skills': pd.DataFrame({'skill_name': ['sql'], 'job_count': [3]})})
+    assert path.stat().st_mtime == 0
+
+    queries.write_csvs({'top_skills': pd.DataFrame({'skill_name': ['sql'], 'job_count': [4]})})
+    assert path.read_text() == 'skill_name,job_count\nsql,4\n'
+    assert os.listdir(tmp_path) == [path.name]
@@ -0,0 +1,68 @@
+import threading
+import time
+import psycopg2
+import pytest
+import db
+import query_runner
+from query_runner import run_in_snapshot
+
+def count_companies(delay=0):
+    def task(conn):
+        time.sleep(delay)
+        c = conn.cursor()
+        c.execute("SELECT COUNT(*) FROM companies")
+        return c.fetchone()[0]
+    return task
+
+def test_every_task_sees_the_same_snapshot(database):
+    def insert_company():
+        time.sleep(0.3)
+        with db.connection() as conn:
+            conn.cursor().execute("INSERT INTO companies (company_name) VALUES ('Committed Midway')")
+
+    writer = threading.Thread(target=insert_company)
+    writer.start()
+    results = run_in_snapshot({'early': count_companies(), 'late': count_companies(delay=1)}, workers=2)
+    writer.join()
+
+    assert results == {'early': 0, 'late': 0}
+    with db.connection() as conn:
+        assert count_companies()(conn) == 1
+
+def test_tasks_run_concurrently(database):
+    def sleep(conn):
+        conn.cursor().execute("SELECT pg_sleep(0.5)")
+
+    start = time.perf_counter()
+    run_in_snapshot({f'sleep_{i}': sleep for i in range(3)}, workers=3)
+    assert time.perf_counter() - start < 1.2
+
+def test_statement_timeout_fails_the_run_after_the_other_tasks(database):
+    finished = []
+
+    def fast(conn):
+        finished.append('fast')
+
+    with pytest.raises(psycopg2.errors.QueryCanceled):
+        run_in_snapshot({'slow': lambda conn: conn.cursor().execute("SELECT pg_sleep(3)"), 'fast': fast},
+                        statement_timeout_ms=300)
+    assert finished == ['fast']
+
+def test_one_connection_pool(database, monkeypatch):
+    monkeypatch.setattr(query_runner, 'DB_POOL_MAX', 1)
+    monkeypatch.setattr(db, '_pool', db.ConnectionPool(minconn=1, maxconn=1, timeout=2))
+
+    ran = []
+
+    def fail(conn):
+        conn.cursor().execute("SELECT 1 / 0")
+
+    def last(conn):
+        ran.append(count_companies()(conn))
+
+    # A failing task doesn't abort the shared transaction for the tasks after it
+    with pytest.raises(psycopg2.errors.DivisionByZero):
+        run_in_snapshot({'first': count_companies(), 'broken': fail, 'last': last})
+    assert ran == [0]
+
+    assert run_in_snapshot({'a': count_companies(), 'b': count_companies()}) == {'a': 0, 'b': 0}
@@ -0,0 +1,108 @@
+import importlib
+import logging
+from datetime import datetime, timedelta
+import pytest
+from skills import SkillExtractor
+
+NOW = datetime(2026, 10, 18, 14, 37, 12)
+HOUR = timedelta(hours=1)
+
+@pytest.fixture(scope='module')
+def scheduler(tmp_path_factory):
+    """scheduler imported from a scratch directory, since it creates logs/ and a log handler on import"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(tmp_path_factory.mktemp('scheduler'))
+        module = importlib.import_module('scheduler')
+    yield module
+    logging.getLogger().removeHandler(module.handler)
+    module.handler.close()
+
+@pytest.fixture
+def ledger(scheduler, monkeypatch):
+    """Stands in for etl_runs: set ledger['success'] / ledger['attempt'] per test"""
+    state = {'success': None, 'attempt': None}
+    monkeypatch.setattr(scheduler, 'last_success', lambda job_name: state['success'])
+    monkeypatch.setattr(scheduler, 'last_attempt', lambda job_name: state['attempt'])
+    return state
+
+def test_fetch_slot(scheduler, monkeypatch):
+    assert scheduler.fetch_slot(NOW) == datetime(2026, 10, 18, 14, 0)
+    monkeypatch.setattr(scheduler, 'FETCH_INTERVAL_MINUTES', 15)
+    assert scheduler.fetch_slot(NOW) == datetime(2026, 10, 18, 14, 30)
+    assert scheduler.fetch_slot(datetime(2026, 10, 18, 14, 30)) == datetime(2026, 10, 18, 14, 30)
+
+def test_analytics_slot(scheduler, monkeypatch):
+    monkeypatch.setattr(scheduler, 'ANALYTICS_AT', '06:00')
+    assert scheduler.analytics_slot(NOW) == datetime(2026, 10, 18, 6, 0)
+    assert scheduler.analytics_slot(datetime(2026, 10, 18, 5, 59)) == datetime(2026, 10, 17, 6, 0)
+    assert scheduler.analytics_slot(datetime(2026, 10, 18, 6, 0)) == datetime(2026, 10, 18, 6, 0)
+
+def test_first_run_is_scheduled(scheduler, ledger):
+    assert scheduler.due_slot('fetch', scheduler.fetch_slot, HOUR, NOW) == (datetime(2026, 10, 18, 14, 0), 'schedule')
+
+def test_nothing_due_once_the_slot_succeeded(scheduler, ledger):
+    ledger['success'] = datetime(2026, 10, 18, 14, 0)
+    assert scheduler.due_slot('fetch', scheduler.fetch_slot, HOUR, NOW) is None
+
+def test_next_slot_is_scheduled(scheduler, ledger):
+    ledger['success'] = datetime(2026, 10, 18, 13, 0)
+    assert scheduler.due_slot('fetch', scheduler.fetch_slot, HOUR, NOW) == (datetime(2026, 10, 18, 14, 0), 'schedule')
+
+def test_missed_slots_collapse_into_one_catchup(scheduler, ledger):
+    ledger['success'] = datetime(2026, 10, 18, 9, 0)
+    assert scheduler.due_slot('fetch', scheduler.fetch_slot, HOUR, NOW) == (datetime(2026, 10, 18, 14, 0), 'catchup')
+
+def test_failed_slot_waits_before_retrying(scheduler, ledger, monkeypatch):
+    monkeypatch.setattr(scheduler, 'ETL_RETRY_MINUTES', 15)
+    ledger['success'] = datetime(2026, 10, 18, 13, 0)
+    slot = datetime(2026, 10, 18, 14, 0)
+
+    ledger['attempt'] = (slot, 'failed', NOW - timedelta(minutes=5))
+    assert scheduler.due_slot('fetch', scheduler.fetch_slot, HOUR, NOW) is None
+
+    ledger['attempt'] = (slot, 'failed', NOW - timedelta(minutes=20))
+    assert scheduler.due_slot('fetch', scheduler.fetch_slot, HOUR, NOW) == (slot, 'schedule')
+
+def test_failure_in_an_earlier_slot_does_not_hold_back_the_new_one(scheduler, ledger):
+    ledger['success'] = datetime(2026, 10, 18, 13, 0)
+    ledger['attempt'] = (datetime(2026, 10, 18, 13, 0), 'failed', NOW - timedelta(minutes=1))
+    assert scheduler.due_slot('fetch', scheduler.fetch_slot, HOUR, NOW) == (datetime(2026, 10, 18, 14, 0), 'schedule')
+
+def test_run_due_jobs_stops_when_the_lock_is_busy(scheduler, monkeypatch):
+    calls = []
+
+    def execute(job_name, func, scheduled_for, trigger):
+        calls.append(job_name)
+        raise scheduler.EtlLockBusy()
+
+    monkeypatch.setattr(scheduler, 'due_slot', lambda job_name, slot_for, period, now: (now, 'schedule'))
+    monkeypatch.setattr(scheduler, 'execute', execute)
+
+    assert scheduler.run_due_jobs(NOW) == []
+    assert calls == ['fetch']
+
+def test_run_due_jobs_carries_on_after_a_failure(scheduler, monkeypatch):
+    def execute(job_name, func, scheduled_for, trigger):
+        if job_name == 'fetch':
+            raise RuntimeError("api down")
+        return 0
+
+    monkeypatch.setattr(scheduler, 'due_slot', lambda job_name, slot_for, period, now: (now, 'schedule'))
+    monkeypatch.setattr(scheduler, 'execute', execute)
+
+    assert scheduler.run_due_jobs(NOW) == ['analytics']
+
+def test_skill_categories_are_synced_once_per_taxonomy_version(scheduler, monkeypatch):
+    synced = []
+    extractor = SkillExtractor({'version': 1, 'skills': [{'name': 'sql', 'category': 'database'}]})
+    monkeypatch.setattr(scheduler, '_synced_taxonomy_version', None)
+    monkeypatch.setattr(scheduler, 'sync_skills', synced.append)
+    monkeypatch.setattr(scheduler, 'get_skill_extractor', lambda: extractor)
+
+    scheduler.sync_skill_taxonomy()
+    scheduler.sync_skill_taxonomy()
+    assert synced == [{'sql': 'database'}]
+
+    extractor = SkillExtractor({'version': 2, 'skills': [{'name': 'dbt', 'category': 'tool'}]})
+    scheduler.sync_skill_taxonomy()
+    assert synced == [{'sql': 'database'}, {'dbt': 'tool'}]
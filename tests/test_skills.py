@@ -0,0 +1,86 @@
+import json
+import logging
+import os
+import pytest
+import skills
+from skills import SkillExtractor, get_skill_extractor, load_taxonomy
+
+TAXONOMY = {
+    'version': 3,
+    'skills': [
+        {'name': 'r', 'category': 'language', 'aliases': []},
+        {'name': 'c++', 'category': 'language', 'aliases': []},
+        {'name': 'postgresql', 'category': 'database', 'aliases': ['postgres']},
+        {'name': 'kubernetes', 'category': 'devops', 'aliases': ['k8s']},
+        {'name': 'power bi', 'category': 'bi', 'aliases': []},
+        {'name': 'data lake', 'category': 'big data', 'aliases': []},
+        {'name': 'databricks', 'category': 'big data', 'aliases': []},
+    ],
+}
+
+@pytest.fixture
+def extractor():
+    return SkillExtractor(TAXONOMY)
+
+def test_aliases_map_to_canonical_names(extractor):
+    assert extractor.extract("Postgres and K8S experience") == {'postgresql', 'kubernetes'}
+
+def test_longest_term_wins(extractor):
+    assert extractor.extract("PostgreSQL 15") == {'postgresql'}
+
+def test_matches_need_word_boundaries(extractor):
+    # 'r' inside 'for'/'senior' and 'data lake' inside 'data lakes' don't count
+    assert extractor.extract("looking for a senior engineer with data lakes") == set()
+    assert extractor.extract("R, C++ and Power BI") == {'r', 'c++', 'power bi'}
+
+def test_shared_prefixes(extractor):
+    assert extractor.extract("data lake on databricks") == {'data lake', 'databricks'}
+
+def test_empty_description(extractor):
+    assert extractor.extract(None) == set()
+    assert extractor.extract("") == set()
+
+def test_version_and_categories(extractor):
+    assert extractor.version == 3
+    assert extractor.categories['kubernetes'] == 'devops'
+
+def test_taxonomy_rejects_an_alias_claimed_twice(tmp_path):
+    broken = {'version': 1, 'skills': [
+        {'name': 'postgresql', 'aliases': ['pg']},
+        {'name': 'pyspark', 'aliases': ['pg']},
+    ]}
+    path = tmp_path / 'skills.json'
+    path.write_text(json.dumps(broken))
+    with pytest.raises(ValueError, match="'pg' maps to both"):
+        load_taxonomy(str(path))
+
+def test_taxonomy_needs_an_integer_version(tmp_path):
+    path = tmp_path / 'skills.json'
+    path.write_text(json.dumps({'version': '2', 'skills': [{'name': 'sql'}]}))
+    with pytest.raises(ValueError, match="version"):
+        load_taxonomy(str(path))
+
+def test_repo_taxonomy_loads():
+    extractor = SkillExtractor.from_file()
+    assert extractor.extract("python and sql, sklearn") == {'python', 'sql', 'scikit-learn'}
+
+def test_edits_are_picked_up_and_broken_ones_ignored(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(skills, '_extractor', None)
+    monkeypatch.setattr(skills, '_extractor_mtime', None)
+    path = tmp_path / 'skills.json'
+
+    def write(taxonomy, mtime):
+        path.write_text(taxonomy if isinstance(taxonomy, str) else json.dumps(taxonomy))
+        os.utime(path, (mtime, mtime))
+
+    write({'version': 1, 'skills': [{'name': 'sql'}]}, 1000)
+    first = get_skill_extractor(str(path))
+    assert get_skill_extractor(str(path)) is first
+
+    write({'version': 2, 'skills': [{'name': 'sql'}, {'name': 'dbt'}]}, 2000)
+    assert get_skill_extractor(str(path)).extract("sql and dbt") == {'sql', 'dbt'}
+
+    write('{not json', 3000)
+    with caplog.at_level(logging.ERROR):
+        assert get_skill_extractor(str(path)).version == 2
+    assert "Keeping skill taxonomy v2" in caplog.text
@@ -0,0 +1,65 @@
+from datetime import date
+import pytest
+from dedup import job_fingerprint
+from skills import SkillExtractor
+from transform import TransformEngine, classify_experience, is_remote_job, transform_job, transform_jobs
+
+def raw_jobs(n):
+    return [{
+        'job_title': f'Data Analyst {i}',
+        'employer_name': f'Company {i % 4}',
+        'job_city': 'Toronto' if i % 3 else None,
+        'job_state': 'ON',
+        'job_description': 'python and sql' if i % 2 else 'excel',
+        'job_apply_link': f'https://jobs.example.com/{i}',
+        'job_highlights': {'not': 'needed'},
+    } for i in range(n)]
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_engine_matches_the_inline_transform_in_order(processes):
+    jobs = raw_jobs(25)
+    with TransformEngine(processes=processes, chunk_size=4) as engine:
+        assert engine.transform(jobs) == transform_jobs(jobs)
+
+@pytest.mark.parametrize('title, expected', [
+    ('Junior Data Analyst', 'Entry Level'),
+    ('Data Analyst, Entry', 'Entry Level'),
+    ('Senior BI Developer', 'Senior Level'),
+    ('Analytics Team Lead', 'Senior Level'),
+    ('Data Analyst', 'Mid Level'),
+    (None, None),
+])
+def test_classify_experience(title, expected):
+    assert classify_experience(title) == expected
+
+def test_is_remote_job_trusts_the_api_flag():
+    assert is_remote_job('Data Analyst', 'on site in Toronto', api_flag=True) is True
+    assert is_remote_job('Remote Data Analyst', None, api_flag=False) is False
+    assert is_remote_job('Data Analyst', 'Fully REMOTE role') is True
+    assert is_remote_job(None, None) is False
+
+def test_transform_job_fills_the_attributes():
+    extractor = SkillExtractor({'version': 4, 'skills': [{'name': 'python'}, {'name': 'sql'}]})
+    row = transform_job({
+        'job_title': 'Senior Data Engineer',
+        'employer_name': 'Acme',
+        'job_description': 'python, sql',
+        'job_is_remote': True,
+        'job_posted_at_timestamp': 1760000000,
+    }, extractor)
+
+    assert row['experience_level'] == 'Senior Level'
+    assert row['is_remote'] is True
+    assert row['posted_date'] == date(2025, 10, 9)
+    assert row['city'] == row['province'] == 'Unknown'
+    assert row['skills'] == {'python', 'sql'}
+    assert row['skills_version'] == 4
+
+def test_missing_employer_and_title_default_to_unknown():
+    row = transform_job({'job_description': 'sql'}, SkillExtractor({'version': 1, 'skills': [{'name': 'sql'}]}))
+
+    assert row['job_title'] == 'Unknown'
+    assert row['company_name'] == 'Unknown'
+    assert row['experience_level'] is None
+    # Hashed as stored, so the posting is recognised when it's fetched again
+    assert row['content_hash'] == job_fingerprint('Unknown', 'Unknown', 'Unknown', 'sql')